@@ -0,0 +1,57 @@
+"""Add indexes for user and comment lookups
+
+Revision ID: 3f2a9c7d1e84
+Revises: b85d0ad6f981
+Create Date: 2024-10-20 14:32:10.512384
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f2a9c7d1e84"
+down_revision: Union[str, None] = "b85d0ad6f981"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_gist_comments_comment_id",
+        "gist_comments",
+        ["comment_id"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_gist_comments_user_id_comment_date",
+        "gist_comments",
+        ["user_id", "comment_date"],
+    )
+    op.create_index(
+        "ix_current_weather_user_id_observation_datetime",
+        "current_weather",
+        ["user_id", "observation_datetime"],
+    )
+    op.create_index(
+        "ix_forecast_weather_user_id_date",
+        "forecast_weather",
+        ["user_id", "date"],
+    )
+    op.create_index(
+        "ix_forecast_weather_city_date",
+        "forecast_weather",
+        ["city", "date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_forecast_weather_city_date", table_name="forecast_weather")
+    op.drop_index("ix_forecast_weather_user_id_date", table_name="forecast_weather")
+    op.drop_index(
+        "ix_current_weather_user_id_observation_datetime",
+        table_name="current_weather",
+    )
+    op.drop_index("ix_gist_comments_user_id_comment_date", table_name="gist_comments")
+    op.drop_index("ix_gist_comments_comment_id", table_name="gist_comments")
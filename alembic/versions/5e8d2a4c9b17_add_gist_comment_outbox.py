@@ -0,0 +1,70 @@
+"""Add gist_comment_outbox and allow pending gist comments
+
+Revision ID: 5e8d2a4c9b17
+Revises: 9c4e1b7a2d53
+Create Date: 2024-10-22 16:05:31.884215
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8d2a4c9b17"
+down_revision: Union[str, None] = "9c4e1b7a2d53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("gist_comments") as batch_op:
+        batch_op.alter_column("comment_id", existing_type=sa.Integer(), nullable=True)
+
+    op.create_table(
+        "gist_comment_outbox",
+        sa.Column("id", sa.String(length=32), nullable=False),
+        sa.Column("gist_comment_id", sa.Integer(), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "PENDING",
+                "PROCESSING",
+                "DONE",
+                "FAILED",
+                name="outboxstatus",
+                native_enum=False,
+                length=16,
+            ),
+            nullable=False,
+        ),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("available_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["gist_comment_id"], ["gist_comments.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_gist_comment_outbox_status_available_at",
+        "gist_comment_outbox",
+        ["status", "available_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_gist_comment_outbox_status_available_at",
+        table_name="gist_comment_outbox",
+    )
+    op.drop_table("gist_comment_outbox")
+    # Comentários ainda não publicados não têm comment_id e são descartados
+    op.execute("DELETE FROM gist_comments WHERE comment_id IS NULL")
+    with op.batch_alter_table("gist_comments") as batch_op:
+        batch_op.alter_column("comment_id", existing_type=sa.Integer(), nullable=False)
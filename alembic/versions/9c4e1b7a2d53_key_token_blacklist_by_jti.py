@@ -0,0 +1,44 @@
+"""Key token_blacklist by jti with expires_at
+
+Revision ID: 9c4e1b7a2d53
+Revises: 3f2a9c7d1e84
+Create Date: 2024-10-21 09:12:44.201733
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9c4e1b7a2d53"
+down_revision: Union[str, None] = "3f2a9c7d1e84"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # As linhas antigas usam o token inteiro como chave e não têm jti; os
+    # tokens sem jti passam a ser recusados, então elas podem ser descartadas.
+    op.drop_table("token_blacklist")
+    op.create_table(
+        "token_blacklist",
+        sa.Column("jti", sa.String(length=32), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("jti"),
+    )
+    op.create_index("ix_token_blacklist_expires_at", "token_blacklist", ["expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_token_blacklist_expires_at", table_name="token_blacklist")
+    op.drop_table("token_blacklist")
+    op.create_table(
+        "token_blacklist",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_token_blacklist_id", "token_blacklist", ["id"])
@@ -1,6 +1,7 @@
 import random
 from datetime import datetime
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.auth.auth_schemas import PostSignUpRequest
@@ -21,36 +22,37 @@ class AuthRepository:
             is_active=True,
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
+        await db.refresh(db_user)
         return db_user
 
     async def get_user_by_id(self, db: AsyncSession, id: int):
-        return db.query(User).filter(User.id == id).first()
+        return await db.scalar(select(User).filter(User.id == id))
 
     async def get_user_by_email(self, db: AsyncSession, email: str):
-        return db.query(User).filter(User.email == email).first()
+        return await db.scalar(select(User).filter(User.email == email))
 
     async def update_password(self, db: AsyncSession, email: str, new_password: str):
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).filter(User.email == email))
         if user:
             user.password = new_password  # type: ignore
-            db.commit()
+            await db.commit()
 
     def verify_token(self, token: str):
         payload = decode_access_token(token)
         return payload if payload else None
 
-    async def add_token(self, db: AsyncSession, token_id: str):
-        token = TokenBlacklist(id=token_id)
+    async def add_token(self, db: AsyncSession, jti: str, expires_at: datetime):
+        token = TokenBlacklist(jti=jti, expires_at=expires_at)
         db.add(token)
-        db.commit()
-        db.refresh(token)
+        await db.commit()
         return token
 
-    async def is_token_blacklisted(self, db: AsyncSession, token_id: str) -> bool:
+    async def is_token_blacklisted(self, db: AsyncSession, jti: str) -> bool:
         return (
-            db.query(TokenBlacklist).filter(TokenBlacklist.id == token_id).first()
+            await db.scalar(
+                select(TokenBlacklist.jti).filter(TokenBlacklist.jti == jti)
+            )
             is not None
         )
 
@@ -60,14 +62,14 @@ class AuthRepository:
     async def save_pin(
         self, db: AsyncSession, user_id: int, pin: str, expiration: datetime
     ):
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await db.scalar(select(User).filter(User.id == user_id))
         user.reset_pin = pin  # type: ignore
         user.reset_pin_expiration = expiration  # type: ignore
         db.add(user)
-        db.commit()
+        await db.commit()
 
     async def verify_pin(self, db: AsyncSession, email: str, pin: str):
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).filter(User.email == email))
 
         if user:
             if user.reset_pin == pin:
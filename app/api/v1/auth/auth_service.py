@@ -19,7 +19,14 @@ from app.api.v1.auth.auth_schemas import (
     PutChangePasswordResponse,
 )
 from app.core.mailer import send_pin_email
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.revocation import get_revocation_checker, to_datetime
+from app.core.security import (
+    create_access_token,
+    get_password_hash,
+    invalidate_access_token,
+    verify_and_update_password,
+    verify_password,
+)
 from app.middleware.dependencies import AuthUser
 
 
@@ -30,7 +37,7 @@ class AuthService:
     async def create_user(
         self, db: AsyncSession, data: PostSignUpRequest
     ) -> PostSignUpResponse:
-        hashed_password = get_password_hash(password=data.password)
+        hashed_password = await get_password_hash(password=data.password)
         data.password = hashed_password
         response_repository = await self.auth_repository.create_user(db, data)
         try:
@@ -50,13 +57,19 @@ class AuthService:
         self, db: AsyncSession, data: OAuth2PasswordRequestForm
     ):
         db_user = await self.auth_repository.get_user_by_email(db, data.username)
-        if db_user and verify_password(data.password, db_user.password):
-            return db_user
         if not db_user:
             raise HTTPException(
                 status_code=400, detail="Incorrect username or password"
             )
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+        valid, new_hash = await verify_and_update_password(
+            data.password, db_user.password
+        )
+        if not valid:
+            raise HTTPException(status_code=401, detail="Invalid credentials")
+        if new_hash is not None:
+            # O custo do bcrypt mudou: regrava a senha com o custo atual
+            await self.auth_repository.update_password(db, db_user.email, new_hash)
+        return db_user
 
     def create_access_token(self, user) -> PostLoginResponse:
         token_data = {"id": user.id, "email": user.email}
@@ -67,16 +80,21 @@ class AuthService:
         return PostLoginResponse(**response)
 
     async def logout(self, db: AsyncSession, authuser: AuthUser) -> PostLogoutResponse:
-        if authuser.token is None:
+        payload = self.auth_repository.verify_token(authuser.token)
+        if payload is None or payload.get("jti") is None:
             raise HTTPException(status_code=400, detail="Invalid token")
-        await self.auth_repository.add_token(db, authuser.token)
+        await self.auth_repository.add_token(
+            db, payload["jti"], to_datetime(payload["exp"])
+        )
+        get_revocation_checker().revoke(payload["jti"], payload["exp"])
+        invalidate_access_token(authuser.token)
         return PostLogoutResponse(message="Successfully logged out")
 
     async def is_token_blacklisted(self, db: AsyncSession, token: str) -> bool:
-        token_id = self.auth_repository.verify_token(token)
-        if token_id is None:
+        payload = self.auth_repository.verify_token(token)
+        if payload is None or payload.get("jti") is None:
             raise HTTPException(status_code=400, detail="Invalid token")
-        return await self.auth_repository.is_token_blacklisted(db, str(token_id))
+        return await self.auth_repository.is_token_blacklisted(db, payload["jti"])
 
     async def forgot_password(
         self, db: AsyncSession, data: PostForgotPasswordRequest
@@ -115,7 +133,7 @@ class AuthService:
             elif error_detail == "User not found":
                 raise HTTPException(status_code=404, detail="User not found.")
 
-        hashed_password = get_password_hash(data.new_password)
+        hashed_password = await get_password_hash(data.new_password)
 
         await self.auth_repository.update_password(db, data.email, hashed_password)
 
@@ -127,9 +145,9 @@ class AuthService:
         user = await self.auth_repository.get_user_by_id(db, authuser.id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
-        if not user or not verify_password(data.old_password, user.password):
+        if not user or not await verify_password(data.old_password, user.password):
             raise HTTPException(status_code=400, detail="Incorrect old password")
-        hashed_password = get_password_hash(data.new_password)
+        hashed_password = await get_password_hash(data.new_password)
         await self.auth_repository.update_password(db, authuser.email, hashed_password)
         return PutChangePasswordResponse(message="Password changed successfully")
 
@@ -1,7 +1,8 @@
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Security, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.api.v1.current_weather.current_weather_repository import (
     CurrentWeatherRepository,
@@ -17,7 +18,20 @@ from app.api.v1.current_weather.current_weather_service import CurrentWeatherSer
 from app.clients.http_client import HttpClient
 from app.clients.open_weather.open_weather_client import OpenWeatherClient
 from app.clients.open_weather.open_weather_schemas import CoordinatesRequest
-from app.middleware.dependencies import AuthUser, get_db, jwt_middleware
+from app.middleware.dependencies import (
+    AuthUser,
+    get_db,
+    get_session_factory,
+    jwt_middleware,
+    require_owner,
+)
+from app.utils.export import ExportFormat, export_response
+from app.utils.pagination import (
+    HistoryFilters,
+    PageParams,
+    get_history_filters,
+    get_page_params,
+)
 
 router = APIRouter()
 weather_service = CurrentWeatherService(
@@ -52,14 +66,30 @@ async def post_weather_current_by_city(
 @router.get("/user/{user_id}")
 async def get_weather_current_by_user(
     user_id: int,
+    page: PageParams = Depends(get_page_params),
     db: AsyncSession = Depends(get_db),
 ) -> GetAllWeatherCurrentResponse:
     response_service = await weather_service.get_all_current_weather_by_user(
-        db=db, user_id=user_id
+        db=db, user_id=user_id, page=page
     )
     return GetAllWeatherCurrentResponse.model_validate(response_service)
 
 
+@router.get("/user/{user_id}/export")
+async def export_weather_current_by_user(
+    user_id: int,
+    authuser: Annotated[AuthUser, Security(jwt_middleware)],
+    format: ExportFormat = ExportFormat.NDJSON,
+    filters: HistoryFilters = Depends(get_history_filters),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> StreamingResponse:
+    require_owner(authuser, user_id)
+    content = weather_service.export_current_weather_by_user(
+        session_factory=session_factory, user_id=user_id, filters=filters, format=format
+    )
+    return export_response(content, format, f"current_weather_user_{user_id}")
+
+
 @router.put("/{id}")
 async def put_weather_current(
     id: int,
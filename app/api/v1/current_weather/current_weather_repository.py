@@ -1,5 +1,7 @@
 from datetime import datetime
+from typing import AsyncIterator, Optional, Sequence
 
+from sqlalchemy import RowMapping, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.current_weather.current_weather_schemas import (
@@ -8,9 +10,20 @@ from app.api.v1.current_weather.current_weather_schemas import (
     PutWeatherCurrentRequest,
 )
 from app.database.models.current_weather import CurrentWeather
+from app.database.statements import changed_values, delete_returning, update_returning
+from app.utils.export import EXPORT_BATCH_SIZE
+from app.utils.pagination import (
+    HistoryFilters,
+    PageParams,
+    apply_history_filters,
+    fetch_page,
+)
+from app.utils.serialization import to_response
 
 
 class CurrentWeatherRepository:
+    export_columns = CurrentWeather.__table__.columns.keys()
+
     async def create(
         self,
         db: AsyncSession,
@@ -40,114 +53,63 @@ class CurrentWeatherRepository:
         )
 
         db.add(current_weather_instance)
-        db.commit()
-        db.refresh(current_weather_instance)
+        await db.commit()
+        await db.refresh(current_weather_instance)
 
-        return CreateCurrentWeatherResponse(
-            id=current_weather_instance.id,
-            city=current_weather_instance.city,
-            latitude=current_weather_instance.latitude,
-            longitude=current_weather_instance.longitude,
-            current_temperature=current_weather_instance.current_temperature,
-            feels_like=current_weather_instance.feels_like,
-            temp_min=current_weather_instance.temp_min,
-            temp_max=current_weather_instance.temp_max,
-            pressure=current_weather_instance.pressure,
-            humidity=current_weather_instance.humidity,
-            visibility=current_weather_instance.visibility,
-            wind_speed=current_weather_instance.wind_speed,
-            wind_deg=current_weather_instance.wind_deg,
-            wind_gust=current_weather_instance.wind_gust,
-            cloudiness=current_weather_instance.cloudiness,
-            weather_description=current_weather_instance.weather_description,
-            observation_datetime=current_weather_instance.observation_datetime,
-            sunrise=current_weather_instance.sunrise,
-            sunset=current_weather_instance.sunset,
-            user_id=current_weather_instance.user_id,
-        )
+        return to_response(CreateCurrentWeatherResponse, current_weather_instance)
 
     async def get_by_city(self, db: AsyncSession, city: str) -> list[CurrentWeather]:
-        return db.query(CurrentWeather).filter(CurrentWeather.city == city).all()
+        result = await db.scalars(
+            select(CurrentWeather).filter(CurrentWeather.city == city)
+        )
+        return list(result.all())
+
+    async def get_all_weathers_by_user_id(
+        self, db: AsyncSession, user_id: int, page: PageParams
+    ):
+        return await fetch_page(
+            db,
+            select(CurrentWeather).filter(CurrentWeather.user_id == user_id),
+            timestamp_column=CurrentWeather.observation_datetime,
+            id_column=CurrentWeather.id,
+            city_column=CurrentWeather.city,
+            page=page,
+        )
 
-    async def get_all_weathers_by_user_id(self, db: AsyncSession, user_id: int):
-        return db.query(CurrentWeather).filter(CurrentWeather.user_id == user_id).all()
+    async def stream_weathers_by_user_id(
+        self, db: AsyncSession, user_id: int, filters: HistoryFilters
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        query = apply_history_filters(
+            select(*CurrentWeather.__table__.columns).filter(
+                CurrentWeather.user_id == user_id
+            ),
+            timestamp_column=CurrentWeather.observation_datetime,
+            city_column=CurrentWeather.city,
+            filters=filters,
+        ).order_by(CurrentWeather.observation_datetime, CurrentWeather.id)
+        # yield_per usa um cursor no servidor e entrega as linhas em lotes
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.mappings().partitions():
+            yield rows
 
     async def get_current_weather_by_id(self, db: AsyncSession, weather_id: int):
-        return db.query(CurrentWeather).filter(CurrentWeather.id == weather_id).first()
+        return await db.scalar(
+            select(CurrentWeather).filter(CurrentWeather.id == weather_id)
+        )
 
     async def update(
-        self,
-        db: AsyncSession,
-        current_weather: CurrentWeather,
-        data: PutWeatherCurrentRequest,
-    ):
-        current_weather.city = data.city if data.city else current_weather.city  # type: ignore
-        current_weather.latitude = (
-            data.latitude if data.latitude else current_weather.latitude
-        )
-        current_weather.longitude = (
-            data.longitude if data.longitude else current_weather.longitude
-        )
-        current_weather.current_temperature = (
-            data.current_temperature
-            if data.current_temperature
-            else current_weather.current_temperature
-        )
-        current_weather.feels_like = (
-            data.feels_like if data.feels_like else current_weather.feels_like
-        )
-        current_weather.temp_min = (
-            data.temp_min if data.temp_min else current_weather.temp_min
-        )
-        current_weather.temp_max = (
-            data.temp_max if data.temp_max else current_weather.temp_max
-        )
-        current_weather.pressure = (
-            data.pressure if data.pressure else current_weather.pressure
-        )
-        current_weather.humidity = (
-            data.humidity if data.humidity else current_weather.humidity
-        )
-        current_weather.visibility = (
-            data.visibility if data.visibility else current_weather.visibility
-        )
-        current_weather.wind_speed = (
-            data.wind_speed if data.wind_speed else current_weather.wind_speed
-        )
-        current_weather.wind_deg = (
-            data.wind_deg if data.wind_deg else current_weather.wind_deg
-        )
-        current_weather.wind_gust = (
-            data.wind_gust if data.wind_gust else current_weather.wind_gust
-        )
-        current_weather.cloudiness = (
-            data.cloudiness if data.cloudiness else current_weather.cloudiness
-        )
-        current_weather.weather_description = (
-            data.weather_description
-            if data.weather_description
-            else current_weather.weather_description
-        )
-        current_weather.observation_datetime = (
-            data.observation_datetime
-            if data.observation_datetime
-            else current_weather.observation_datetime
-        )
-        current_weather.sunrise = (
-            data.sunrise if data.sunrise else current_weather.sunrise
-        )
-        current_weather.sunset = data.sunset if data.sunset else current_weather.sunset
-        current_weather.user_id = (
-            data.user_id if data.user_id else current_weather.user_id
+        self, db: AsyncSession, weather_id: int, data: PutWeatherCurrentRequest
+    ) -> Optional[CurrentWeather]:
+        return await update_returning(
+            db,
+            CurrentWeather,
+            CurrentWeather.id == weather_id,
+            changed_values(CurrentWeather, data),
         )
-        db.commit()
-        db.refresh(current_weather)
-        return current_weather
 
-    async def delete(self, db: AsyncSession, weather_id: int):
-        weather_entry = (
-            db.query(CurrentWeather).filter(CurrentWeather.id == weather_id).first()
+    async def delete(
+        self, db: AsyncSession, weather_id: int
+    ) -> Optional[CurrentWeather]:
+        return await delete_returning(
+            db, CurrentWeather, CurrentWeather.id == weather_id
         )
-        if weather_entry:
-            db.delete(weather_entry)
-            db.commit()
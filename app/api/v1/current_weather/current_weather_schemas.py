@@ -4,7 +4,6 @@ from typing import List, Optional
 from pydantic import BaseModel
 
 from app.clients.open_weather.open_weather_schemas import GetCurrentWeatherResponse
-from app.database.models.current_weather import CurrentWeather
 
 
 class GetWeatherCurrentResponse(BaseModel):
@@ -35,12 +34,13 @@ class GetWeatherCurrentResponse(BaseModel):
     @classmethod
     def model_validate(cls, data):
         if isinstance(data, cls):
-            data = data.model_dump()
+            return data
         return cls(**data)
 
 
 class GetAllWeatherCurrentResponse(BaseModel):
     weathers: List[GetWeatherCurrentResponse]
+    next_cursor: Optional[str] = None
 
 
 class PutWeatherCurrentRequest(GetWeatherCurrentResponse):
@@ -61,5 +61,5 @@ class CreateCurrentWeatherRequest(GetCurrentWeatherResponse):
     pass
 
 
-class CreateCurrentWeatherResponse(CurrentWeather):
+class CreateCurrentWeatherResponse(GetWeatherCurrentResponse):
     pass
@@ -1,7 +1,7 @@
-from datetime import datetime
+from typing import AsyncIterator
 
 from fastapi import Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.api.v1.current_weather.current_weather_repository import (
     CurrentWeatherRepository,
@@ -17,6 +17,9 @@ from app.api.v1.current_weather.current_weather_schemas import (
 from app.clients.open_weather.open_weather_client import OpenWeatherClient
 from app.clients.open_weather.open_weather_schemas import CoordinatesRequest
 from app.middleware.dependencies import AuthUser
+from app.utils.export import ExportFormat, encode_rows
+from app.utils.pagination import HistoryFilters, PageParams
+from app.utils.serialization import to_response, to_responses
 
 
 class CurrentWeatherService:
@@ -38,33 +41,9 @@ class CurrentWeatherService:
         )
         current_weather = CreateCurrentWeatherRequest(**response_client.model_dump())
 
-        weather = await self.current_weather_repository.create(
+        return await self.current_weather_repository.create(
             db, authuser.id, current_weather
         )
-        return GetWeatherCurrentResponse(
-            id=int(weather.id),
-            city=str(weather.city),
-            latitude=float(weather.latitude),
-            longitude=float(weather.longitude),
-            current_temperature=float(weather.current_temperature),
-            feels_like=float(weather.feels_like),
-            temp_min=float(weather.temp_min),
-            temp_max=float(weather.temp_max),
-            pressure=int(weather.pressure),
-            humidity=int(weather.humidity),
-            visibility=int(weather.visibility),
-            wind_speed=float(weather.wind_speed),
-            wind_deg=int(weather.wind_deg),
-            wind_gust=float(weather.wind_gust) if weather.wind_gust else None,
-            cloudiness=int(weather.cloudiness),
-            weather_description=str(weather.weather_description),
-            observation_datetime=datetime.strptime(
-                str(weather.observation_datetime), "%Y-%m-%d %H:%M:%S"
-            ),
-            sunrise=datetime.strptime(str(weather.sunrise), "%Y-%m-%d %H:%M:%S"),
-            sunset=datetime.strptime(str(weather.sunset), "%Y-%m-%d %H:%M:%S"),
-            user_id=int(weather.user_id),
-        )
 
     async def post_current_weather_by_city(
         self, authuser: AuthUser, db: AsyncSession, city: str
@@ -74,156 +53,67 @@ class CurrentWeatherService:
         )
         current_weather = CreateCurrentWeatherRequest(**response_client.model_dump())
 
-        weather = await self.current_weather_repository.create(
+        return await self.current_weather_repository.create(
             db, authuser.id, current_weather
         )
-        return GetWeatherCurrentResponse(
-            id=int(weather.id),
-            city=str(weather.city),
-            latitude=float(weather.latitude),
-            longitude=float(weather.longitude),
-            current_temperature=float(weather.current_temperature),
-            feels_like=float(weather.feels_like),
-            temp_min=float(weather.temp_min),
-            temp_max=float(weather.temp_max),
-            pressure=int(weather.pressure),
-            humidity=int(weather.humidity),
-            visibility=int(weather.visibility),
-            wind_speed=float(weather.wind_speed),
-            wind_deg=int(weather.wind_deg),
-            wind_gust=float(weather.wind_gust) if weather.wind_gust else None,
-            cloudiness=int(weather.cloudiness),
-            weather_description=str(weather.weather_description),
-            observation_datetime=datetime.strptime(
-                str(weather.observation_datetime), "%Y-%m-%d %H:%M:%S"
-            ),
-            sunrise=datetime.strptime(str(weather.sunrise), "%Y-%m-%d %H:%M:%S"),
-            sunset=datetime.strptime(str(weather.sunset), "%Y-%m-%d %H:%M:%S"),
-            user_id=int(weather.user_id),
-        )
 
     async def get_all_current_weather_by_user(
-        self, db: AsyncSession, user_id: int
+        self, db: AsyncSession, user_id: int, page: PageParams
     ) -> GetAllWeatherCurrentResponse:
-        weathers = await self.current_weather_repository.get_all_weathers_by_user_id(
-            db, user_id
+        weathers, next_cursor = (
+            await self.current_weather_repository.get_all_weathers_by_user_id(
+                db, user_id, page
+            )
         )
         if not weathers:
             raise HTTPException(status_code=404, detail="Weather not found")
 
-        weathers_list = [
-            GetWeatherCurrentResponse(
-                id=int(weather.id),
-                city=str(weather.city),
-                latitude=float(weather.latitude),
-                longitude=float(weather.longitude),
-                current_temperature=float(weather.current_temperature),
-                feels_like=float(weather.feels_like),
-                temp_min=float(weather.temp_min),
-                temp_max=float(weather.temp_max),
-                pressure=int(weather.pressure),
-                humidity=int(weather.humidity),
-                visibility=int(weather.visibility),
-                wind_speed=float(weather.wind_speed),
-                wind_deg=int(weather.wind_deg),
-                wind_gust=float(weather.wind_gust) if weather.wind_gust else None,
-                cloudiness=int(weather.cloudiness),
-                weather_description=str(weather.weather_description),
-                observation_datetime=datetime.strptime(
-                    str(weather.observation_datetime), "%Y-%m-%d %H:%M:%S"
-                ),
-                sunrise=datetime.strptime(str(weather.sunrise), "%Y-%m-%d %H:%M:%S"),
-                sunset=datetime.strptime(str(weather.sunset), "%Y-%m-%d %H:%M:%S"),
-                user_id=int(weather.user_id),
+        weathers_list = to_responses(GetWeatherCurrentResponse, weathers)
+        return GetAllWeatherCurrentResponse(
+            weathers=weathers_list, next_cursor=next_cursor
+        )
+
+    async def export_current_weather_by_user(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        user_id: int,
+        filters: HistoryFilters,
+        format: ExportFormat,
+    ) -> AsyncIterator[bytes]:
+        async with session_factory() as db:
+            partitions = self.current_weather_repository.stream_weathers_by_user_id(
+                db, user_id, filters
             )
-            for weather in weathers
-        ]
-        return GetAllWeatherCurrentResponse(weathers=weathers_list)
+            async for chunk in encode_rows(
+                partitions, self.current_weather_repository.export_columns, format
+            ):
+                yield chunk
 
     async def update_current_weather(
         self, db: AsyncSession, weather_id: int, data: PutWeatherCurrentRequest
     ) -> PutWeatherCurrentResponse:
-        weather = await self.current_weather_repository.get_current_weather_by_id(
-            db, weather_id
+        updated_weather = await self.current_weather_repository.update(
+            db, weather_id, data
         )
-        if not weather:
+        if not updated_weather:
             raise HTTPException(status_code=404, detail="Weather not found")
 
-        updated_weather = await self.current_weather_repository.update(
-            db, weather, data
-        )
         return PutWeatherCurrentResponse(
             message="Current Weather updated successfully",
-            response=GetWeatherCurrentResponse(
-                id=int(updated_weather.id),
-                city=str(updated_weather.city),
-                latitude=float(updated_weather.latitude),
-                longitude=float(updated_weather.longitude),
-                current_temperature=float(updated_weather.current_temperature),
-                feels_like=float(updated_weather.feels_like),
-                temp_min=float(updated_weather.temp_min),
-                temp_max=float(updated_weather.temp_max),
-                pressure=int(updated_weather.pressure),
-                humidity=int(updated_weather.humidity),
-                visibility=int(updated_weather.visibility),
-                wind_speed=float(updated_weather.wind_speed),
-                wind_deg=int(updated_weather.wind_deg),
-                wind_gust=(
-                    float(updated_weather.wind_gust) if weather.wind_gust else None
-                ),
-                cloudiness=int(updated_weather.cloudiness),
-                weather_description=str(updated_weather.weather_description),
-                observation_datetime=datetime.strptime(
-                    str(updated_weather.observation_datetime), "%Y-%m-%d %H:%M:%S"
-                ),
-                sunrise=datetime.strptime(
-                    str(updated_weather.sunrise), "%Y-%m-%d %H:%M:%S"
-                ),
-                sunset=datetime.strptime(
-                    str(updated_weather.sunset), "%Y-%m-%d %H:%M:%S"
-                ),
-                user_id=int(updated_weather.user_id),
-            ),
+            response=to_response(GetWeatherCurrentResponse, updated_weather),
         )
 
     async def delete_current_weather(
         self, db: AsyncSession, weather_id: int
     ) -> DeleteWeatherCurrentResponse:
-        weather = await self.current_weather_repository.get_current_weather_by_id(
-            db, weather_id
-        )
-        if not weather:
-            raise HTTPException(status_code=404, detail="Weather not found")
-
         try:
-            await self.current_weather_repository.delete(db, weather.id)
+            weather = await self.current_weather_repository.delete(db, weather_id)
         except Exception:
             raise HTTPException(status_code=409, detail="Error deleting weather")
+        if not weather:
+            raise HTTPException(status_code=404, detail="Weather not found")
 
         return DeleteWeatherCurrentResponse(
             message="Current Weather deleted successfully",
-            response=GetWeatherCurrentResponse(
-                id=int(weather.id),
-                city=str(weather.city),
-                latitude=float(weather.latitude),
-                longitude=float(weather.longitude),
-                current_temperature=float(weather.current_temperature),
-                feels_like=float(weather.feels_like),
-                temp_min=float(weather.temp_min),
-                temp_max=float(weather.temp_max),
-                pressure=int(weather.pressure),
-                humidity=int(weather.humidity),
-                visibility=int(weather.visibility),
-                wind_speed=float(weather.wind_speed),
-                wind_deg=int(weather.wind_deg),
-                wind_gust=float(weather.wind_gust) if weather.wind_gust else None,
-                cloudiness=int(weather.cloudiness),
-                weather_description=str(weather.weather_description),
-                observation_datetime=datetime.strptime(
-                    str(weather.observation_datetime), "%Y-%m-%d %H:%M:%S"
-                ),
-                sunrise=datetime.strptime(str(weather.sunrise), "%Y-%m-%d %H:%M:%S"),
-                sunset=datetime.strptime(str(weather.sunset), "%Y-%m-%d %H:%M:%S"),
-                user_id=int(weather.user_id),
-            ),
+            response=to_response(GetWeatherCurrentResponse, weather),
         )
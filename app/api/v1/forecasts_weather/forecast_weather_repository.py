@@ -1,3 +1,6 @@
+from typing import AsyncIterator, List, Optional, Sequence
+
+from sqlalchemy import RowMapping, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.forecasts_weather.forecast_weather_schemas import (
@@ -6,9 +9,20 @@ from app.api.v1.forecasts_weather.forecast_weather_schemas import (
     PutWeatherForecastRequest,
 )
 from app.database.models.forecast_weather import ForecastWeather
+from app.database.statements import changed_values, delete_returning, update_returning
+from app.utils.export import EXPORT_BATCH_SIZE
+from app.utils.pagination import (
+    HistoryFilters,
+    PageParams,
+    apply_history_filters,
+    fetch_page,
+)
+from app.utils.serialization import to_response, to_responses
 
 
 class ForecastWeatherRepository:
+    export_columns = ForecastWeather.__table__.columns.keys()
+
     async def create(
         self,
         db: AsyncSession,
@@ -30,61 +44,96 @@ class ForecastWeatherRepository:
         )
 
         db.add(forecast_weather_instance)
-        db.commit()
-        db.refresh(forecast_weather_instance)
-
-        return CreateForecastWeatherResponse(
-            id=forecast_weather_instance.id,
-            city=forecast_weather_instance.city,
-            latitude=forecast_weather_instance.latitude,
-            longitude=forecast_weather_instance.longitude,
-            date=forecast_weather_instance.date,
-            average_temperature=forecast_weather_instance.average_temperature,
-            min_temperature=forecast_weather_instance.min_temperature,
-            max_temperature=forecast_weather_instance.max_temperature,
-            weather_description=forecast_weather_instance.weather_description,
-            humidity=forecast_weather_instance.humidity,
-            wind_speed=forecast_weather_instance.wind_speed,
-            user_id=forecast_weather_instance.user_id,
-        )
+        await db.commit()
+        await db.refresh(forecast_weather_instance)
+
+        return to_response(CreateForecastWeatherResponse, forecast_weather_instance)
+
+    async def create_many(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        forecast_weathers: List[CreateForecastWeatherRequest],
+    ) -> List[CreateForecastWeatherResponse]:
+        if not forecast_weathers:
+            return []
+
+        rows = [
+            {**forecast_weather.model_dump(), "user_id": user_id}
+            for forecast_weather in forecast_weathers
+        ]
+
+        # Um único INSERT multi-valores com RETURNING quando o backend suporta;
+        # caso contrário o flush do ORM agrupa os INSERTs em uma só transação.
+        # Sem coluna sentinela, sort_by_parameter_order faria um INSERT por
+        # linha; os ids são gerados na ordem do VALUES, então ordenar pelo id
+        # devolve as linhas na ordem do payload.
+        if db.get_bind().dialect.insert_executemany_returning:
+            result = await db.scalars(
+                insert(ForecastWeather).returning(ForecastWeather), rows
+            )
+            instances = sorted(result.all(), key=lambda instance: instance.id)
+        else:
+            instances = [ForecastWeather(**row) for row in rows]
+            db.add_all(instances)
+            await db.flush()
+
+        response = to_responses(CreateForecastWeatherResponse, instances)
+        await db.commit()
+        return response
 
     async def get_by_city(self, db: AsyncSession, city: str) -> list[ForecastWeather]:
-        return db.query(ForecastWeather).filter(ForecastWeather.city == city).all()
+        result = await db.scalars(
+            select(ForecastWeather).filter(ForecastWeather.city == city)
+        )
+        return list(result.all())
 
-    async def get_all_weathers_by_user_id(self, db: AsyncSession, user_id: int):
-        return (
-            db.query(ForecastWeather).filter(ForecastWeather.user_id == user_id).all()
+    async def get_all_weathers_by_user_id(
+        self, db: AsyncSession, user_id: int, page: PageParams
+    ):
+        return await fetch_page(
+            db,
+            select(ForecastWeather).filter(ForecastWeather.user_id == user_id),
+            timestamp_column=ForecastWeather.date,
+            id_column=ForecastWeather.id,
+            city_column=ForecastWeather.city,
+            page=page,
         )
 
+    async def stream_weathers_by_user_id(
+        self, db: AsyncSession, user_id: int, filters: HistoryFilters
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        query = apply_history_filters(
+            select(*ForecastWeather.__table__.columns).filter(
+                ForecastWeather.user_id == user_id
+            ),
+            timestamp_column=ForecastWeather.date,
+            city_column=ForecastWeather.city,
+            filters=filters,
+        ).order_by(ForecastWeather.date, ForecastWeather.id)
+        # yield_per usa um cursor no servidor e entrega as linhas em lotes
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.mappings().partitions():
+            yield rows
+
     async def get_forecast_weather_by_id(self, db: AsyncSession, weather_id: int):
-        return (
-            db.query(ForecastWeather).filter(ForecastWeather.id == weather_id).first()
+        return await db.scalar(
+            select(ForecastWeather).filter(ForecastWeather.id == weather_id)
         )
 
     async def update(
-        self,
-        db: AsyncSession,
-        forecast_weather: ForecastWeather,
-        data: PutWeatherForecastRequest,
-    ):
-        forecast_weather.city = data.city if data.city else forecast_weather.city  # type: ignore
-        forecast_weather.latitude = data.latitude if data.latitude else forecast_weather.latitude  # type: ignore
-        forecast_weather.longitude = data.longitude if data.longitude else forecast_weather.longitude  # type: ignore
-        forecast_weather.date = data.date if data.date else forecast_weather.date  # type: ignore
-        forecast_weather.average_temperature = data.average_temperature if data.average_temperature else forecast_weather.average_temperature  # type: ignore
-        forecast_weather.min_temperature = data.min_temperature if data.min_temperature else forecast_weather.min_temperature  # type: ignore
-        forecast_weather.max_temperature = data.max_temperature if data.max_temperature else forecast_weather.max_temperature  # type: ignore
-        forecast_weather.humidity = data.humidity if data.humidity else forecast_weather.humidity  # type: ignore
-        forecast_weather.wind_speed = data.wind_speed if data.wind_speed else forecast_weather.wind_speed  # type: ignore
-        forecast_weather.weather_description = data.weather_description if data.weather_description else forecast_weather.weather_description  # type: ignore
-        db.commit()
-        db.refresh(forecast_weather)
-        return forecast_weather
-
-    async def delete(self, db: AsyncSession, weather_id: int):
-        weather_entry = (
-            db.query(ForecastWeather).filter(ForecastWeather.id == weather_id).first()
+        self, db: AsyncSession, weather_id: int, data: PutWeatherForecastRequest
+    ) -> Optional[ForecastWeather]:
+        return await update_returning(
+            db,
+            ForecastWeather,
+            ForecastWeather.id == weather_id,
+            changed_values(ForecastWeather, data),
+        )
+
+    async def delete(
+        self, db: AsyncSession, weather_id: int
+    ) -> Optional[ForecastWeather]:
+        return await delete_returning(
+            db, ForecastWeather, ForecastWeather.id == weather_id
         )
-        if weather_entry:
-            db.delete(weather_entry)
-            db.commit()
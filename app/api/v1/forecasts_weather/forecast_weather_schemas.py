@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -24,7 +24,7 @@ class GetWeatherForecastResponse(BaseModel):
     @classmethod
     def model_validate(cls, data):
         if isinstance(data, cls):
-            data = data.model_dump()
+            return data
         return cls(**data)
 
 
@@ -56,7 +56,7 @@ class CreateForecastWeatherRequest(BaseModel):
     @classmethod
     def model_validate(cls, data):
         if isinstance(data, cls):
-            data = data.model_dump()
+            return data
         return cls(**data)
 
 
@@ -71,3 +71,4 @@ class CreateForecastWeatherResponse(GetWeatherForecastResponse):
 class GetAllWeatherForecastResponse(BaseModel):
 
     weathers: List[CreateForecastWeatherResponse]
+    next_cursor: Optional[str] = None
@@ -1,7 +1,7 @@
-from datetime import datetime
+from typing import AsyncIterator
 
 from fastapi import Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.api.v1.forecasts_weather.forecast_weather_repository import (
     ForecastWeatherRepository,
@@ -18,6 +18,9 @@ from app.api.v1.forecasts_weather.forecast_weather_schemas import (
 from app.clients.open_weather.open_weather_client import OpenWeatherClient
 from app.clients.open_weather.open_weather_schemas import CoordinatesRequest
 from app.middleware.dependencies import AuthUser
+from app.utils.export import ExportFormat, encode_rows
+from app.utils.pagination import HistoryFilters, PageParams
+from app.utils.serialization import to_response, to_responses
 
 
 class ForecastWeatherService:
@@ -43,9 +46,8 @@ class ForecastWeatherService:
         city = response_client.city.name
         latitude = response_client.city.coord.lat
         longitude = response_client.city.coord.lon
-        list_wather = []
-        for weather_data in response_client.list:
-            forecast_weather = CreateForecastWeatherRequest(
+        forecast_weathers = [
+            CreateForecastWeatherRequest(
                 city=city,
                 latitude=latitude,
                 longitude=longitude,
@@ -57,10 +59,11 @@ class ForecastWeatherService:
                 humidity=weather_data.main.humidity,
                 wind_speed=weather_data.wind.speed,
             )
-            response_repository = await self.forecast_weather_repository.create(
-                db, authuser.id, forecast_weather
-            )
-            list_wather.append(response_repository)
+            for weather_data in response_client.list
+        ]
+        list_wather = await self.forecast_weather_repository.create_many(
+            db, authuser.id, forecast_weathers
+        )
         return GetAllWeatherForecastResponse(weathers=list_wather)
 
     async def post_forecast_weather_by_city(
@@ -75,9 +78,8 @@ class ForecastWeatherService:
         city = response_client.city.name
         latitude = response_client.city.coord.lat
         longitude = response_client.city.coord.lon
-        list_wather = []
-        for weather_data in response_client.list:
-            forecast_weather = CreateForecastWeatherRequest(
+        forecast_weathers = [
+            CreateForecastWeatherRequest(
                 city=city,
                 latitude=latitude,
                 longitude=longitude,
@@ -89,94 +91,67 @@ class ForecastWeatherService:
                 humidity=weather_data.main.humidity,
                 wind_speed=weather_data.wind.speed,
             )
-            response_repository = await self.forecast_weather_repository.create(
-                db, authuser.id, forecast_weather
-            )
-            list_wather.append(response_repository)
+            for weather_data in response_client.list
+        ]
+        list_wather = await self.forecast_weather_repository.create_many(
+            db, authuser.id, forecast_weathers
+        )
         return GetAllWeatherForecastResponse(weathers=list_wather)
 
     async def get_all_forecast_weather_by_user(
-        self, db: AsyncSession, user_id: int
+        self, db: AsyncSession, user_id: int, page: PageParams
     ) -> GetAllWeatherForecastResponse:
-        weathers = await self.forecast_weather_repository.get_all_weathers_by_user_id(
-            db, user_id
+        weathers, next_cursor = (
+            await self.forecast_weather_repository.get_all_weathers_by_user_id(
+                db, user_id, page
+            )
         )
         if not weathers:
             raise HTTPException(status_code=404, detail="Weather not found")
 
-        weathers_list = [
-            CreateForecastWeatherResponse(
-                id=int(weather.id),
-                city=str(weather.city),
-                latitude=float(weather.latitude),
-                longitude=float(weather.longitude),
-                date=datetime.strptime(str(weather.date), "%Y-%m-%d %H:%M:%S"),
-                average_temperature=float(weather.average_temperature),
-                min_temperature=float(weather.min_temperature),
-                max_temperature=float(weather.max_temperature),
-                weather_description=str(weather.weather_description),
-                humidity=int(weather.humidity),
-                wind_speed=float(weather.wind_speed),
-                user_id=int(weather.user_id),
+        weathers_list = to_responses(CreateForecastWeatherResponse, weathers)
+        return GetAllWeatherForecastResponse(
+            weathers=weathers_list, next_cursor=next_cursor
+        )
+
+    async def export_forecast_weather_by_user(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        user_id: int,
+        filters: HistoryFilters,
+        format: ExportFormat,
+    ) -> AsyncIterator[bytes]:
+        async with session_factory() as db:
+            partitions = self.forecast_weather_repository.stream_weathers_by_user_id(
+                db, user_id, filters
             )
-            for weather in weathers
-        ]
-        return GetAllWeatherForecastResponse(weathers=weathers_list)
+            async for chunk in encode_rows(
+                partitions, self.forecast_weather_repository.export_columns, format
+            ):
+                yield chunk
 
     async def update_forecast_weather(
         self, db: AsyncSession, weather_id: int, data: PutWeatherForecastRequest
     ) -> PutWeatherForecastResponse:
-        weather = await self.forecast_weather_repository.get_forecast_weather_by_id(
-            db, weather_id
+        updated_weather = await self.forecast_weather_repository.update(
+            db, weather_id, data
         )
-        if not weather:
+        if not updated_weather:
             raise HTTPException(status_code=404, detail="Weather not found")
 
-        updated_weather = await self.forecast_weather_repository.update(
-            db, weather, data
-        )
         return PutWeatherForecastResponse(
             message="Forecast Weather updated successfully",
-            response=GetWeatherForecastResponse(
-                id=int(updated_weather.id),
-                city=str(updated_weather.city),
-                latitude=float(updated_weather.latitude),
-                longitude=float(updated_weather.longitude),
-                date=datetime.strptime(str(updated_weather.date), "%Y-%m-%d %H:%M:%S"),
-                average_temperature=float(updated_weather.average_temperature),
-                min_temperature=float(updated_weather.min_temperature),
-                max_temperature=float(updated_weather.max_temperature),
-                weather_description=str(updated_weather.weather_description),
-                humidity=int(updated_weather.humidity),
-                wind_speed=float(updated_weather.wind_speed),
-                user_id=int(updated_weather.user_id),
-            ),
+            response=to_response(GetWeatherForecastResponse, updated_weather),
         )
 
     async def delete_forecast_weather(
         self, db: AsyncSession, weather_id: int
     ) -> DeleteWeatherForecastResponse:
-        weather = await self.forecast_weather_repository.get_forecast_weather_by_id(
-            db, weather_id
-        )
+        weather = await self.forecast_weather_repository.delete(db, weather_id)
         if not weather:
             raise HTTPException(status_code=404, detail="Weather not found")
 
-        await self.forecast_weather_repository.delete(db, weather.id)
         return DeleteWeatherForecastResponse(
             message="Forecast Weather deleted successfully",
-            response=GetWeatherForecastResponse(
-                id=int(weather.id),
-                city=str(weather.city),
-                latitude=float(weather.latitude),
-                longitude=float(weather.longitude),
-                date=datetime.strptime(str(weather.date), "%Y-%m-%d %H:%M:%S"),
-                average_temperature=float(weather.average_temperature),
-                min_temperature=float(weather.min_temperature),
-                max_temperature=float(weather.max_temperature),
-                weather_description=str(weather.weather_description),
-                humidity=int(weather.humidity),
-                wind_speed=float(weather.wind_speed),
-                user_id=int(weather.user_id),
-            ),
+            response=to_response(GetWeatherForecastResponse, weather),
         )
@@ -1,7 +1,8 @@
-from typing import Annotated
+from typing import Annotated, Optional, Union
 
-from fastapi import APIRouter, Depends, Security, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, Header, Security, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.api.v1.current_weather.current_weather_repository import (
     CurrentWeatherRepository,
@@ -13,6 +14,7 @@ from app.api.v1.gist_comments.gist_comment_repository import GistCommentReposito
 from app.api.v1.gist_comments.gist_comment_schemas import (
     DeleteGistCommentResponse,
     GetAllGistCommentResponse,
+    GistCommentJobResponse,
     GistCommentResponse,
     PutGistCommentRequest,
     PutGistCommentResponse,
@@ -22,53 +24,138 @@ from app.clients.github.github_client import GitHubClient
 from app.clients.http_client import HttpClient
 from app.clients.open_weather.open_weather_client import OpenWeatherClient
 from app.clients.open_weather.open_weather_schemas import CoordinatesRequest
-from app.middleware.dependencies import AuthUser, get_db, jwt_middleware
+from app.middleware.dependencies import (
+    AuthUser,
+    get_db,
+    get_session_factory,
+    jwt_middleware,
+    require_owner,
+)
+from app.utils.export import ExportFormat, export_response
+from app.utils.pagination import (
+    HistoryFilters,
+    PageParams,
+    get_history_filters,
+    get_page_params,
+)
 
 router = APIRouter()
+
+RESPOND_ASYNC = "respond-async"
 gist_comment_service = CommentService(
     GistCommentRepository(),
     CurrentWeatherRepository(),
     ForecastWeatherRepository(),
     OpenWeatherClient(HttpClient()),
-    GitHubClient(),
+    GitHubClient(HttpClient()),
 )
 
 
-@router.post("/coordinates", status_code=status.HTTP_201_CREATED)
+def wants_async(prefer: Optional[str]) -> bool:
+    return prefer is not None and RESPOND_ASYNC in (
+        preference.strip().lower() for preference in prefer.split(",")
+    )
+
+
+def accepted_response(job: GistCommentJobResponse) -> JSONResponse:
+    return JSONResponse(
+        job.model_dump(mode="json"),
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={
+            "Location": f"/api/v1/gist-comments/jobs/{job.job_id}",
+            "Preference-Applied": RESPOND_ASYNC,
+        },
+    )
+
+
+@router.post(
+    "/coordinates",
+    status_code=status.HTTP_201_CREATED,
+    response_model=GistCommentResponse,
+    responses={202: {"model": GistCommentJobResponse}},
+)
 async def post_gist_comment_by_city(
     authuser: Annotated[AuthUser, Security(jwt_middleware)],
     coordinates: CoordinatesRequest = Depends(),
     db: AsyncSession = Depends(get_db),
-) -> GistCommentResponse:
+    prefer: Optional[str] = Header(None),
+) -> Union[GistCommentResponse, JSONResponse]:
+    # Com "Prefer: respond-async" o comentário vai para o outbox e a resposta
+    # volta antes da chamada ao GitHub
+    if wants_async(prefer):
+        job = await gist_comment_service.enqueue_gist_comment_by_coordinates(
+            authuser=authuser, db=db, coordinates=coordinates
+        )
+        return accepted_response(job)
+
     response_service = await gist_comment_service.post_gist_comment_by_coordinates(
         authuser=authuser, db=db, coordinates=coordinates
     )
     return GistCommentResponse.model_validate(response_service)
 
 
-@router.post("/{city}", status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{city}",
+    status_code=status.HTTP_201_CREATED,
+    response_model=GistCommentResponse,
+    responses={202: {"model": GistCommentJobResponse}},
+)
 async def get_gist_comment_by_city(
     authuser: Annotated[AuthUser, Security(jwt_middleware)],
     city: str,
     db: AsyncSession = Depends(get_db),
-) -> GistCommentResponse:
+    prefer: Optional[str] = Header(None),
+) -> Union[GistCommentResponse, JSONResponse]:
+    if wants_async(prefer):
+        job = await gist_comment_service.enqueue_gist_comment_by_city(
+            authuser=authuser, db=db, city=city
+        )
+        return accepted_response(job)
+
     response_service = await gist_comment_service.post_gist_comment_by_city(
         authuser=authuser, db=db, city=city
     )
     return GistCommentResponse.model_validate(response_service)
 
 
+@router.get("/jobs/{job_id}")
+async def get_gist_comment_job(
+    job_id: str,
+    authuser: Annotated[AuthUser, Security(jwt_middleware)],
+    db: AsyncSession = Depends(get_db),
+) -> GistCommentJobResponse:
+    return await gist_comment_service.get_gist_comment_job(
+        db=db, authuser=authuser, job_id=job_id
+    )
+
+
 @router.get("/user/{user_id}")
 async def get_gist_comments_by_user(
     user_id: int,
+    page: PageParams = Depends(get_page_params),
     db: AsyncSession = Depends(get_db),
 ) -> GetAllGistCommentResponse:
     response_service = await gist_comment_service.get_all_gist_comment_by_user(
-        db=db, user_id=user_id
+        db=db, user_id=user_id, page=page
     )
     return GetAllGistCommentResponse.model_validate(response_service)
 
 
+@router.get("/user/{user_id}/export")
+async def export_gist_comments_by_user(
+    user_id: int,
+    authuser: Annotated[AuthUser, Security(jwt_middleware)],
+    format: ExportFormat = ExportFormat.NDJSON,
+    filters: HistoryFilters = Depends(get_history_filters),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> StreamingResponse:
+    require_owner(authuser, user_id)
+    content = gist_comment_service.export_gist_comments_by_user(
+        session_factory=session_factory, user_id=user_id, filters=filters, format=format
+    )
+    return export_response(content, format, f"gist_comments_user_{user_id}")
+
+
 @router.put("/{comment_id}")
 async def put_gist_comment(
     comment_id: int,
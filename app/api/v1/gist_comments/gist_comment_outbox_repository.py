@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models.gist_comment import GistComment
+from app.database.models.gist_comment_outbox import (
+    GistCommentOutbox,
+    OutboxStatus,
+    utcnow,
+)
+
+# Linhas que um worker pode pegar: pendentes ou com a reserva vencida (o
+# worker que as reservou caiu no meio da publicação)
+CLAIMABLE = (OutboxStatus.PENDING, OutboxStatus.PROCESSING)
+
+
+class GistCommentOutboxRepository:
+    async def claim(
+        self, db: AsyncSession, limit: int, lease: timedelta
+    ) -> List[GistCommentOutbox]:
+        """Reserva até ``limit`` linhas disponíveis por ``lease``.
+
+        Cada reserva é um UPDATE condicional: se outro worker pegou a mesma
+        linha antes, o UPDATE não afeta nenhuma linha e ela é ignorada.
+        """
+        now = utcnow()
+        candidates = (
+            await db.scalars(
+                select(GistCommentOutbox.id)
+                .filter(
+                    GistCommentOutbox.status.in_(CLAIMABLE),
+                    GistCommentOutbox.available_at <= now,
+                )
+                .order_by(GistCommentOutbox.available_at)
+                .limit(limit)
+            )
+        ).all()
+
+        claimed = []
+        for job_id in candidates:
+            result = await db.execute(
+                update(GistCommentOutbox)
+                .where(
+                    GistCommentOutbox.id == job_id,
+                    GistCommentOutbox.status.in_(CLAIMABLE),
+                    GistCommentOutbox.available_at <= now,
+                )
+                .values(
+                    status=OutboxStatus.PROCESSING,
+                    available_at=now + lease,
+                    attempts=GistCommentOutbox.attempts + 1,
+                )
+            )
+            if result.rowcount == 1:
+                claimed.append(job_id)
+        await db.commit()
+
+        if not claimed:
+            return []
+        return list(
+            (
+                await db.scalars(
+                    select(GistCommentOutbox).filter(GistCommentOutbox.id.in_(claimed))
+                )
+            ).all()
+        )
+
+    async def complete(
+        self, db: AsyncSession, job: GistCommentOutbox, comment_id: int
+    ) -> None:
+        await db.execute(
+            update(GistComment)
+            .where(GistComment.id == job.gist_comment_id)
+            .values(comment_id=comment_id)
+        )
+        await db.execute(
+            update(GistCommentOutbox)
+            .where(GistCommentOutbox.id == job.id)
+            .values(status=OutboxStatus.DONE, last_error=None)
+        )
+        await db.commit()
+
+    async def release(
+        self, db: AsyncSession, job: GistCommentOutbox, retry_at: datetime
+    ) -> None:
+        """Devolve a linha à fila sem gastar a tentativa da reserva."""
+        await db.execute(
+            update(GistCommentOutbox)
+            .where(GistCommentOutbox.id == job.id)
+            .values(
+                status=OutboxStatus.PENDING,
+                available_at=retry_at,
+                attempts=GistCommentOutbox.attempts - 1,
+            )
+        )
+        await db.commit()
+
+    async def fail(
+        self,
+        db: AsyncSession,
+        job: GistCommentOutbox,
+        error: str,
+        retry_at: Optional[datetime],
+    ) -> None:
+        values = (
+            {"status": OutboxStatus.PENDING, "available_at": retry_at}
+            if retry_at is not None
+            else {"status": OutboxStatus.FAILED}
+        )
+        await db.execute(
+            update(GistCommentOutbox)
+            .where(GistCommentOutbox.id == job.id)
+            .values(last_error=error[:500], **values)
+        )
+        await db.commit()
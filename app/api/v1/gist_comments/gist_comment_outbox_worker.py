@@ -0,0 +1,157 @@
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.v1.gist_comments.gist_comment_outbox_repository import (
+    GistCommentOutboxRepository,
+)
+from app.clients.github.github_client import GitHubClient
+from app.clients.github.rate_limiter import GitHubWriteThrottled
+from app.clients.http_client import HttpClient
+from app.config import Environment
+from app.database.models.gist_comment_outbox import (
+    GistCommentOutbox,
+    utc_from_timestamp,
+    utcnow,
+)
+from app.utils.env_vars import validate_variables
+
+logger = logging.getLogger(__name__)
+
+
+class GistCommentOutboxWorker:
+    """Publica no GitHub os comentários gravados no outbox.
+
+    A cada rodada reserva até ``concurrency`` linhas e as publica em
+    paralelo; em caso de sucesso grava o ``comment_id`` devolvido pelo
+    GitHub. Falhas são retentadas com backoff exponencial até
+    ``max_attempts``. Se o limitador de escritas do GitHub não liberar a
+    publicação a tempo, a linha volta para a fila no horário indicado por ele,
+    sem contar como tentativa. A reserva (``lease``) precisa ser maior que a
+    duração máxima de uma publicação, espera do limitador incluída. A entrega
+    é "pelo menos uma vez": se o processo cair entre a publicação e o commit,
+    a reserva vence e o comentário é publicado de novo.
+    """
+
+    def __init__(
+        self,
+        repository: GistCommentOutboxRepository,
+        github_client: GitHubClient,
+        concurrency: int = 4,
+        poll_interval: float = 1.0,
+        max_attempts: int = 5,
+        lease: float = 60.0,
+        retry_backoff: float = 2.0,
+    ):
+        self.repository = repository
+        self.github_client = github_client
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.lease = timedelta(seconds=lease)
+        self.retry_backoff = retry_backoff
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def notify(self) -> None:
+        # Acorda o worker assim que um comentário novo entra no outbox
+        self._wakeup.set()
+
+    async def run_once(self, session_factory: async_sessionmaker[AsyncSession]) -> int:
+        async with session_factory() as db:
+            jobs = await self.repository.claim(db, self.concurrency, self.lease)
+        await asyncio.gather(*(self._publish(session_factory, job) for job in jobs))
+        return len(jobs)
+
+    async def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run_forever(session_factory))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run_forever(
+        self, session_factory: async_sessionmaker[AsyncSession]
+    ) -> None:
+        while True:
+            try:
+                processed = await self.run_once(session_factory)
+            except Exception:
+                logger.exception("Falha ao processar o outbox de comentários")
+                processed = 0
+            if processed == self.concurrency:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _publish(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        job: GistCommentOutbox,
+    ) -> None:
+        try:
+            response = await self.github_client.create_gist_comment(comment=job.body)
+        except GitHubWriteThrottled as throttled:
+            async with session_factory() as db:
+                await self.repository.release(
+                    db, job, utc_from_timestamp(throttled.retry_at)
+                )
+            return
+        except Exception as error:
+            retry_at = None
+            if job.attempts < self.max_attempts:
+                delay = self.retry_backoff * 2 ** (job.attempts - 1)
+                retry_at = utcnow() + timedelta(seconds=delay)
+            logger.warning(
+                "Falha ao publicar o comentário %s (tentativa %d): %s",
+                job.id,
+                job.attempts,
+                error,
+            )
+            async with session_factory() as db:
+                await self.repository.fail(db, job, str(error), retry_at)
+            return
+
+        async with session_factory() as db:
+            await self.repository.complete(db, job, response["comment_id"])
+
+
+_outbox_worker: Optional[GistCommentOutboxWorker] = None
+
+
+def get_gist_outbox_worker() -> GistCommentOutboxWorker:
+    global _outbox_worker
+    if _outbox_worker is None:
+        environment = validate_variables(Environment)
+        # Pior caso de uma publicação: a espera máxima do limitador mais uma
+        # requisição completa por tentativa
+        request_timeout = (
+            environment.HTTP_CONNECT_TIMEOUT
+            + environment.HTTP_POOL_TIMEOUT
+            + environment.HTTP_WRITE_TIMEOUT
+            + environment.HTTP_READ_TIMEOUT
+        )
+        publish_timeout = environment.GITHUB_WRITE_MAX_WAIT + request_timeout * (
+            environment.GITHUB_RATE_LIMIT_MAX_RETRIES + 1
+        )
+        _outbox_worker = GistCommentOutboxWorker(
+            GistCommentOutboxRepository(),
+            GitHubClient(HttpClient()),
+            concurrency=environment.GIST_OUTBOX_CONCURRENCY,
+            poll_interval=environment.GIST_OUTBOX_POLL_INTERVAL,
+            max_attempts=environment.GIST_OUTBOX_MAX_ATTEMPTS,
+            lease=max(environment.GIST_OUTBOX_LEASE, 2 * publish_timeout),
+        )
+    return _outbox_worker
@@ -1,4 +1,8 @@
+from typing import AsyncIterator, Optional, Sequence
+
+from sqlalchemy import RowMapping, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.api.v1.gist_comments.gist_comment_schemas import (
     CreateGistCommentRequest,
@@ -6,17 +10,28 @@ from app.api.v1.gist_comments.gist_comment_schemas import (
     PutGistCommentRequest,
 )
 from app.database.models.gist_comment import GistComment
+from app.database.models.gist_comment_outbox import GistCommentOutbox
+from app.database.statements import changed_values, delete_returning, update_returning
+from app.utils.export import EXPORT_BATCH_SIZE
+from app.utils.pagination import (
+    HistoryFilters,
+    PageParams,
+    apply_history_filters,
+    fetch_page,
+)
+from app.utils.serialization import to_response
 
 
 class GistCommentRepository:
-    async def create(
+    export_columns = GistComment.__table__.columns.keys()
+
+    def _build(
         self,
-        db: AsyncSession,
         user_id: int,
-        comment_id: int,
+        comment_id: Optional[int],
         gist_comment: CreateGistCommentRequest,
-    ) -> GistCommentResponse:
-        gist_comment_instance = GistComment(
+    ) -> GistComment:
+        return GistComment(
             comment_id=comment_id,
             city=gist_comment.city,
             latitude=gist_comment.latitude,
@@ -36,118 +51,94 @@ class GistCommentRepository:
             user_id=user_id,
         )
 
+    async def create(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        comment_id: int,
+        gist_comment: CreateGistCommentRequest,
+    ) -> GistCommentResponse:
+        gist_comment_instance = self._build(user_id, comment_id, gist_comment)
+
         db.add(gist_comment_instance)
-        db.commit()
-        db.refresh(gist_comment_instance)
-
-        return GistCommentResponse(
-            id=gist_comment_instance.id,
-            comment_id=gist_comment_instance.comment_id,
-            city=gist_comment_instance.city,
-            latitude=gist_comment_instance.latitude,
-            longitude=gist_comment_instance.longitude,
-            comment_date=gist_comment_instance.comment_date,
-            current_temperature=gist_comment_instance.current_temperature,
-            weather_description=gist_comment_instance.weather_description,
-            forecast_day_1_date=gist_comment_instance.forecast_day_1_date,
-            forecast_day_1_temperature=gist_comment_instance.forecast_day_1_temperature,
-            forecast_day_2_date=gist_comment_instance.forecast_day_2_date,
-            forecast_day_2_temperature=gist_comment_instance.forecast_day_2_temperature,
-            forecast_day_3_date=gist_comment_instance.forecast_day_3_date,
-            forecast_day_3_temperature=gist_comment_instance.forecast_day_3_temperature,
-            forecast_day_4_date=gist_comment_instance.forecast_day_4_date,
-            forecast_day_4_temperature=gist_comment_instance.forecast_day_4_temperature,
-            forecast_day_5_date=gist_comment_instance.forecast_day_5_date,
-            forecast_day_5_temperature=gist_comment_instance.forecast_day_5_temperature,
-            user_id=gist_comment_instance.user_id,
-        )
+        await db.commit()
+        await db.refresh(gist_comment_instance)
 
-    async def get_all_comments_by_user_id(self, db: AsyncSession, user_id: int):
-        return db.query(GistComment).filter(GistComment.user_id == user_id).all()
+        return to_response(GistCommentResponse, gist_comment_instance)
 
-    async def get_gist_comment_by_id(self, db: AsyncSession, comment_id: int):
-        return (
-            db.query(GistComment).filter(GistComment.comment_id == comment_id).first()
+    async def create_pending(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        job_id: str,
+        gist_comment: CreateGistCommentRequest,
+        body: str,
+    ) -> GistCommentOutbox:
+        """Grava o relatório e a linha do outbox na mesma transação.
+
+        O comentário fica sem ``comment_id`` até o worker do outbox publicá-lo.
+        """
+        gist_comment_instance = self._build(user_id, None, gist_comment)
+        job = GistCommentOutbox(
+            id=job_id, body=body, gist_comment=gist_comment_instance
+        )
+        db.add_all([gist_comment_instance, job])
+        await db.commit()
+        return job
+
+    async def get_job(
+        self, db: AsyncSession, job_id: str
+    ) -> Optional[GistCommentOutbox]:
+        return await db.scalar(
+            select(GistCommentOutbox)
+            .options(joinedload(GistCommentOutbox.gist_comment))
+            .filter(GistCommentOutbox.id == job_id)
         )
 
-    async def update(
-        self, db: AsyncSession, gist_comment: GistComment, data: PutGistCommentRequest
+    async def get_all_comments_by_user_id(
+        self, db: AsyncSession, user_id: int, page: PageParams
     ):
-        gist_comment.city = data.city if data.city else gist_comment.city
-        gist_comment.latitude = (
-            data.latitude if data.latitude else gist_comment.latitude
-        )
-        gist_comment.longitude = (
-            data.longitude if data.longitude else gist_comment.longitude
-        )
-        gist_comment.current_temperature = (
-            data.current_temperature
-            if data.current_temperature
-            else gist_comment.current_temperature
-        )
-        gist_comment.weather_description = (
-            data.weather_description
-            if data.weather_description
-            else gist_comment.weather_description
-        )
-        gist_comment.forecast_day_1_date = (
-            data.forecast_day_1_date
-            if data.forecast_day_1_date
-            else gist_comment.forecast_day_1_date
-        )
-        gist_comment.forecast_day_1_temperature = (
-            data.forecast_day_1_temperature
-            if data.forecast_day_1_temperature
-            else gist_comment.forecast_day_1_temperature
-        )
-        gist_comment.forecast_day_2_date = (
-            data.forecast_day_2_date
-            if data.forecast_day_2_date
-            else gist_comment.forecast_day_2_date
+        return await fetch_page(
+            db,
+            select(GistComment).filter(GistComment.user_id == user_id),
+            timestamp_column=GistComment.comment_date,
+            id_column=GistComment.id,
+            city_column=GistComment.city,
+            page=page,
         )
-        gist_comment.forecast_day_2_temperature = (
-            data.forecast_day_2_temperature
-            if data.forecast_day_2_temperature
-            else gist_comment.forecast_day_2_temperature
-        )
-        gist_comment.forecast_day_3_date = (
-            data.forecast_day_3_date
-            if data.forecast_day_3_date
-            else gist_comment.forecast_day_3_date
-        )
-        gist_comment.forecast_day_3_temperature = (
-            data.forecast_day_3_temperature
-            if data.forecast_day_3_temperature
-            else gist_comment.forecast_day_3_temperature
-        )
-        gist_comment.forecast_day_4_date = (
-            data.forecast_day_4_date
-            if data.forecast_day_4_date
-            else gist_comment.forecast_day_4_date
-        )
-        gist_comment.forecast_day_4_temperature = (
-            data.forecast_day_4_temperature
-            if data.forecast_day_4_temperature
-            else gist_comment.forecast_day_4_temperature
-        )
-        gist_comment.forecast_day_5_date = (
-            data.forecast_day_5_date
-            if data.forecast_day_5_date
-            else gist_comment.forecast_day_5_date
+
+    async def stream_comments_by_user_id(
+        self, db: AsyncSession, user_id: int, filters: HistoryFilters
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        query = apply_history_filters(
+            select(*GistComment.__table__.columns).filter(
+                GistComment.user_id == user_id
+            ),
+            timestamp_column=GistComment.comment_date,
+            city_column=GistComment.city,
+            filters=filters,
+        ).order_by(GistComment.comment_date, GistComment.id)
+        # yield_per usa um cursor no servidor e entrega as linhas em lotes
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.mappings().partitions():
+            yield rows
+
+    async def get_gist_comment_by_id(self, db: AsyncSession, comment_id: int):
+        return await db.scalar(
+            select(GistComment).filter(GistComment.comment_id == comment_id)
         )
-        gist_comment.forecast_day_5_temperature = (
-            data.forecast_day_5_temperature
-            if data.forecast_day_5_temperature
-            else gist_comment.forecast_day_5_temperature
+
+    async def update(
+        self, db: AsyncSession, comment_id: int, data: PutGistCommentRequest
+    ) -> Optional[GistComment]:
+        return await update_returning(
+            db,
+            GistComment,
+            GistComment.comment_id == comment_id,
+            changed_values(GistComment, data),
         )
-        db.commit()
-        db.refresh(gist_comment)
-        return gist_comment
 
-    async def delete(self, db: AsyncSession, comment_id: int):
-        comment_entry = (
-            db.query(GistComment).filter(GistComment.comment_id == comment_id).first()
+    async def delete(self, db: AsyncSession, comment_id: int) -> Optional[GistComment]:
+        return await delete_returning(
+            db, GistComment, GistComment.comment_id == comment_id
         )
-        if comment_entry:
-            db.delete(comment_entry)
-            db.commit()
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import Optional
 
 from pydantic import BaseModel
 
@@ -26,12 +27,24 @@ class CreateGistCommentRequest(BaseModel):
 
 class GistCommentResponse(CreateGistCommentRequest):
     id: int
-    comment_id: int
+    comment_id: Optional[int]
     comment_date: datetime
 
 
+class GistCommentJobResponse(BaseModel):
+    job_id: str
+    status: str
+    attempts: int = 0
+    last_error: Optional[str] = None
+    comment: Optional[GistCommentResponse] = None
+
+    class Config:
+        from_attributes = True
+
+
 class GetAllGistCommentResponse(BaseModel):
     comments: list[GistCommentResponse]
+    next_cursor: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -39,7 +52,7 @@ class GetAllGistCommentResponse(BaseModel):
     @classmethod
     def model_validate(cls, data):
         if isinstance(data, cls):
-            data = data.model_dump()
+            return data
         return cls(**data)
 
 
@@ -1,6 +1,10 @@
-import pandas as pd
+import asyncio
+import uuid
+from functools import partial
+from typing import AsyncIterator, Awaitable, Callable
+
 from fastapi import Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.api.v1.current_weather.current_weather_repository import (
     CurrentWeatherRepository,
@@ -14,19 +18,30 @@ from app.api.v1.forecasts_weather.forecast_weather_repository import (
 from app.api.v1.forecasts_weather.forecast_weather_schemas import (
     CreateForecastWeatherRequest,
 )
+from app.api.v1.gist_comments.gist_comment_outbox_worker import get_gist_outbox_worker
 from app.api.v1.gist_comments.gist_comment_repository import GistCommentRepository
 from app.api.v1.gist_comments.gist_comment_schemas import (
     CreateGistCommentRequest,
     DeleteGistCommentResponse,
     GetAllGistCommentResponse,
+    GistCommentJobResponse,
     GistCommentResponse,
     PutGistCommentRequest,
     PutGistCommentResponse,
 )
 from app.clients.github.github_client import GitHubClient
 from app.clients.open_weather.open_weather_client import OpenWeatherClient
-from app.clients.open_weather.open_weather_schemas import CoordinatesRequest
+from app.clients.open_weather.open_weather_schemas import (
+    CoordinatesRequest,
+    GetCurrentWeatherResponse,
+    WeatherForecastResponseSchema,
+)
+from app.database.models.gist_comment_outbox import GistCommentOutbox
 from app.middleware.dependencies import AuthUser
+from app.utils.export import ExportFormat, encode_rows
+from app.utils.forecast_aggregator import aggregate_forecast
+from app.utils.pagination import HistoryFilters, PageParams
+from app.utils.serialization import to_response, to_responses
 
 
 class CommentService:
@@ -59,41 +74,71 @@ class CommentService:
         )
         return comment
 
-    async def post_gist_comment_by_coordinates(
-        self, authuser: AuthUser, db: AsyncSession, coordinates: CoordinatesRequest
-    ) -> GistCommentResponse:
-        current_weather_response_client = (
-            await self.open_weather_client.get_current_weather_by_coordinates(
-                coordinates=coordinates
-            )
-        )
-        if not current_weather_response_client:
-            raise HTTPException(status_code=404, detail="Current Weather not found")
+    async def _fetch_and_persist_weather(
+        self,
+        authuser: AuthUser,
+        db: AsyncSession,
+        current_weather_request: Callable[[], Awaitable[GetCurrentWeatherResponse]],
+        forecast_weather_request: Callable[
+            [], Awaitable[WeatherForecastResponseSchema]
+        ],
+    ):
+        # As duas chamadas ao OpenWeather rodam em paralelo; o clima atual é
+        # persistido enquanto a previsão ainda está em andamento. Se qualquer
+        # etapa falhar, a outra chamada é cancelada pelo TaskGroup. As
+        # corrotinas só são criadas aqui dentro, para que nenhuma fique sem
+        # ser aguardada.
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                current_weather_task = task_group.create_task(current_weather_request())
+                forecast_weather_task = task_group.create_task(
+                    forecast_weather_request()
+                )
 
-        current_weather = CreateCurrentWeatherRequest(
-            **current_weather_response_client.model_dump()
-        )
+                current_weather_response_client = await current_weather_task
+                if not current_weather_response_client:
+                    raise HTTPException(
+                        status_code=404, detail="Current Weather not found"
+                    )
 
-        current_weather_response_repository = (
-            await self.current_weather_repository.create(
-                db, authuser.id, current_weather
-            )
-        )
+                current_weather = CreateCurrentWeatherRequest(
+                    **current_weather_response_client.model_dump()
+                )
+                current_weather_response_repository = (
+                    await self.current_weather_repository.create(
+                        db, authuser.id, current_weather
+                    )
+                )
+
+                forecast_weather_response_client = await forecast_weather_task
+        except BaseExceptionGroup as exc_group:
+            raise exc_group.exceptions[0]
 
-        forecast_weather_response_client = (
-            await self.open_weather_client.get_forecast_weather_by_coordinates(
-                coordinates=coordinates
-            )
-        )
         if not forecast_weather_response_client:
             raise HTTPException(status_code=404, detail="Forecast Weather not found")
 
+        return current_weather_response_repository, forecast_weather_response_client
+
+    async def _prepare_gist_comment(
+        self,
+        authuser: AuthUser,
+        db: AsyncSession,
+        current_weather_request: Callable[[], Awaitable[GetCurrentWeatherResponse]],
+        forecast_weather_request: Callable[
+            [], Awaitable[WeatherForecastResponseSchema]
+        ],
+    ) -> CreateGistCommentRequest:
+        current_weather_response_repository, forecast_weather_response_client = (
+            await self._fetch_and_persist_weather(
+                authuser, db, current_weather_request, forecast_weather_request
+            )
+        )
+
         city = forecast_weather_response_client.city.name
         latitude = forecast_weather_response_client.city.coord.lat
         longitude = forecast_weather_response_client.city.coord.lon
-        list_forecast_wather = []
-        for weather_data in forecast_weather_response_client.list:
-            forecast_weather = CreateForecastWeatherRequest(
+        forecast_weathers = [
+            CreateForecastWeatherRequest(
                 city=city,
                 latitude=latitude,
                 longitude=longitude,
@@ -105,23 +150,15 @@ class CommentService:
                 humidity=weather_data.main.humidity,
                 wind_speed=weather_data.wind.speed,
             )
-            forecast_weather_response_repository = (
-                await self.forecast_weather_repository.create(
-                    db, authuser.id, forecast_weather
-                )
-            )
-            list_forecast_wather.append(
-                forecast_weather_response_repository.model_dump()
-            )
-
-        df = pd.DataFrame(list_forecast_wather)
-        df["date_only"] = df["date"].dt.date
-        daily_avg_temp = (
-            df.groupby("date_only")["average_temperature"].mean().reset_index()
+            for weather_data in forecast_weather_response_client.list
+        ]
+        await self.forecast_weather_repository.create_many(
+            db, authuser.id, forecast_weathers
         )
-        next_5_days = daily_avg_temp.head(5)
 
-        gist_comment = CreateGistCommentRequest(
+        next_5_days = aggregate_forecast(forecast_weather_response_client, days=5)
+
+        return CreateGistCommentRequest(
             city=city,
             latitude=latitude,
             longitude=longitude,
@@ -131,151 +168,164 @@ class CommentService:
             weather_description=str(
                 current_weather_response_repository.weather_description
             ),
-            forecast_day_1_date=str(next_5_days["date_only"].iloc[0]),
-            forecast_day_1_temperature=next_5_days["average_temperature"].iloc[0],
-            forecast_day_2_date=str(next_5_days["date_only"].iloc[1]),
-            forecast_day_2_temperature=next_5_days["average_temperature"].iloc[1],
-            forecast_day_3_date=str(next_5_days["date_only"].iloc[2]),
-            forecast_day_3_temperature=next_5_days["average_temperature"].iloc[2],
-            forecast_day_4_date=str(next_5_days["date_only"].iloc[3]),
-            forecast_day_4_temperature=next_5_days["average_temperature"].iloc[3],
-            forecast_day_5_date=str(next_5_days["date_only"].iloc[4]),
-            forecast_day_5_temperature=next_5_days["average_temperature"].iloc[4],
+            forecast_day_1_date=str(next_5_days[0].date),
+            forecast_day_1_temperature=next_5_days[0].mean,
+            forecast_day_2_date=str(next_5_days[1].date),
+            forecast_day_2_temperature=next_5_days[1].mean,
+            forecast_day_3_date=str(next_5_days[2].date),
+            forecast_day_3_temperature=next_5_days[2].mean,
+            forecast_day_4_date=str(next_5_days[3].date),
+            forecast_day_4_temperature=next_5_days[3].mean,
+            forecast_day_5_date=str(next_5_days[4].date),
+            forecast_day_5_temperature=next_5_days[4].mean,
+        )
+
+    async def _post_gist_comment(
+        self,
+        authuser: AuthUser,
+        db: AsyncSession,
+        current_weather_request: Callable[[], Awaitable[GetCurrentWeatherResponse]],
+        forecast_weather_request: Callable[
+            [], Awaitable[WeatherForecastResponseSchema]
+        ],
+    ) -> GistCommentResponse:
+        gist_comment = await self._prepare_gist_comment(
+            authuser, db, current_weather_request, forecast_weather_request
         )
 
         gist_response = await self.github_client.create_gist_comment(
             comment=self.generate_comment(data=gist_comment)
         )
 
-        gist_comment_response_repository = await self.gist_comment_repository.create(
+        return await self.gist_comment_repository.create(
             db, authuser.id, gist_response["comment_id"], gist_comment
         )
 
-        return GistCommentResponse(**gist_comment_response_repository.model_dump())
+    async def post_gist_comment_by_coordinates(
+        self, authuser: AuthUser, db: AsyncSession, coordinates: CoordinatesRequest
+    ) -> GistCommentResponse:
+        return await self._post_gist_comment(
+            authuser,
+            db,
+            partial(
+                self.open_weather_client.get_current_weather_by_coordinates,
+                coordinates=coordinates,
+            ),
+            partial(
+                self.open_weather_client.get_forecast_weather_by_coordinates,
+                coordinates=coordinates,
+            ),
+        )
 
     async def post_gist_comment_by_city(
         self, authuser: AuthUser, db: AsyncSession, city: str
     ) -> GistCommentResponse:
-        current_weather_response_client = (
-            await self.open_weather_client.get_current_weather_by_city(city=city)
+        return await self._post_gist_comment(
+            authuser,
+            db,
+            partial(self.open_weather_client.get_current_weather_by_city, city=city),
+            partial(self.open_weather_client.get_forecast_weather_by_city, city=city),
         )
-        if not current_weather_response_client:
-            raise HTTPException(status_code=404, detail="Current Weather not found")
 
-        current_weather = CreateCurrentWeatherRequest(
-            **current_weather_response_client.model_dump()
+    async def _enqueue_gist_comment(
+        self,
+        authuser: AuthUser,
+        db: AsyncSession,
+        current_weather_request: Callable[[], Awaitable[GetCurrentWeatherResponse]],
+        forecast_weather_request: Callable[
+            [], Awaitable[WeatherForecastResponseSchema]
+        ],
+    ) -> GistCommentJobResponse:
+        # O relatório e o comentário a publicar são gravados juntos; a chamada
+        # ao GitHub fica com o worker do outbox, fora do caminho da requisição
+        gist_comment = await self._prepare_gist_comment(
+            authuser, db, current_weather_request, forecast_weather_request
         )
-
-        current_weather_response_repository = (
-            await self.current_weather_repository.create(
-                db, authuser.id, current_weather
-            )
+        job = await self.gist_comment_repository.create_pending(
+            db,
+            authuser.id,
+            uuid.uuid4().hex,
+            gist_comment,
+            self.generate_comment(data=gist_comment),
         )
+        get_gist_outbox_worker().notify()
+        return self._job_response(job)
 
-        forecast_weather_response_client = (
-            await self.open_weather_client.get_forecast_weather_by_city(city=city)
-        )
-        if not forecast_weather_response_client:
-            raise HTTPException(status_code=404, detail="Forecast Weather not found")
-
-        city = forecast_weather_response_client.city.name
-        latitude = forecast_weather_response_client.city.coord.lat
-        longitude = forecast_weather_response_client.city.coord.lon
-        list_forecast_wather = []
-        for weather_data in forecast_weather_response_client.list:
-            forecast_weather = CreateForecastWeatherRequest(
-                city=city,
-                latitude=latitude,
-                longitude=longitude,
-                date=weather_data.dt,
-                average_temperature=weather_data.main.temp,
-                min_temperature=weather_data.main.temp_min,
-                max_temperature=weather_data.main.temp_max,
-                weather_description=weather_data.weather[0].description,
-                humidity=weather_data.main.humidity,
-                wind_speed=weather_data.wind.speed,
-            )
-            forecast_weather_response_repository = (
-                await self.forecast_weather_repository.create(
-                    db, authuser.id, forecast_weather
-                )
-            )
-            list_forecast_wather.append(
-                forecast_weather_response_repository.model_dump()
-            )
-
-        df = pd.DataFrame(list_forecast_wather)
-        df["date_only"] = df["date"].dt.date
-        daily_avg_temp = (
-            df.groupby("date_only")["average_temperature"].mean().reset_index()
-        )
-        next_5_days = daily_avg_temp.head(5)
-
-        gist_comment = CreateGistCommentRequest(
-            city=city,
-            latitude=latitude,
-            longitude=longitude,
-            current_temperature=float(
-                current_weather_response_repository.current_temperature
+    async def enqueue_gist_comment_by_coordinates(
+        self, authuser: AuthUser, db: AsyncSession, coordinates: CoordinatesRequest
+    ) -> GistCommentJobResponse:
+        return await self._enqueue_gist_comment(
+            authuser,
+            db,
+            partial(
+                self.open_weather_client.get_current_weather_by_coordinates,
+                coordinates=coordinates,
             ),
-            weather_description=str(
-                current_weather_response_repository.weather_description
+            partial(
+                self.open_weather_client.get_forecast_weather_by_coordinates,
+                coordinates=coordinates,
             ),
-            forecast_day_1_date=str(next_5_days["date_only"].iloc[0]),
-            forecast_day_1_temperature=next_5_days["average_temperature"].iloc[0],
-            forecast_day_2_date=str(next_5_days["date_only"].iloc[1]),
-            forecast_day_2_temperature=next_5_days["average_temperature"].iloc[1],
-            forecast_day_3_date=str(next_5_days["date_only"].iloc[2]),
-            forecast_day_3_temperature=next_5_days["average_temperature"].iloc[2],
-            forecast_day_4_date=str(next_5_days["date_only"].iloc[3]),
-            forecast_day_4_temperature=next_5_days["average_temperature"].iloc[3],
-            forecast_day_5_date=str(next_5_days["date_only"].iloc[4]),
-            forecast_day_5_temperature=next_5_days["average_temperature"].iloc[4],
         )
 
-        gist_response = await self.github_client.create_gist_comment(
-            comment=self.generate_comment(data=gist_comment)
+    async def enqueue_gist_comment_by_city(
+        self, authuser: AuthUser, db: AsyncSession, city: str
+    ) -> GistCommentJobResponse:
+        return await self._enqueue_gist_comment(
+            authuser,
+            db,
+            partial(self.open_weather_client.get_current_weather_by_city, city=city),
+            partial(self.open_weather_client.get_forecast_weather_by_city, city=city),
         )
 
-        gist_comment_response_repository = await self.gist_comment_repository.create(
-            db, authuser.id, gist_response["comment_id"], gist_comment
-        )
+    async def get_gist_comment_job(
+        self, db: AsyncSession, authuser: AuthUser, job_id: str
+    ) -> GistCommentJobResponse:
+        job = await self.gist_comment_repository.get_job(db, job_id)
+        if not job or job.gist_comment.user_id != authuser.id:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return self._job_response(job)
 
-        return GistCommentResponse(**gist_comment_response_repository.model_dump())
+    @staticmethod
+    def _job_response(job: GistCommentOutbox) -> GistCommentJobResponse:
+        return GistCommentJobResponse(
+            job_id=job.id,
+            status=job.status.value,
+            attempts=job.attempts,
+            last_error=job.last_error,
+            comment=to_response(GistCommentResponse, job.gist_comment),
+        )
 
     async def get_all_gist_comment_by_user(
-        self, db: AsyncSession, user_id: int
+        self, db: AsyncSession, user_id: int, page: PageParams
     ) -> GetAllGistCommentResponse:
-        comments = await self.gist_comment_repository.get_all_comments_by_user_id(
-            db, user_id
+        comments, next_cursor = (
+            await self.gist_comment_repository.get_all_comments_by_user_id(
+                db, user_id, page
+            )
         )
         if not comments:
             raise HTTPException(status_code=404, detail="Comments not found")
 
-        comments_list = [
-            GistCommentResponse(
-                id=comment.id,
-                comment_id=comment.comment_id,
-                comment_date=comment.comment_date,
-                city=comment.city,
-                latitude=comment.latitude,
-                longitude=comment.longitude,
-                current_temperature=comment.current_temperature,
-                weather_description=comment.weather_description,
-                forecast_day_1_date=comment.forecast_day_1_date,
-                forecast_day_1_temperature=comment.forecast_day_1_temperature,
-                forecast_day_2_date=comment.forecast_day_2_date,
-                forecast_day_2_temperature=comment.forecast_day_2_temperature,
-                forecast_day_3_date=comment.forecast_day_3_date,
-                forecast_day_3_temperature=comment.forecast_day_3_temperature,
-                forecast_day_4_date=comment.forecast_day_4_date,
-                forecast_day_4_temperature=comment.forecast_day_4_temperature,
-                forecast_day_5_date=comment.forecast_day_5_date,
-                forecast_day_5_temperature=comment.forecast_day_5_temperature,
+        comments_list = to_responses(GistCommentResponse, comments)
+        return GetAllGistCommentResponse(
+            comments=comments_list, next_cursor=next_cursor
+        )
+
+    async def export_gist_comments_by_user(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        user_id: int,
+        filters: HistoryFilters,
+        format: ExportFormat,
+    ) -> AsyncIterator[bytes]:
+        async with session_factory() as db:
+            partitions = self.gist_comment_repository.stream_comments_by_user_id(
+                db, user_id, filters
             )
-            for comment in comments
-        ]
-        return GetAllGistCommentResponse(comments=comments_list)
+            async for chunk in encode_rows(
+                partitions, self.gist_comment_repository.export_columns, format
+            ):
+                yield chunk
 
     async def update_gist_comment(
         self, db: AsyncSession, comment_id: int, data: PutGistCommentRequest
@@ -308,30 +358,15 @@ class CommentService:
                 )
             ),
         )
-        updated_comment = await self.gist_comment_repository.update(db, comment, data)
+        updated_comment = await self.gist_comment_repository.update(
+            db, comment_id, data
+        )
+        if not updated_comment:
+            raise HTTPException(status_code=404, detail="Comment not found")
 
         return PutGistCommentResponse(
             message="Comment updated successfully",
-            response=GistCommentResponse(
-                id=updated_comment.id,
-                comment_id=updated_comment.comment_id,
-                comment_date=updated_comment.comment_date,
-                city=updated_comment.city,
-                latitude=updated_comment.latitude,
-                longitude=updated_comment.longitude,
-                current_temperature=updated_comment.current_temperature,
-                weather_description=updated_comment.weather_description,
-                forecast_day_1_date=updated_comment.forecast_day_1_date,
-                forecast_day_1_temperature=updated_comment.forecast_day_1_temperature,
-                forecast_day_2_date=updated_comment.forecast_day_2_date,
-                forecast_day_2_temperature=updated_comment.forecast_day_2_temperature,
-                forecast_day_3_date=updated_comment.forecast_day_3_date,
-                forecast_day_3_temperature=updated_comment.forecast_day_3_temperature,
-                forecast_day_4_date=updated_comment.forecast_day_4_date,
-                forecast_day_4_temperature=updated_comment.forecast_day_4_temperature,
-                forecast_day_5_date=updated_comment.forecast_day_5_date,
-                forecast_day_5_temperature=updated_comment.forecast_day_5_temperature,
-            ),
+            response=to_response(GistCommentResponse, updated_comment),
         )
 
     async def delete_gist_comment(
@@ -344,27 +379,8 @@ class CommentService:
             raise HTTPException(status_code=404, detail="Comment not found")
 
         await self.github_client.delete_gist_comment(comment_id=comment_id)
-        await self.gist_comment_repository.delete(db, comment.comment_id)
+        await self.gist_comment_repository.delete(db, comment_id)
         return DeleteGistCommentResponse(
             message="Comment deleted successfully",
-            response=GistCommentResponse(
-                id=comment.id,
-                comment_id=comment.comment_id,
-                comment_date=comment.comment_date,
-                city=comment.city,
-                latitude=comment.latitude,
-                longitude=comment.longitude,
-                current_temperature=comment.current_temperature,
-                weather_description=comment.weather_description,
-                forecast_day_1_date=comment.forecast_day_1_date,
-                forecast_day_1_temperature=comment.forecast_day_1_temperature,
-                forecast_day_2_date=comment.forecast_day_2_date,
-                forecast_day_2_temperature=comment.forecast_day_2_temperature,
-                forecast_day_3_date=comment.forecast_day_3_date,
-                forecast_day_3_temperature=comment.forecast_day_3_temperature,
-                forecast_day_4_date=comment.forecast_day_4_date,
-                forecast_day_4_temperature=comment.forecast_day_4_temperature,
-                forecast_day_5_date=comment.forecast_day_5_date,
-                forecast_day_5_temperature=comment.forecast_day_5_temperature,
-            ),
+            response=to_response(GistCommentResponse, comment),
         )
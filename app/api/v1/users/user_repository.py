@@ -1,38 +1,47 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.users.user_schemas import PutUserRequest, PutUsersMeRequest
 from app.database.models.user import User
+from app.database.statements import changed_values, delete_returning, update_returning
+
+# Colunas anuláveis no banco, mas obrigatórias nas respostas: um null explícito
+# na requisição mantém o valor atual
+REQUIRED_FIELDS = ("name", "email")
 
 
 class UserRepository:
-    async def get_user_by_id(self, db: Session, user_id: int):
-        return db.query(User).filter(User.id == user_id).first()
+    async def get_user_by_id(self, db: AsyncSession, user_id: int):
+        return await db.scalar(select(User).filter(User.id == user_id))
 
-    async def get_user_by_email(self, db: Session, email: str):
-        return db.query(User).filter(User.email == email).first()
+    async def get_user_by_email(self, db: AsyncSession, email: str):
+        return await db.scalar(select(User).filter(User.email == email))
 
     async def update_user_profile(
-        self, db: Session, user: User, data: PutUsersMeRequest
-    ):
-        user.name = data.name if data.name else user.name  # type: ignore
-        user.email = data.email if data.email else user.email  # type: ignore
-        db.commit()
-        db.refresh(user)
-        return user
-
-    async def update_user(self, db: Session, user: User, data: PutUserRequest):
-        user.name = data.name if data.name else user.name  # type: ignore
-        user.email = data.email if data.email else user.email  # type: ignore
-        db.commit()
-        db.refresh(user)
-        return user
-
-    async def delete_user(self, db: Session, user_id: int):
-        user_entry = db.query(User).filter(User.id == user_id).first()
-        if user_entry:
-            db.delete(user_entry)
-            db.commit()
-            return user_entry
-
-    async def get_all_users(self, db: Session):
-        return db.query(User).all()
+        self, db: AsyncSession, user_id: int, data: PutUsersMeRequest
+    ) -> Optional[User]:
+        return await update_returning(
+            db,
+            User,
+            User.id == user_id,
+            changed_values(User, data, non_null=REQUIRED_FIELDS),
+        )
+
+    async def update_user(
+        self, db: AsyncSession, user_id: int, data: PutUserRequest
+    ) -> Optional[User]:
+        return await update_returning(
+            db,
+            User,
+            User.id == user_id,
+            changed_values(User, data, non_null=REQUIRED_FIELDS),
+        )
+
+    async def delete_user(self, db: AsyncSession, user_id: int) -> Optional[User]:
+        return await delete_returning(db, User, User.id == user_id)
+
+    async def get_all_users(self, db: AsyncSession):
+        result = await db.scalars(select(User))
+        return result.all()
@@ -1,5 +1,5 @@
 from fastapi import Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.users.user_repository import UserRepository
 from app.api.v1.users.user_schemas import (
@@ -21,7 +21,7 @@ class UserService:
         self.user_repository = user_repository
 
     async def get_authenticated_user(
-        self, db: Session, authuser: AuthUser
+        self, db: AsyncSession, authuser: AuthUser
     ) -> GetUsersMeResponse:
         user = await self.user_repository.get_user_by_id(db, authuser.id)
         if not user:
@@ -33,20 +33,21 @@ class UserService:
         )
 
     async def update_user_profile(
-        self, db: Session, authuser: AuthUser, data: PutUsersMeRequest
+        self, db: AsyncSession, authuser: AuthUser, data: PutUsersMeRequest
     ) -> PutUsersMeResponse:
-        user = await self.user_repository.get_user_by_id(db, authuser.id)
-        if not user:
+        updated_user = await self.user_repository.update_user_profile(
+            db, authuser.id, data
+        )
+        if not updated_user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        updated_user = await self.user_repository.update_user_profile(db, user, data)
         return PutUsersMeResponse(
             id=updated_user.id,
             email=updated_user.email,
             name=updated_user.name,
         )
 
-    async def get_all_users(self, db: Session) -> GetUsersResponse:
+    async def get_all_users(self, db: AsyncSession) -> GetUsersResponse:
         users = await self.user_repository.get_all_users(db)
         users_list = [
             User(id=user.id, email=user.email, name=user.name, is_active=user.is_active)
@@ -54,32 +55,30 @@ class UserService:
         ]
         return GetUsersResponse(users=users_list)
 
-    async def get_user_by_id(self, db: Session, user_id: int) -> GetUserResponse:
+    async def get_user_by_id(self, db: AsyncSession, user_id: int) -> GetUserResponse:
         user = await self.user_repository.get_user_by_id(db, user_id)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         return GetUserResponse(id=user.id, email=user.email, name=user.name)
 
     async def update_user(
-        self, db: Session, user_id: int, data: PutUserRequest
+        self, db: AsyncSession, user_id: int, data: PutUserRequest
     ) -> PutUserResponse:
-        user = await self.user_repository.get_user_by_id(db, user_id)
-        if not user:
+        updated_user = await self.user_repository.update_user(db, user_id, data)
+        if not updated_user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        updated_user = await self.user_repository.update_user(db, user, data)
         return PutUserResponse(
             id=updated_user.id,
             email=updated_user.email,
             name=updated_user.name,
         )
 
-    async def delete_user(self, db: Session, user_id: int) -> DeleteUserResponse:
-        user = await self.user_repository.get_user_by_id(db, user_id)
-        if not user:
+    async def delete_user(self, db: AsyncSession, user_id: int) -> DeleteUserResponse:
+        deleted_user = await self.user_repository.delete_user(db=db, user_id=user_id)
+        if not deleted_user:
             raise HTTPException(status_code=404, detail="User not found")
 
-        deleted_user = await self.user_repository.delete_user(db=db, user_id=user_id)
         return DeleteUserResponse(
             id=deleted_user.id,
             email=deleted_user.email,
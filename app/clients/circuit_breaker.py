@@ -0,0 +1,84 @@
+import logging
+import time
+from enum import Enum
+
+from app.utils.metrics import (
+    CIRCUIT_BREAKER_OPENED,
+    CIRCUIT_BREAKER_REJECTED,
+    CIRCUIT_BREAKER_STATE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+# Valor exportado no gauge circuit_breaker_state
+STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitBreaker:
+    """Circuit breaker por host com os estados fechado, aberto e meio-aberto.
+
+    Após ``failure_threshold`` falhas consecutivas o circuito abre e as
+    requisições falham imediatamente. Passados ``recovery_time`` segundos uma
+    única requisição de teste é liberada (meio-aberto): se ela der certo o
+    circuito fecha, caso contrário volta a abrir.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, recovery_time: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        CIRCUIT_BREAKER_STATE.labels(name).set(STATE_VALUES[self.state])
+
+    def allow_request(self) -> bool:
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at >= self.recovery_time:
+                self._transition(CircuitState.HALF_OPEN)
+            else:
+                CIRCUIT_BREAKER_REJECTED.labels(self.name).inc()
+                return False
+        if self._probe_in_flight:
+            CIRCUIT_BREAKER_REJECTED.labels(self.name).inc()
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        if self.state != CircuitState.CLOSED:
+            self._transition(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == CircuitState.HALF_OPEN or (
+            self.state == CircuitState.CLOSED
+            and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._opened_at = time.monotonic()
+            CIRCUIT_BREAKER_OPENED.labels(self.name).inc()
+            self._transition(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """Libera a vaga de teste sem contabilizar sucesso ou falha."""
+        self._probe_in_flight = False
+
+    def _transition(self, state: CircuitState) -> None:
+        logger.warning(
+            f"Circuit breaker {self.name}: {self.state.value} -> {state.value}"
+        )
+        self.state = state
+        CIRCUIT_BREAKER_STATE.labels(self.name).set(STATE_VALUES[state])
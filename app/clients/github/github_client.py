@@ -1,45 +1,89 @@
-from github import Github, GithubException
+from typing import Optional
 
+from app.clients.github.rate_limiter import GitHubRateLimiter, get_github_rate_limiter
+from app.clients.http_client import HttpClient, HTTPClientException
 from app.config import Environment
 from app.utils.env_vars import validate_variables
 
 
 class GitHubClient:
-    def __init__(self):
+    def __init__(
+        self,
+        http_client: Optional[HttpClient] = None,
+        rate_limiter: Optional[GitHubRateLimiter] = None,
+    ):
         environment = validate_variables(Environment)
-        self.client = Github(str(environment.SECRET_KEY_GITHUB))
+        self.http_client = http_client if http_client is not None else HttpClient()
+        # Compartilhado entre as instâncias: o limite é por token, não por cliente
+        self.rate_limiter = (
+            rate_limiter if rate_limiter is not None else get_github_rate_limiter()
+        )
         self.gist_id = str(environment.GIST_ID)
+        api_url = str(environment.GITHUB_API_URL).rstrip("/")
+        self.gist_url = f"{api_url}/gists/{self.gist_id}"
+        self.headers = {
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {environment.SECRET_KEY_GITHUB}",
+            "X-GitHub-Api-Version": "2022-11-28",
+        }
 
     async def get_gist(self):
         try:
-            gist = self.client.get_gist(self.gist_id)
-            return gist
-        except GithubException as e:
-            raise ValueError(f"Error fetching gist: {e}")
+            response = await self.http_client.make_request(
+                self.gist_url,
+                "GET",
+                headers=self.headers,
+                timing_phase="github",
+                on_response=self.rate_limiter.observe,
+            )
+            return response.json()
+        except HTTPClientException as e:
+            raise ValueError(f"Error fetching gist: {e.status_code} {e.message}")
 
     async def create_gist_comment(self, comment: str):
         try:
-            gist = await self.get_gist()
-            created_comment = gist.create_comment(comment)
-            comment_id = created_comment.id
+            response = await self.rate_limiter.submit(
+                lambda on_response: self.http_client.make_request(
+                    f"{self.gist_url}/comments",
+                    "POST",
+                    headers=self.headers,
+                    timing_phase="github",
+                    on_response=on_response,
+                    json={"body": comment},
+                )
+            )
+            comment_id = response.json()["id"]
             return {"message": "Comment added successfully", "comment_id": comment_id}
-        except GithubException as e:
-            raise ValueError(f"Error creating comment: {e}")
+        except HTTPClientException as e:
+            raise ValueError(f"Error creating comment: {e.status_code} {e.message}")
 
     async def edit_gist_comment(self, comment_id: int, new_comment: str):
         try:
-            gist = await self.get_gist()
-            comment = gist.get_comment(comment_id)
-            comment.edit(new_comment)
+            await self.rate_limiter.submit(
+                lambda on_response: self.http_client.make_request(
+                    f"{self.gist_url}/comments/{comment_id}",
+                    "PATCH",
+                    headers=self.headers,
+                    timing_phase="github",
+                    on_response=on_response,
+                    json={"body": new_comment},
+                )
+            )
             return {"message": "Comment edited successfully"}
-        except GithubException as e:
-            raise ValueError(f"Error editing comment: {e}")
+        except HTTPClientException as e:
+            raise ValueError(f"Error editing comment: {e.status_code} {e.message}")
 
     async def delete_gist_comment(self, comment_id: int):
         try:
-            gist = await self.get_gist()
-            comment = gist.get_comment(comment_id)
-            comment.delete()
+            await self.rate_limiter.submit(
+                lambda on_response: self.http_client.make_request(
+                    f"{self.gist_url}/comments/{comment_id}",
+                    "DELETE",
+                    headers=self.headers,
+                    timing_phase="github",
+                    on_response=on_response,
+                )
+            )
             return {"message": "Comment deleted successfully"}
-        except GithubException as e:
-            raise ValueError(f"Error deleting comment: {e}")
+        except HTTPClientException as e:
+            raise ValueError(f"Error deleting comment: {e.status_code} {e.message}")
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+import math
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from fastapi import HTTPException
+from httpx import Response
+
+from app.clients.http_client import HTTPClientException
+from app.config import Environment
+from app.utils.env_vars import validate_variables
+from app.utils.metrics import (
+    GITHUB_RATE_LIMIT_REMAINING,
+    GITHUB_RATE_LIMITED,
+    GITHUB_WRITE_QUEUE_DEPTH,
+    GITHUB_WRITE_QUEUE_WAIT,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RATE_LIMIT_STATUS_CODES = {403, 429}
+
+
+class GitHubRateLimitExceeded(HTTPClientException):
+    """Resposta 403/429 do GitHub causada por limite de requisições."""
+
+    def __init__(self, status_code: int, retry_at: float):
+        super().__init__(
+            status_code=status_code,
+            code="RATE_LIMITED",
+            details="",
+            message="GitHub rate limit exceeded",
+        )
+        self.retry_at = retry_at
+
+
+class GitHubWriteThrottled(HTTPException):
+    """A escrita não consegue saldo dentro do tempo máximo de espera."""
+
+    def __init__(self, retry_at: float):
+        retry_after = max(1, math.ceil(retry_at - time.time()))
+        super().__init__(
+            status_code=503,
+            detail="GitHub write budget exhausted, try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
+        self.retry_at = retry_at
+
+
+class GitHubRateLimiter:
+    """Agenda as escritas no GitHub respeitando os limites da API.
+
+    As escritas passam por um token bucket de ``rate`` requisições por
+    segundo (rajadas de até ``burst``), que segue o limite secundário do
+    GitHub para criação de conteúdo. Os headers ``X-RateLimit-Remaining`` e
+    ``X-RateLimit-Reset`` de cada resposta atualizam o saldo do limite
+    primário: com o saldo zerado, as escritas esperam o reset. Um 403/429 de
+    limite (com ``Retry-After`` ou saldo zerado) pausa todas as escritas até
+    o horário indicado e a requisição volta para a fila, até
+    ``max_retries`` vezes.
+
+    A fila é FIFO e tem no máximo ``max_queue_size`` requisições esperando.
+    Cada escrita espera no máximo ``max_wait`` segundos, somando fila e
+    retentativas; se o saldo não chegar a tempo (ou a fila estiver cheia) ela
+    falha com ``GitHubWriteThrottled`` (503 com ``Retry-After``).
+
+    O bucket é por processo: com N workers a taxa real é N vezes ``rate``,
+    então o limite configurado deve ser dividido pelo número de workers.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_queue_size: int = 100,
+        max_retries: int = 3,
+        secondary_backoff: float = 60.0,
+        max_wait: float = 10.0,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_queue_size = max_queue_size
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self.secondary_backoff = secondary_backoff
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self.blocked_until = 0.0
+        self.queue_depth = 0
+        self._tokens = float(burst)
+        self._refilled_at = time.time()
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def observe(self, response: Response) -> None:
+        """Atualiza o saldo com os headers de uma resposta do GitHub.
+
+        Levanta ``GitHubRateLimitExceeded`` se a resposta foi recusada por
+        limite de requisições.
+        """
+        now = time.time()
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        reset = response.headers.get("X-RateLimit-Reset")
+        if remaining is not None and remaining.isdigit():
+            self.remaining = int(remaining)
+            GITHUB_RATE_LIMIT_REMAINING.set(self.remaining)
+        if reset is not None and reset.isdigit():
+            self.reset_at = float(reset)
+
+        if response.status_code not in RATE_LIMIT_STATUS_CODES:
+            return
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            retry_at = now + float(retry_after)
+        elif remaining == "0":
+            retry_at = max(now, self.reset_at)
+        elif response.status_code == 429:
+            # Limite secundário sem indicação de espera: o GitHub recomenda
+            # aguardar pelo menos um minuto
+            retry_at = now + self.secondary_backoff
+        else:
+            # 403 sem sinais de limite é erro de permissão
+            return
+
+        self.blocked_until = max(self.blocked_until, retry_at)
+        GITHUB_RATE_LIMITED.inc()
+        logger.warning(
+            "Limite de requisições do GitHub atingido; escritas pausadas por %.1fs",
+            retry_at - now,
+        )
+        raise GitHubRateLimitExceeded(response.status_code, retry_at)
+
+    async def submit(
+        self, send: Callable[[Callable[[Response], None]], Awaitable[T]]
+    ) -> T:
+        """Executa ``send(observe)`` quando houver saldo para mais uma escrita."""
+        deadline = time.time() + self.max_wait
+        attempt = 0
+        while True:
+            await self.acquire(deadline)
+            try:
+                return await send(self.observe)
+            except GitHubRateLimitExceeded:
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+
+    async def acquire(self, deadline: Optional[float] = None) -> None:
+        if deadline is None:
+            deadline = time.time() + self.max_wait
+        if self.queue_depth >= self.max_queue_size:
+            raise GitHubWriteThrottled(self._estimate_retry_at())
+
+        self.queue_depth += 1
+        GITHUB_WRITE_QUEUE_DEPTH.inc()
+        started = time.perf_counter()
+        try:
+            # O lock é FIFO: só a primeira da fila espera pelo próximo token
+            lock = self._get_lock()
+            try:
+                async with asyncio.timeout(max(0.0, deadline - time.time())):
+                    await lock.acquire()
+            except TimeoutError:
+                raise GitHubWriteThrottled(self._estimate_retry_at())
+            try:
+                while (delay := self._delay(time.time())) > 0:
+                    if time.time() + delay > deadline:
+                        raise GitHubWriteThrottled(time.time() + delay)
+                    await asyncio.sleep(delay)
+                self._tokens -= 1
+                if self.remaining is not None:
+                    self.remaining -= 1
+            finally:
+                lock.release()
+        finally:
+            self.queue_depth -= 1
+            GITHUB_WRITE_QUEUE_DEPTH.dec()
+            GITHUB_WRITE_QUEUE_WAIT.observe(time.perf_counter() - started)
+
+    def _estimate_retry_at(self) -> float:
+        # Espera do primeiro da fila mais um token para cada escrita à frente
+        now = time.time()
+        return now + max(1.0, self._delay(now)) + self.queue_depth / self.rate
+
+    def _get_lock(self) -> asyncio.Lock:
+        # Um Lock pertence ao event loop em que foi usado pela primeira vez
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _delay(self, now: float) -> float:
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.remaining is not None and self.remaining <= 0:
+            if now < self.reset_at:
+                return self.reset_at - now
+            # Passou o reset sem uma resposta nova: o saldo volta a ser
+            # desconhecido até a próxima resposta
+            self.remaining = None
+
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._refilled_at) * self.rate
+        )
+        self._refilled_at = now
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+
+_rate_limiter: Optional[GitHubRateLimiter] = None
+
+
+def get_github_rate_limiter() -> GitHubRateLimiter:
+    global _rate_limiter
+    if _rate_limiter is None:
+        environment = validate_variables(Environment)
+        _rate_limiter = GitHubRateLimiter(
+            rate=environment.GITHUB_WRITE_RATE_PER_MINUTE / 60,
+            burst=environment.GITHUB_WRITE_BURST,
+            max_queue_size=environment.GITHUB_WRITE_QUEUE_MAX_SIZE,
+            max_retries=environment.GITHUB_RATE_LIMIT_MAX_RETRIES,
+            max_wait=environment.GITHUB_WRITE_MAX_WAIT,
+        )
+    return _rate_limiter
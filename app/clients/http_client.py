@@ -1,10 +1,35 @@
+import asyncio
 import logging
-from typing import Any, List
+import random
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
 
 from fastapi import HTTPException
-from httpx import AsyncClient, HTTPStatusError, TimeoutException
+from httpx import (
+    URL,
+    AsyncClient,
+    HTTPStatusError,
+    Limits,
+    Response,
+    Timeout,
+    TimeoutException,
+    TransportError,
+)
 from pydantic import BaseModel
 
+from app.clients.circuit_breaker import CircuitBreaker
+from app.config import Environment
+from app.utils.env_vars import validate_variables
+from app.utils.metrics import HTTP_CLIENT_RETRIES, observe_outbound
+from app.utils.timing import timed
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_shared_client: Optional[AsyncClient] = None
+_shared_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
 
 class UnprocessableEntity(BaseModel):
     type: str
@@ -23,10 +48,162 @@ class HTTPClientException(HTTPException):
         self.message = message
 
 
+def _build_client() -> AsyncClient:
+    environment = validate_variables(Environment)
+    return AsyncClient(
+        limits=Limits(
+            max_connections=environment.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=environment.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=environment.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=Timeout(
+            connect=environment.HTTP_CONNECT_TIMEOUT,
+            read=environment.HTTP_READ_TIMEOUT,
+            write=environment.HTTP_WRITE_TIMEOUT,
+            pool=environment.HTTP_POOL_TIMEOUT,
+        ),
+    )
+
+
+def get_shared_client() -> Optional[AsyncClient]:
+    """Retorna o AsyncClient aberto pelo lifespan, se o loop corrente for o dele.
+
+    As conexões do pool pertencem ao event loop que as abriu e só podem ser
+    fechadas nele, então o cliente nunca é trocado de loop: fora do loop do
+    lifespan (testes sem lifespan, scripts) não há cliente compartilhado.
+    """
+    if (
+        _shared_client is None
+        or _shared_client.is_closed
+        or _shared_client_loop is not asyncio.get_running_loop()
+    ):
+        return None
+    return _shared_client
+
+
+async def open_shared_client() -> AsyncClient:
+    global _shared_client, _shared_client_loop
+    loop = asyncio.get_running_loop()
+    if _shared_client is not None and not _shared_client.is_closed:
+        if _shared_client_loop is not loop:
+            raise RuntimeError("Shared HTTP client is open in another event loop")
+        return _shared_client
+    _shared_client = _build_client()
+    _shared_client_loop = loop
+    return _shared_client
+
+
+async def close_shared_client() -> None:
+    global _shared_client, _shared_client_loop
+    if _shared_client is not None and not _shared_client.is_closed:
+        await _shared_client.aclose()
+    _shared_client = None
+    _shared_client_loop = None
+
+
+@asynccontextmanager
+async def _client() -> AsyncIterator[AsyncClient]:
+    shared_client = get_shared_client()
+    if shared_client is not None:
+        yield shared_client
+        return
+    # Sem o pool do lifespan, um cliente temporário fechado no mesmo loop
+    async with _build_client() as client:
+        yield client
+
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    breaker = _circuit_breakers.get(host)
+    if breaker is None:
+        environment = validate_variables(Environment)
+        breaker = CircuitBreaker(
+            name=host,
+            failure_threshold=environment.HTTP_BREAKER_FAILURE_THRESHOLD,
+            recovery_time=environment.HTTP_BREAKER_RECOVERY_TIME,
+        )
+        _circuit_breakers[host] = breaker
+    return breaker
+
+
 class HttpClient:
-    async def make_request(self, url: str, method: str, **kwargs):
+    def __init__(self) -> None:
+        environment = validate_variables(Environment)
+        self.retry_attempts = environment.HTTP_RETRY_ATTEMPTS
+        self.retry_backoff_base = environment.HTTP_RETRY_BACKOFF_BASE
+        self.retry_backoff_max = environment.HTTP_RETRY_BACKOFF_MAX
+
+    async def _backoff(
+        self, host: str, attempt: int, response: Optional[Response]
+    ) -> None:
+        delay = random.uniform(
+            0, min(self.retry_backoff_max, self.retry_backoff_base * 2**attempt)
+        )
+        retry_after = response.headers.get("Retry-After") if response else None
+        if retry_after and retry_after.isdigit():
+            delay = min(self.retry_backoff_max, float(retry_after))
+        HTTP_CLIENT_RETRIES.labels(host).inc()
+        logging.warning(f"Retrying request to {host} in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+    async def _send(self, method: str, url: str, **kwargs) -> Response:
+        host = URL(url).host
+        breaker = get_circuit_breaker(host)
+        attempts = 1 + (
+            self.retry_attempts if method.upper() in IDEMPOTENT_METHODS else 0
+        )
+        attempt = 0
+        async with _client() as client:
+            while True:
+                if not breaker.allow_request():
+                    raise HTTPClientException(
+                        status_code=503,
+                        code="CIRCUIT_OPEN",
+                        details="",
+                        message="Service unavailable",
+                    )
+                attempt += 1
+                try:
+                    response = await client.request(method, url, **kwargs)
+                except TransportError:
+                    breaker.record_failure()
+                    if attempt >= attempts:
+                        raise
+                    await self._backoff(host, attempt - 1, None)
+                    continue
+                except BaseException:
+                    breaker.release()
+                    raise
+
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+
+                if (
+                    response.status_code in RETRYABLE_STATUS_CODES
+                    and attempt < attempts
+                ):
+                    await self._backoff(host, attempt - 1, response)
+                    continue
+                return response
+
+    async def make_request(
+        self,
+        url: str,
+        method: str,
+        timing_phase: str = "http",
+        on_response: Optional[Callable[[Response], None]] = None,
+        **kwargs,
+    ):
         try:
-            response = await AsyncClient().request(method, url, **kwargs)
+            with timed(timing_phase), observe_outbound(
+                timing_phase, method
+            ) as outbound:
+                response = await self._send(method, url, **kwargs)
+                outbound.status = str(response.status_code)
+            # Permite ao chamador ler os headers mesmo de respostas de erro
+            if on_response is not None:
+                on_response(response)
             response.raise_for_status()
             return response
         except HTTPStatusError as http_err:
@@ -73,6 +250,8 @@ class HttpClient:
                     details="",
                     message="Server error",
                 )
+        except HTTPClientException:
+            raise
         except TimeoutException as e:
             logging.error(e)
             raise HTTPClientException(
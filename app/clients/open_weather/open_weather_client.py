@@ -1,3 +1,7 @@
+from typing import Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
 from app.clients.http_client import HttpClient
 from app.clients.open_weather.open_weather_schemas import (
     CoordinatesRequest,
@@ -6,72 +10,132 @@ from app.clients.open_weather.open_weather_schemas import (
 )
 from app.config import Environment
 from app.utils.env_vars import validate_variables
+from app.utils.single_flight import SingleFlight
+from app.utils.ttl_cache import TTLCache
+
+T = TypeVar("T", bound=BaseModel)
+
+_shared_cache: Optional[TTLCache] = None
+_shared_single_flight: Optional[SingleFlight] = None
+
+
+def get_open_weather_cache() -> TTLCache:
+    """Cache compartilhado por todas as instâncias de OpenWeatherClient do worker."""
+    global _shared_cache
+    if _shared_cache is None:
+        environment = validate_variables(Environment)
+        _shared_cache = TTLCache(
+            max_entries=environment.OPEN_WEATHER_CACHE_MAX_ENTRIES,
+            max_bytes=environment.OPEN_WEATHER_CACHE_MAX_BYTES,
+            name="openweather",
+        )
+    return _shared_cache
+
+
+def get_open_weather_single_flight() -> SingleFlight:
+    """Coalescedor compartilhado por todas as instâncias de OpenWeatherClient."""
+    global _shared_single_flight
+    if _shared_single_flight is None:
+        _shared_single_flight = SingleFlight()
+    return _shared_single_flight
 
 
 class OpenWeatherClient:
-    def __init__(self, http_client: HttpClient) -> None:
+    def __init__(
+        self,
+        http_client: HttpClient,
+        cache: Optional[TTLCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+    ) -> None:
         environment = validate_variables(Environment)
         self.current_weather_url = f"{str(environment.OPEN_WEATHER_URL)}weather"
         self.forrest_weather_url = f"{str(environment.OPEN_WEATHER_URL)}forecast"
         self.secret_key_open_weather = environment.SECRET_KEY_OPEN_WEATHER
         self.http_client = http_client
+        self.current_ttl = environment.OPEN_WEATHER_CACHE_CURRENT_TTL
+        self.forecast_ttl = environment.OPEN_WEATHER_CACHE_FORECAST_TTL
+        self.coordinates_precision = environment.OPEN_WEATHER_CACHE_COORD_PRECISION
+        self.cache = cache if cache is not None else get_open_weather_cache()
+        self.single_flight = (
+            single_flight
+            if single_flight is not None
+            else get_open_weather_single_flight()
+        )
+
+    def _city_key(self, kind: str, city: str) -> tuple:
+        return (kind, "city", " ".join(city.split()).casefold())
+
+    def _coordinates_key(self, kind: str, coordinates: CoordinatesRequest) -> tuple:
+        return (
+            kind,
+            "coordinates",
+            round(coordinates.latitude, self.coordinates_precision),
+            round(coordinates.longitude, self.coordinates_precision),
+        )
+
+    async def _get(
+        self, key: tuple, url: str, params: dict, schema: Type[T], ttl: float
+    ) -> T:
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        async def fetch() -> T:
+            response = await self.http_client.make_request(
+                url,
+                "GET",
+                timing_phase="openweather",
+                params={
+                    **params,
+                    "appid": self.secret_key_open_weather,
+                    "units": "metric",
+                    "lang": "pt_br",
+                },
+            )
+            data = schema(**response.json())
+            self.cache.set(key, data, ttl, len(response.content))
+            return data
+
+        return await self.single_flight.do(key, fetch)
 
     async def get_current_weather_by_coordinates(
         self, coordinates: CoordinatesRequest
     ) -> GetCurrentWeatherResponse:
-        response = await self.http_client.make_request(
+        return await self._get(
+            self._coordinates_key("current", coordinates),
             self.current_weather_url,
-            "GET",
-            params={
-                "lat": coordinates.latitude,
-                "lon": coordinates.longitude,
-                "appid": self.secret_key_open_weather,
-                "units": "metric",
-                "lang": "pt_br",
-            },
+            {"lat": coordinates.latitude, "lon": coordinates.longitude},
+            GetCurrentWeatherResponse,
+            self.current_ttl,
         )
-        return GetCurrentWeatherResponse(**response.json())
 
     async def get_current_weather_by_city(self, city: str) -> GetCurrentWeatherResponse:
-        response = await self.http_client.make_request(
+        return await self._get(
+            self._city_key("current", city),
             self.current_weather_url,
-            "GET",
-            params={
-                "q": city,
-                "appid": self.secret_key_open_weather,
-                "units": "metric",
-                "lang": "pt_br",
-            },
+            {"q": city},
+            GetCurrentWeatherResponse,
+            self.current_ttl,
         )
-        return GetCurrentWeatherResponse(**response.json())
 
     async def get_forecast_weather_by_coordinates(
         self, coordinates: CoordinatesRequest
     ) -> WeatherForecastResponseSchema:
-        response = await self.http_client.make_request(
+        return await self._get(
+            self._coordinates_key("forecast", coordinates),
             self.forrest_weather_url,
-            "GET",
-            params={
-                "lat": coordinates.latitude,
-                "lon": coordinates.longitude,
-                "appid": self.secret_key_open_weather,
-                "units": "metric",
-                "lang": "pt_br",
-            },
+            {"lat": coordinates.latitude, "lon": coordinates.longitude},
+            WeatherForecastResponseSchema,
+            self.forecast_ttl,
         )
-        return WeatherForecastResponseSchema(**response.json())
 
     async def get_forecast_weather_by_city(
         self, city: str
     ) -> WeatherForecastResponseSchema:
-        response = await self.http_client.make_request(
+        return await self._get(
+            self._city_key("forecast", city),
             self.forrest_weather_url,
-            "GET",
-            params={
-                "q": city,
-                "appid": self.secret_key_open_weather,
-                "units": "metric",
-                "lang": "pt_br",
-            },
+            {"q": city},
+            WeatherForecastResponseSchema,
+            self.forecast_ttl,
         )
-        return WeatherForecastResponseSchema(**response.json())
@@ -7,9 +7,76 @@ class Environment(BaseModel):
     TEST_DATABASE_URL: str
     SECRET_KEY: str
     SECRET_KEY_GITHUB: str
+    GITHUB_API_URL: AnyUrl = AnyUrl("https://api.github.com/")
     GIST_ID: str
     SECRET_KEY_OPEN_WEATHER: str
     SMTP_SERVER: str
     SMTP_PORT: int
     SMTP_USERNAME: str
     SMTP_PASSWORD: str
+
+    # Pool de conexões HTTP compartilhado (httpx.AsyncClient)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 5.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 10.0
+    HTTP_WRITE_TIMEOUT: float = 10.0
+    HTTP_POOL_TIMEOUT: float = 5.0
+
+    # Cache das respostas do OpenWeather (TTL em segundos)
+    OPEN_WEATHER_CACHE_CURRENT_TTL: float = 600
+    OPEN_WEATHER_CACHE_FORECAST_TTL: float = 1800
+    OPEN_WEATHER_CACHE_MAX_ENTRIES: int = 1024
+    OPEN_WEATHER_CACHE_MAX_BYTES: int = 16 * 1024 * 1024
+    OPEN_WEATHER_CACHE_COORD_PRECISION: int = 2
+
+    # Retentativas e circuit breaker do HttpClient
+    HTTP_RETRY_ATTEMPTS: int = 2
+    HTTP_RETRY_BACKOFF_BASE: float = 0.2
+    HTTP_RETRY_BACKOFF_MAX: float = 2.0
+    HTTP_BREAKER_FAILURE_THRESHOLD: int = 5
+    HTTP_BREAKER_RECOVERY_TIME: float = 30.0
+
+    # Revogação de tokens (filtro de Bloom em memória + blacklist no banco)
+    REVOCATION_BLOOM_CAPACITY: int = 100_000
+    REVOCATION_BLOOM_ERROR_RATE: float = 0.001
+    # Revogações feitas em outro worker valem aqui só após a próxima sincronização
+    REVOCATION_SYNC_INTERVAL: float = 5.0
+    BLACKLIST_PURGE_INTERVAL: float = 300.0
+    BLACKLIST_PURGE_BATCH_SIZE: int = 1000
+
+    # Hash de senhas (bcrypt em pool de threads)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_MAX_WORKERS: int = 4
+
+    # Fila de e-mails (conexão SMTP persistente em segundo plano)
+    SMTP_USE_SSL: bool = True
+    SMTP_IDLE_TIMEOUT: float = 60.0
+    MAIL_QUEUE_MAX_SIZE: int = 1000
+    MAIL_BATCH_SIZE: int = 50
+
+    # Cache dos tokens JWT já verificados
+    TOKEN_CACHE_MAX_ENTRIES: int = 10_000
+
+    # Header Server-Timing com o tempo de cada fase da requisição
+    SERVER_TIMING_ENABLED: bool = True
+
+    # Monitor de atraso do event loop (segundos)
+    LOOP_LAG_MONITOR_ENABLED: bool = True
+    LOOP_LAG_INTERVAL: float = 0.1
+    LOOP_LAG_THRESHOLD: float = 0.25
+
+    # Publicação assíncrona de comentários no Gist (outbox)
+    GIST_OUTBOX_CONCURRENCY: int = 4
+    GIST_OUTBOX_POLL_INTERVAL: float = 1.0
+    GIST_OUTBOX_MAX_ATTEMPTS: int = 5
+    GIST_OUTBOX_LEASE: float = 60.0
+
+    # Ritmo das escritas no GitHub (limite secundário: 80 por minuto). O
+    # limite vale por processo: divida pelo número de workers
+    GITHUB_WRITE_RATE_PER_MINUTE: float = 80.0
+    GITHUB_WRITE_BURST: int = 10
+    GITHUB_WRITE_QUEUE_MAX_SIZE: int = 100
+    GITHUB_RATE_LIMIT_MAX_RETRIES: int = 3
+    GITHUB_WRITE_MAX_WAIT: float = 10.0
@@ -1,10 +1,22 @@
+import logging
 import os
+import queue
 import smtplib
+import socket
+import ssl
+import threading
+import time
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from typing import List, Optional
 
 from fastapi import HTTPException
 
+from app.config import Environment
+from app.utils.env_vars import validate_variables
+
+logger = logging.getLogger(__name__)
+
 # Configurações do servidor de e-mail
 SMTP_SERVER = os.getenv("SMTP_SERVER")
 SMTP_PORT = int(os.getenv("SMTP_PORT", 465))
@@ -16,8 +28,225 @@ if not all([SMTP_SERVER, SMTP_USERNAME, SMTP_PASSWORD]):
         "As variáveis de ambiente SMTP_SERVER, SMTP_USERNAME e SMTP_PASSWORD devem estar definidas."
     )
 
+# Erros em que a conexão deve ser descartada e a mensagem reenviada. Respostas
+# 4xx do servidor (SMTPResponseException) também são temporárias; as 5xx não.
+# SMTPException herda de OSError, então OSError aqui engoliria as falhas
+# permanentes do protocolo.
+RECONNECT_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    ConnectionError,
+    socket.timeout,
+)
 
-async def send_pin_email(to_email: str, pin: str):
+_STOP = object()
+
+
+class MailQueue:
+    """Fila de e-mails em memória com um remetente em segundo plano.
+
+    ``enqueue`` só coloca a mensagem na fila e retorna; uma thread dedicada
+    mantém uma conexão SMTP autenticada aberta e a reaproveita entre os
+    envios. Mensagens que chegam juntas são enviadas em lote pela mesma
+    conexão, que é refeita quando o servidor a derruba e fechada depois de
+    ``idle_timeout`` segundos sem uso.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        use_ssl: bool = True,
+        max_size: int = 1000,
+        batch_size: int = 50,
+        idle_timeout: float = 60.0,
+        max_attempts: int = 3,
+        retry_backoff: float = 1.0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_ssl = use_ssl
+        self.batch_size = batch_size
+        self.idle_timeout = idle_timeout
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_size)
+        self._connection: Optional[smtplib.SMTP] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+
+    def enqueue(self, message: MIMEMultipart) -> None:
+        self.start()
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            raise HTTPException(
+                status_code=503, detail="Email service unavailable: queue is full"
+            )
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="mail-queue", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Envia o que já está na fila e encerra a conexão."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def join(self) -> None:
+        self._queue.join()
+
+    def _connect(self) -> smtplib.SMTP:
+        context = ssl.create_default_context()
+        if self.use_ssl:
+            connection: smtplib.SMTP = smtplib.SMTP_SSL(
+                self.host, self.port, context=context
+            )
+        else:
+            connection = smtplib.SMTP(self.host, self.port)
+            connection.ehlo()
+            # Com login o STARTTLS é obrigatório: sem ele as credenciais
+            # trafegariam em texto puro (starttls falha se o servidor não o
+            # oferecer). Sem login, só é usado quando disponível.
+            if self.username or connection.has_extn("starttls"):
+                connection.starttls(context=context)
+                connection.ehlo()
+        if self.username:
+            connection.login(self.username, self.password or "")
+        return connection
+
+    def _disconnect(self) -> None:
+        if self._connection is None:
+            return
+        try:
+            self._connection.quit()
+        except (smtplib.SMTPException, OSError):
+            self._connection.close()
+        self._connection = None
+
+    def _next_batch(self) -> Optional[List]:
+        try:
+            first = self._queue.get(timeout=self.idle_timeout)
+        except queue.Empty:
+            # Sem envios recentes: não segura a conexão aberta à toa
+            self._disconnect()
+            first = self._queue.get()
+
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            stop = False
+            for message in batch:
+                if message is _STOP:
+                    stop = True
+                else:
+                    try:
+                        self._send(message)
+                    except Exception:
+                        # Um erro inesperado não pode derrubar o remetente
+                        self.failed += 1
+                        self._disconnect()
+                        logger.exception("Falha inesperada ao enviar e-mail")
+                self._queue.task_done()
+            if stop:
+                self._disconnect()
+                return
+
+    def _send(self, message: MIMEMultipart) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                if self._connection is None:
+                    self._connection = self._connect()
+                self._connection.send_message(message)
+                self.sent += 1
+                return
+            except smtplib.SMTPRecipientsRefused:
+                logger.warning("Destinatário recusado: %s", message["To"])
+                break
+            except smtplib.SMTPAuthenticationError:
+                logger.error("Falha de autenticação no servidor SMTP")
+                self._disconnect()
+                break
+            except smtplib.SMTPResponseException as error:
+                if error.smtp_code >= 500:
+                    # Recusa permanente (remetente, conteúdo...): reenviar não adianta
+                    logger.error(
+                        "Servidor SMTP recusou o e-mail para %s: %s %s",
+                        message["To"],
+                        error.smtp_code,
+                        error.smtp_error,
+                    )
+                    break
+                self._retry_later(attempt)
+            except RECONNECT_ERRORS:
+                self._retry_later(attempt)
+            except smtplib.SMTPException:
+                logger.exception("Falha ao enviar e-mail para %s", message["To"])
+                self._disconnect()
+                break
+        self.failed += 1
+        logger.error("E-mail para %s descartado", message["To"])
+
+    def _retry_later(self, attempt: int) -> None:
+        logger.warning(
+            "Falha ao enviar e-mail (tentativa %d de %d)",
+            attempt,
+            self.max_attempts,
+            exc_info=True,
+        )
+        self._disconnect()
+        if attempt < self.max_attempts:
+            time.sleep(self.retry_backoff * attempt)
+
+
+_mail_queue: Optional[MailQueue] = None
+
+
+def get_mail_queue() -> MailQueue:
+    global _mail_queue
+    if _mail_queue is None:
+        environment = validate_variables(Environment)
+        _mail_queue = MailQueue(
+            host=str(SMTP_SERVER),
+            port=SMTP_PORT,
+            username=SMTP_USERNAME,
+            password=SMTP_PASSWORD,
+            use_ssl=environment.SMTP_USE_SSL,
+            max_size=environment.MAIL_QUEUE_MAX_SIZE,
+            batch_size=environment.MAIL_BATCH_SIZE,
+            idle_timeout=environment.SMTP_IDLE_TIMEOUT,
+        )
+    return _mail_queue
+
+
+def close_mail_queue() -> None:
+    global _mail_queue
+    if _mail_queue is not None:
+        _mail_queue.stop()
+        _mail_queue = None
+
+
+def build_pin_email(to_email: str, pin: str) -> MIMEMultipart:
     msg = MIMEMultipart()
     msg["From"] = str(SMTP_USERNAME)
     msg["To"] = to_email
@@ -55,16 +284,9 @@ async def send_pin_email(to_email: str, pin: str):
     """
 
     msg.attach(MIMEText(body, "html"))
+    return msg
 
-    try:
-        with smtplib.SMTP_SSL(str(SMTP_SERVER), SMTP_PORT) as server:
-            server.login(str(SMTP_USERNAME), str(SMTP_PASSWORD))
-            server.send_message(msg, to_addrs=to_email)
-    except smtplib.SMTPAuthenticationError:
-        raise HTTPException(status_code=401, detail="Authentication failed")
-    except smtplib.SMTPRecipientsRefused:
-        raise HTTPException(status_code=400, detail="Invalid email address")
-    except smtplib.SMTPException as e:
-        raise HTTPException(
-            status_code=503, detail="Email service unavailable: " + str(e)
-        )
+
+async def send_pin_email(to_email: str, pin: str):
+    # Retorna assim que a mensagem entra na fila; o envio é feito em segundo plano
+    get_mail_queue().enqueue(build_pin_email(to_email, pin))
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import Environment
+from app.database.models.blacklist import TokenBlacklist
+from app.utils.bloom_filter import BloomFilter
+from app.utils.env_vars import validate_variables
+
+logger = logging.getLogger(__name__)
+
+
+def to_datetime(timestamp: float) -> datetime:
+    # As colunas DateTime são gravadas em UTC sem fuso horário
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def to_timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+async def purge_expired_tokens(
+    session_factory: async_sessionmaker[AsyncSession], batch_size: int
+) -> int:
+    """Remove da blacklist, em lotes de ``batch_size``, os tokens já expirados.
+
+    Cada lote é uma transação curta, então a limpeza não segura locks sobre
+    a tabela inteira enquanto os logouts continuam gravando.
+    """
+    removed = 0
+    while True:
+        expired = (
+            select(TokenBlacklist.jti)
+            .filter(TokenBlacklist.expires_at <= to_datetime(time.time()))
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        async with session_factory() as db:
+            result = await db.execute(
+                delete(TokenBlacklist).where(TokenBlacklist.jti.in_(expired))
+            )
+            await db.commit()
+        removed += result.rowcount
+        if result.rowcount < batch_size:
+            return removed
+
+
+class RevocationChecker:
+    """Verifica se um token foi revogado sem consultar o banco a cada requisição.
+
+    Os tokens revogados ficam em um conjunto exato (com o ``exp`` de cada um)
+    e em um filtro de Bloom. Um token fora do filtro não foi revogado por
+    este worker; só um positivo do filtro que não esteja no conjunto (falso
+    positivo) consulta a tabela ``token_blacklist``. As chaves são o ``jti``
+    de cada token. Tarefas em segundo plano relêem periodicamente as
+    revogações ainda válidas e apagam do banco as que já expiraram.
+
+    Um token revogado em outro worker só entra no filtro deste na próxima
+    sincronização, então continua aceito por até ``sync_interval`` segundos
+    (``REVOCATION_SYNC_INTERVAL``).
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        sync_interval: float,
+        purge_interval: float = 300.0,
+        purge_batch_size: int = 1000,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.purge_interval = purge_interval
+        self.purge_batch_size = purge_batch_size
+        self._revoked: Dict[str, float] = {}
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._tasks: List[asyncio.Task] = []
+        self.db_lookups = 0
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def revoke(self, token_id: str, expires_at: float) -> None:
+        if expires_at <= time.time() or token_id in self._revoked:
+            return
+        self._revoked[token_id] = expires_at
+        self._bloom.add(token_id)
+        if self._bloom.count > self._bloom.capacity:
+            self._rebuild()
+
+    async def is_revoked(
+        self, token_id: str, session_factory: async_sessionmaker[AsyncSession]
+    ) -> bool:
+        if token_id not in self._bloom:
+            return False
+
+        expires_at = self._revoked.get(token_id)
+        if expires_at is not None:
+            return expires_at > time.time()
+
+        self.db_lookups += 1
+        async with session_factory() as db:
+            expires_at = await db.scalar(
+                select(TokenBlacklist.expires_at).filter(TokenBlacklist.jti == token_id)
+            )
+        if expires_at is None:
+            return False
+        self.revoke(token_id, to_timestamp(expires_at))
+        return to_timestamp(expires_at) > time.time()
+
+    async def sync(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        # A blacklist só guarda tokens ainda válidos, então relê-la inteira
+        # tem custo limitado pelo número de logouts da última hora.
+        query = select(TokenBlacklist.jti, TokenBlacklist.expires_at).filter(
+            TokenBlacklist.expires_at > to_datetime(time.time())
+        )
+        async with session_factory() as db:
+            rows = (await db.execute(query)).all()
+        for token_id, expires_at in rows:
+            self.revoke(token_id, to_timestamp(expires_at))
+
+        self._purge_expired()
+
+    async def start(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        await self.sync(session_factory)
+        self._tasks = [
+            asyncio.create_task(self._sync_forever(session_factory)),
+            asyncio.create_task(self._purge_forever(session_factory)),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    async def _sync_forever(
+        self, session_factory: async_sessionmaker[AsyncSession]
+    ) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync(session_factory)
+            except Exception:
+                logger.exception("Falha ao sincronizar a blacklist de tokens")
+
+    async def _purge_forever(
+        self, session_factory: async_sessionmaker[AsyncSession]
+    ) -> None:
+        while True:
+            await asyncio.sleep(self.purge_interval)
+            try:
+                removed = await purge_expired_tokens(
+                    session_factory, self.purge_batch_size
+                )
+                if removed:
+                    logger.info("%d tokens expirados removidos da blacklist", removed)
+            except Exception:
+                logger.exception("Falha ao limpar a blacklist de tokens")
+
+    def _purge_expired(self) -> None:
+        now = time.time()
+        expired = [key for key, exp in self._revoked.items() if exp <= now]
+        for key in expired:
+            del self._revoked[key]
+        if expired:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        # O filtro não remove itens: é recriado só com as revogações válidas
+        self._bloom = BloomFilter(
+            max(self.capacity, 2 * len(self._revoked)), self.error_rate
+        )
+        for key in self._revoked:
+            self._bloom.add(key)
+
+
+_revocation_checker: Optional[RevocationChecker] = None
+
+
+def get_revocation_checker() -> RevocationChecker:
+    global _revocation_checker
+    if _revocation_checker is None:
+        environment = validate_variables(Environment)
+        _revocation_checker = RevocationChecker(
+            capacity=environment.REVOCATION_BLOOM_CAPACITY,
+            error_rate=environment.REVOCATION_BLOOM_ERROR_RATE,
+            sync_interval=environment.REVOCATION_SYNC_INTERVAL,
+            purge_interval=environment.BLACKLIST_PURGE_INTERVAL,
+            purge_batch_size=environment.BLACKLIST_PURGE_BATCH_SIZE,
+        )
+    return _revocation_checker
@@ -1,12 +1,21 @@
+import asyncio
+import hashlib
 import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 
 from fastapi import HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.config import Environment
+from app.utils.env_vars import validate_variables
+from app.utils.ttl_cache import TTLCache
+
 SECRET_KEY = os.getenv("SECRET_KEY")
 
 if SECRET_KEY is None:
@@ -15,17 +24,83 @@ if SECRET_KEY is None:
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+class PasswordHasher:
+    """Executa o bcrypt fora do event loop, em um pool de threads limitado.
+
+    Cada hash leva centenas de milissegundos de CPU; o bcrypt libera o GIL,
+    então as threads rodam em paralelo enquanto o loop continua atendendo as
+    demais requisições. ``max_workers`` limita quantos hashes rodam ao mesmo
+    tempo, as chamadas excedentes aguardam na fila do pool.
+    """
+
+    def __init__(self, rounds: int, max_workers: int):
+        self.context = CryptContext(
+            schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="bcrypt"
+        )
+
+    async def _run(self, function, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, function, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        # Devolve um novo hash quando o custo configurado mudou
+        return await self._run(
+            self.context.verify_and_update, password, hashed_password
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_password_hasher: Optional[PasswordHasher] = None
+
+
+def get_password_hasher() -> PasswordHasher:
+    global _password_hasher
+    if _password_hasher is None:
+        environment = validate_variables(Environment)
+        _password_hasher = PasswordHasher(
+            rounds=environment.BCRYPT_ROUNDS,
+            max_workers=environment.PASSWORD_HASH_MAX_WORKERS,
+        )
+    return _password_hasher
+
+
+def close_password_hasher() -> None:
+    global _password_hasher
+    if _password_hasher is not None:
+        _password_hasher.close()
+        _password_hasher = None
 
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def verify_password(plain_password, hashed_password):
+    valid, _ = await get_password_hasher().verify_and_update(
+        plain_password, hashed_password
+    )
+    return valid
+
+
+async def verify_and_update_password(
+    plain_password, hashed_password
+) -> Tuple[bool, Optional[str]]:
+    return await get_password_hasher().verify_and_update(
+        plain_password, hashed_password
+    )
+
+
+async def get_password_hash(password):
+    return await get_password_hasher().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -36,15 +111,53 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.now(timezone.utc) + timedelta(
             minutes=ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "jti": uuid.uuid4().hex})
 
     encoded_jwt = jwt.encode(to_encode, str(SECRET_KEY), algorithm=ALGORITHM)
     return encoded_jwt
 
 
+_token_cache: Optional[TTLCache[dict]] = None
+
+
+def get_token_cache() -> TTLCache[dict]:
+    global _token_cache
+    if _token_cache is None:
+        environment = validate_variables(Environment)
+        _token_cache = TTLCache(
+            max_entries=environment.TOKEN_CACHE_MAX_ENTRIES, name="jwt"
+        )
+    return _token_cache
+
+
+def _token_digest(token: str) -> bytes:
+    # O token inteiro não fica na memória como chave, só o seu hash
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def invalidate_access_token(token: str) -> None:
+    get_token_cache().delete(_token_digest(token))
+
+
 def decode_access_token(token: str):
+    """Valida o token e devolve o payload.
+
+    Tokens já verificados ficam em um cache LRU até o seu ``exp``, então
+    requisições repetidas com o mesmo token não refazem o HMAC nem o parse
+    do JSON. O payload devolvido é compartilhado e não deve ser alterado.
+    """
+    cache = get_token_cache()
+    key = _token_digest(token)
+    payload = cache.get(key)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(token, str(SECRET_KEY), algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token or expired token")
+
+    ttl = float(payload.get("exp", 0)) - time.time()
+    if ttl > 0:
+        cache.set(key, payload, ttl)
+    return payload
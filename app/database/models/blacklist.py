@@ -1,5 +1,3 @@
-from datetime import datetime, timezone
-
 from sqlalchemy import Column, DateTime, String
 
 from app.database.base import Base
@@ -8,5 +6,6 @@ from app.database.base import Base
 class TokenBlacklist(Base):
     __tablename__ = "token_blacklist"
 
-    id = Column(String, primary_key=True, index=True)
-    created_at = Column(DateTime, default=datetime.now(timezone.utc))
+    # ``jti`` do token revogado; a linha só precisa existir até o token expirar
+    jti = Column(String(32), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database.base import Base
@@ -8,6 +8,13 @@ from app.database.base import Base
 
 class CurrentWeather(Base):
     __tablename__ = "current_weather"
+    __table_args__ = (
+        Index(
+            "ix_current_weather_user_id_observation_datetime",
+            "user_id",
+            "observation_datetime",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     city = Column(String, index=True, nullable=False)
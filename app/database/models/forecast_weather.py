@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database.base import Base
@@ -6,6 +6,10 @@ from app.database.base import Base
 
 class ForecastWeather(Base):
     __tablename__ = "forecast_weather"
+    __table_args__ = (
+        Index("ix_forecast_weather_user_id_date", "user_id", "date"),
+        Index("ix_forecast_weather_city_date", "city", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     city = Column(String, index=True, nullable=False)
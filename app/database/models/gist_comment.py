@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database.base import Base
@@ -8,13 +8,18 @@ from app.database.base import Base
 
 class GistComment(Base):
     __tablename__ = "gist_comments"
+    __table_args__ = (
+        Index("ix_gist_comments_comment_id", "comment_id", unique=True),
+        Index("ix_gist_comments_user_id_comment_date", "user_id", "comment_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    comment_id = Column(Integer, nullable=False)
+    # Nulo enquanto o comentário aguarda publicação no outbox
+    comment_id = Column(Integer, nullable=True)
     city = Column(String, nullable=False)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
-    comment_date = Column(DateTime, default=datetime.now(), nullable=False)
+    comment_date = Column(DateTime, default=datetime.now, nullable=False)
     current_temperature = Column(Float, nullable=False)
     weather_description = Column(String, nullable=False)
     forecast_day_1_date = Column(String, nullable=False)
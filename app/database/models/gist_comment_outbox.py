@@ -0,0 +1,54 @@
+import enum
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import relationship
+
+from app.database.base import Base
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def utc_from_timestamp(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+class OutboxStatus(str, enum.Enum):
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class GistCommentOutbox(Base):
+    """Comentário a publicar no Gist, gravado junto com o relatório.
+
+    ``available_at`` indica quando a linha pode ser (re)tentada: é adiada a
+    cada falha e, enquanto um worker publica o comentário, funciona como o
+    prazo da sua reserva.
+    """
+
+    __tablename__ = "gist_comment_outbox"
+    __table_args__ = (
+        Index("ix_gist_comment_outbox_status_available_at", "status", "available_at"),
+    )
+
+    id = Column(String(32), primary_key=True)
+    gist_comment_id = Column(
+        Integer, ForeignKey("gist_comments.id", ondelete="CASCADE"), nullable=False
+    )
+    body = Column(Text, nullable=False)
+    status = Column(
+        Enum(OutboxStatus, native_enum=False, length=16),
+        default=OutboxStatus.PENDING,
+        nullable=False,
+    )
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(String, nullable=True)
+    available_at = Column(DateTime, default=utcnow, nullable=False)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow, nullable=False)
+
+    gist_comment = relationship("GistComment")
@@ -1,8 +1,10 @@
 import os
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.utils.timing import instrument_engine
 
 load_dotenv()
 
@@ -11,5 +13,21 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL is None:
     raise ValueError("A variável de ambiente DATABASE_URL não está definida.")
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Troca o driver síncrono da URL pelo driver assíncrono equivalente.
+
+    O .env e o Alembic continuam usando URLs síncronas (psycopg2/sqlite3).
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend in ASYNC_DRIVERS and url.drivername != ASYNC_DRIVERS[backend]:
+        url = url.set(drivername=ASYNC_DRIVERS[backend])
+    return url.render_as_string(hide_password=False)
+
+
+engine = create_async_engine(get_async_database_url(DATABASE_URL))
+instrument_engine(engine.sync_engine)
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
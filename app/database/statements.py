@@ -0,0 +1,70 @@
+from typing import Any, Collection, Dict, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ModelT = TypeVar("ModelT")
+
+
+def changed_values(
+    model: Type[Any], data: BaseModel, non_null: Collection[str] = ()
+) -> Dict[str, Any]:
+    """Campos enviados na requisição que correspondem a colunas do modelo.
+
+    Apenas os campos definidos explicitamente (``exclude_unset``) entram no
+    UPDATE, então ``0`` e ``False`` passam a ser gravados. ``None`` só é aceito
+    em colunas que permitem nulo e que não estejam em ``non_null`` (campos que
+    o schema de resposta exige); a chave primária nunca é alterada.
+    """
+    columns = model.__table__.columns
+    return {
+        key: value
+        for key, value in data.model_dump(exclude_unset=True).items()
+        if key in columns
+        and not columns[key].primary_key
+        and (value is not None or (columns[key].nullable and key not in non_null))
+    }
+
+
+async def update_returning(
+    db: AsyncSession,
+    model: Type[ModelT],
+    where: ColumnElement[bool],
+    values: Dict[str, Any],
+) -> Optional[ModelT]:
+    """Executa um único ``UPDATE ... RETURNING`` e devolve a linha atualizada.
+
+    Em bancos sem suporte a RETURNING no UPDATE (SQLite anterior à 3.35) a
+    linha é relida com um SELECT depois do UPDATE.
+    """
+    if not values:
+        return await db.scalar(select(model).where(where))
+
+    statement = update(model).where(where).values(**values)
+    if db.get_bind().dialect.update_returning:
+        instance = await db.scalar(
+            statement.returning(model),
+            execution_options={"populate_existing": True},
+        )
+    else:
+        result = await db.execute(statement)
+        instance = (
+            await db.scalar(select(model).where(where)) if result.rowcount else None
+        )
+    await db.commit()
+    return instance
+
+
+async def delete_returning(
+    db: AsyncSession, model: Type[ModelT], where: ColumnElement[bool]
+) -> Optional[ModelT]:
+    """Executa um único ``DELETE ... RETURNING`` e devolve a linha removida."""
+    if db.get_bind().dialect.delete_returning:
+        instance = await db.scalar(delete(model).where(where).returning(model))
+    else:
+        instance = await db.scalar(select(model).where(where))
+        if instance is not None:
+            await db.execute(delete(model).where(where))
+    await db.commit()
+    return instance
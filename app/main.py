@@ -1,8 +1,54 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from app.api.v1.gist_comments.gist_comment_outbox_worker import get_gist_outbox_worker
 from app.api.v1.router import router as api_router
+from app.clients.http_client import close_shared_client, open_shared_client
+from app.config import Environment
+from app.core.mailer import close_mail_queue, get_mail_queue
+from app.core.revocation import get_revocation_checker
+from app.core.security import close_password_hasher
 from app.database.base import Base
-from app.database.session import engine
+from app.database.session import SessionLocal, engine
+from app.middleware.loop_lag import LoopLagMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.utils.env_vars import validate_variables
+from app.utils.loop_monitor import get_loop_monitor
+from app.utils.metrics import mark_process_dead, metrics_endpoint
+from app.utils.serialization import TimedORJSONResponse
+
+environment = validate_variables(Environment)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Criar tabelas do banco de dados
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    # Abre o pool HTTP compartilhado do worker e o fecha no shutdown
+    await open_shared_client()
+    # Carrega os tokens revogados e mantém o filtro sincronizado com o banco
+    await get_revocation_checker().start(SessionLocal)
+    # Remetente de e-mails em segundo plano, com a conexão SMTP reaproveitada
+    get_mail_queue().start()
+    # Publica no GitHub os comentários aceitos com "Prefer: respond-async"
+    await get_gist_outbox_worker().start(SessionLocal)
+    # Mede o atraso do event loop e registra as chamadas que o bloqueiam
+    if environment.LOOP_LAG_MONITOR_ENABLED:
+        await get_loop_monitor().start()
+    yield
+    await get_loop_monitor().stop()
+    await get_gist_outbox_worker().stop()
+    await asyncio.to_thread(close_mail_queue)
+    await get_revocation_checker().stop()
+    await close_shared_client()
+    close_password_hasher()
+    await engine.dispose()
+    mark_process_dead()
+
 
 app = FastAPI(
     title="Caiena Application",
@@ -11,10 +57,22 @@ app = FastAPI(
                     com a temperatura atual e a previsão do tempo dos próximos 
                     cinco dias (média diária) de uma cidade.""",
     version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=TimedORJSONResponse,
+)
+
+# Tempo gasto por fase em cada requisição (header Server-Timing e log de acesso)
+app.add_middleware(
+    ServerTimingMiddleware,
+    emit_header=environment.SERVER_TIMING_ENABLED,
 )
 
-# Criar tabelas do banco de dados
-Base.metadata.create_all(bind=engine)
+# Rota em execução para os avisos de event loop bloqueado
+app.add_middleware(LoopLagMiddleware)
+
+# Métricas Prometheus por rota, expostas em /metrics
+app.add_middleware(MetricsMiddleware)
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
 
 # Incluir rotas
 app.include_router(api_router, prefix="/api/v1")
@@ -1,6 +1,7 @@
-from fastapi import Depends
+from fastapi import Depends, HTTPException
 from pydantic import BaseModel
 
+from app.core.revocation import get_revocation_checker
 from app.core.security import decode_access_token, oauth2_scheme
 from app.database.session import SessionLocal
 
@@ -11,14 +12,31 @@ class AuthUser(BaseModel):
     token: str
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-def jwt_middleware(token=Depends(oauth2_scheme)):
+def get_session_factory():
+    # Respostas em streaming continuam lendo do banco depois que as
+    # dependências com yield já foram finalizadas, então abrem a própria sessão.
+    return SessionLocal
+
+
+async def jwt_middleware(
+    token=Depends(oauth2_scheme), session_factory=Depends(get_session_factory)
+):
     payload = decode_access_token(token)
+    jti = payload.get("jti")
+    # Tokens sem jti não podem ser revogados e por isso não são aceitos
+    if jti is None:
+        raise HTTPException(status_code=401, detail="Invalid token or expired token")
+    if await get_revocation_checker().is_revoked(jti, session_factory):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
     return AuthUser(id=payload.get("id"), email=payload.get("email"), token=token)
+
+
+def require_owner(authuser: AuthUser, user_id: int) -> None:
+    # Exportações devolvem o histórico inteiro: só o próprio usuário pode pedir
+    if authuser.id != user_id:
+        raise HTTPException(status_code=403, detail="Not allowed to access this user")
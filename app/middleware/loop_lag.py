@@ -0,0 +1,22 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.loop_monitor import get_loop_monitor
+
+
+class LoopLagMiddleware:
+    """Associa a tarefa de cada requisição à sua rota para o monitor do loop."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        monitor = get_loop_monitor()
+        monitor.track(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            monitor.untrack()
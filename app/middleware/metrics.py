@@ -0,0 +1,40 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import REQUEST_DURATION, REQUESTS
+
+# Requisições que não casaram com nenhuma rota compartilham um único rótulo,
+# evitando uma série nova por URL desconhecida.
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """Conta as requisições e mede sua latência por rota (o template do path)."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            REQUESTS.labels(method, route, str(status_code)).inc()
+            REQUEST_DURATION.labels(method, route).observe(
+                time.perf_counter() - started
+            )
@@ -0,0 +1,74 @@
+import logging
+import time
+from typing import Dict, List
+
+import orjson
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.timing import start_request_timings
+
+access_logger = logging.getLogger("app.access")
+
+
+def format_server_timing(timings: Dict[str, List[float]], total: float) -> str:
+    metrics = [
+        f"{phase};dur={seconds * 1000:.1f}"
+        for phase, (seconds, _) in sorted(timings.items())
+    ]
+    metrics.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(metrics)
+
+
+class ServerTimingMiddleware:
+    """Mede o tempo de cada fase da requisição e o expõe no header ``Server-Timing``.
+
+    As fases (``openweather``, ``github``, ``db``, ``render``...) são
+    acumuladas por ``app.utils.timing`` em um ContextVar próprio da
+    requisição. Ao final, uma linha JSON com as mesmas medições é registrada
+    no logger ``app.access``, já incluindo o envio do corpo da resposta.
+    """
+
+    def __init__(self, app: ASGIApp, emit_header: bool = True):
+        self.app = app
+        self.emit_header = emit_header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = start_request_timings()
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.emit_header:
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing",
+                        format_server_timing(timings, time.perf_counter() - started),
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            total = time.perf_counter() - started
+            access_logger.info(
+                orjson.dumps(
+                    {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "duration_ms": round(total * 1000, 2),
+                        "phases": {
+                            phase: {"ms": round(seconds * 1000, 2), "count": count}
+                            for phase, (seconds, count) in timings.items()
+                        },
+                    }
+                ).decode()
+            )
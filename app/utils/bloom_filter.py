@@ -0,0 +1,41 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """Filtro de Bloom em memória para testes de pertinência baratos.
+
+    ``key in filtro`` nunca dá falso negativo; falsos positivos acontecem com
+    probabilidade próxima de ``error_rate`` enquanto o número de itens não
+    passar de ``capacity``. Itens não podem ser removidos: para descartar
+    entradas o filtro deve ser reconstruído.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.size = math.ceil(
+            -self.capacity * math.log(error_rate) / (math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        # Double hashing: k posições a partir de dois hashes de 64 bits
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hash_count):
+            yield (first + index * second) % self.size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
@@ -0,0 +1,65 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import RowMapping
+
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _json_default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def encode_rows(
+    partitions: AsyncIterator[Sequence[RowMapping]],
+    columns: Sequence[str],
+    format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    """Converte cada lote de linhas em um único bloco de NDJSON ou CSV."""
+    if format == ExportFormat.CSV:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue().encode()
+
+        async for rows in partitions:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([row[column] for column in columns] for row in rows)
+            yield buffer.getvalue().encode()
+        return
+
+    async for rows in partitions:
+        yield "".join(
+            json.dumps(dict(row), default=_json_default) + "\n" for row in rows
+        ).encode()
+
+
+def export_response(
+    content: AsyncIterator[bytes], format: ExportFormat, filename: str
+) -> StreamingResponse:
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{format.value}"'
+        },
+    )
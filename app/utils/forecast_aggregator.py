@@ -0,0 +1,105 @@
+import math
+from dataclasses import dataclass, field
+from datetime import date, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from app.clients.open_weather.open_weather_schemas import (
+    WeatherDataSchema,
+    WeatherForecastResponseSchema,
+)
+
+
+@dataclass
+class DailyTemperature:
+    date: date
+    mean: float
+    min: float
+    max: float
+    count: int
+    percentiles: Dict[float, float] = field(default_factory=dict)
+
+
+@dataclass
+class _Accumulator:
+    total: float = 0.0
+    count: int = 0
+    min: float = math.inf
+    max: float = -math.inf
+    values: Optional[List[float]] = None
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    # Interpolação linear entre os vizinhos mais próximos (mesmo critério do
+    # numpy.percentile padrão).
+    position = (len(sorted_values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    weight = position - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def aggregate_daily_temperatures(
+    entries: Iterable[WeatherDataSchema],
+    utc_offset_seconds: int = 0,
+    days: Optional[int] = None,
+    percentiles: Sequence[float] = (),
+) -> List[DailyTemperature]:
+    """Agrega as previsões de 3 em 3 horas em resumos diários em uma só passada.
+
+    As datas são calculadas no fuso da cidade (``utc_offset_seconds``). Como o
+    OpenWeather devolve as entradas em ordem cronológica, a iteração para
+    assim que um dia além de ``days`` aparece.
+    """
+    tz = timezone(timedelta(seconds=utc_offset_seconds))
+    daily: Dict[date, _Accumulator] = {}
+
+    for entry in entries:
+        moment = entry.dt
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        local_date = moment.astimezone(tz).date()
+
+        accumulator = daily.get(local_date)
+        if accumulator is None:
+            if days is not None and len(daily) == days:
+                break
+            accumulator = _Accumulator(values=[] if percentiles else None)
+            daily[local_date] = accumulator
+
+        temperature = entry.main.temp
+        accumulator.total += temperature
+        accumulator.count += 1
+        accumulator.min = min(accumulator.min, entry.main.temp_min)
+        accumulator.max = max(accumulator.max, entry.main.temp_max)
+        if accumulator.values is not None:
+            accumulator.values.append(temperature)
+
+    summaries = []
+    for local_date, accumulator in daily.items():
+        values = sorted(accumulator.values) if accumulator.values else []
+        summaries.append(
+            DailyTemperature(
+                date=local_date,
+                mean=accumulator.total / accumulator.count,
+                min=accumulator.min,
+                max=accumulator.max,
+                count=accumulator.count,
+                percentiles={q: _percentile(values, q) for q in percentiles},
+            )
+        )
+    return summaries
+
+
+def aggregate_forecast(
+    forecast: WeatherForecastResponseSchema,
+    days: Optional[int] = 5,
+    percentiles: Sequence[float] = (),
+) -> List[DailyTemperature]:
+    return aggregate_daily_temperatures(
+        forecast.list,
+        utc_offset_seconds=forecast.city.timezone,
+        days=days,
+        percentiles=percentiles,
+    )
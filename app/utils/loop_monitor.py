@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Dict, Optional
+
+from starlette.types import Scope
+
+from app.config import Environment
+from app.utils.env_vars import validate_variables
+from app.utils.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Mede o atraso do event loop e aponta quem o bloqueou.
+
+    Uma tarefa acorda a cada ``interval`` segundos e registra no histograma
+    ``event_loop_lag_seconds`` quanto atrasou em relação ao previsto. Uma
+    thread vigia o último batimento dessa tarefa: se o loop ficar mais de
+    ``threshold`` segundos sem rodar, a thread captura a pilha da thread do
+    loop (a chamada bloqueante ainda está nela) e registra a rota da
+    requisição que estava executando.
+    """
+
+    def __init__(self, interval: float, threshold: float):
+        self.interval = interval
+        self.threshold = threshold
+        self._requests: Dict[asyncio.Task, Scope] = {}
+        self._heartbeat = time.monotonic()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def track(self, scope: Scope) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._requests[task] = scope
+
+    def untrack(self) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._requests.pop(task, None)
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._measure_forever())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            # O join roda fora do loop; a thread é daemon, então se ela ainda
+            # estiver registrando um bloqueio o shutdown não espera por ela
+            await asyncio.to_thread(self._watchdog.join, self.threshold)
+            self._watchdog = None
+
+    async def _measure_forever(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            EVENT_LOOP_LAG.observe(max(0.0, now - expected))
+
+    def _watch(self) -> None:
+        reported = False
+        while not self._stopped.wait(self.threshold / 2):
+            stalled = time.monotonic() - self._heartbeat - self.interval
+            if stalled < self.threshold:
+                reported = False
+                continue
+            if not reported:
+                # Um aviso por bloqueio, com a pilha capturada durante ele
+                reported = True
+                self._report(stalled)
+
+    def _current_route(self) -> str:
+        task = asyncio.current_task(self._loop) if self._loop else None
+        scope = self._requests.get(task) if task is not None else None
+        if scope is None:
+            return "fora de uma requisição"
+        route = getattr(scope.get("route"), "path", scope["path"])
+        return f"{scope['method']} {route}"
+
+    def _report(self, stalled: float) -> None:
+        EVENT_LOOP_BLOCKED.inc()
+        frame = sys._current_frames().get(self._loop_thread_id or 0)
+        stack = "".join(traceback.format_stack(frame)) if frame else ""
+        logger.warning(
+            "Event loop bloqueado há %.0f ms em %s\n%s",
+            stalled * 1000,
+            self._current_route(),
+            stack,
+        )
+
+
+_loop_monitor: Optional[LoopLagMonitor] = None
+
+
+def get_loop_monitor() -> LoopLagMonitor:
+    global _loop_monitor
+    if _loop_monitor is None:
+        environment = validate_variables(Environment)
+        _loop_monitor = LoopLagMonitor(
+            interval=environment.LOOP_LAG_INTERVAL,
+            threshold=environment.LOOP_LAG_THRESHOLD,
+        )
+    return _loop_monitor
@@ -0,0 +1,166 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fastapi import Request, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# Com PROMETHEUS_MULTIPROC_DIR definido (antes de iniciar os workers) cada
+# processo grava suas métricas em arquivos mmap nesse diretório, e o /metrics
+# de qualquer worker agrega todos eles.
+MULTIPROCESS_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "Requisições atendidas por rota e status",
+    ["method", "route", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições por rota",
+    ["method", "route"],
+)
+OUTBOUND_DURATION = Histogram(
+    "outbound_request_duration_seconds",
+    "Latência das chamadas a APIs externas por serviço e status",
+    ["service", "method", "status"],
+)
+OUTBOUND_IN_FLIGHT = Gauge(
+    "outbound_requests_in_flight",
+    "Chamadas a APIs externas em andamento (uso do pool HTTP)",
+    ["service"],
+    multiprocess_mode="livesum",
+)
+HTTP_CLIENT_RETRIES = Counter(
+    "http_client_retries_total",
+    "Retentativas de chamadas a APIs externas por host",
+    ["host"],
+)
+CIRCUIT_BREAKER_STATE = Gauge(
+    "circuit_breaker_state",
+    "Estado do circuit breaker por host (0 fechado, 1 meio-aberto, 2 aberto)",
+    ["host"],
+    multiprocess_mode="livemax",
+)
+CIRCUIT_BREAKER_OPENED = Counter(
+    "circuit_breaker_opened_total",
+    "Vezes em que o circuit breaker de um host abriu",
+    ["host"],
+)
+CIRCUIT_BREAKER_REJECTED = Counter(
+    "circuit_breaker_rejected_total",
+    "Chamadas recusadas sem acessar o host por circuito aberto",
+    ["host"],
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duração dos comandos SQL por tipo de comando",
+    ["operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Conexões do pool do banco emprestadas no momento",
+    multiprocess_mode="livesum",
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Consultas aos caches em memória por resultado",
+    ["cache", "result"],
+)
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Entradas descartadas pelo limite de tamanho dos caches",
+    ["cache"],
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Atraso do event loop em relação ao agendado",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "event_loop_blocked_total",
+    "Bloqueios do event loop acima do limite configurado",
+)
+GITHUB_WRITE_QUEUE_DEPTH = Gauge(
+    "github_write_queue_depth",
+    "Escritas no GitHub aguardando saldo do limite de requisições",
+    multiprocess_mode="livesum",
+)
+GITHUB_WRITE_QUEUE_WAIT = Histogram(
+    "github_write_queue_wait_seconds",
+    "Tempo de espera das escritas no GitHub na fila do limitador",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+GITHUB_RATE_LIMITED = Counter(
+    "github_rate_limited_total",
+    "Respostas do GitHub recusadas por limite de requisições",
+)
+GITHUB_RATE_LIMIT_REMAINING = Gauge(
+    "github_rate_limit_remaining",
+    "Saldo do limite primário informado pelo GitHub (X-RateLimit-Remaining)",
+    multiprocess_mode="livemin",
+)
+
+
+class _Outbound:
+    status: str = "error"
+
+
+@contextmanager
+def observe_outbound(service: str, method: str) -> Iterator[_Outbound]:
+    """Mede uma chamada externa; quem chama preenche ``status`` com a resposta."""
+    outbound = _Outbound()
+    in_flight = OUTBOUND_IN_FLIGHT.labels(service)
+    in_flight.inc()
+    started = time.perf_counter()
+    try:
+        yield outbound
+    finally:
+        in_flight.dec()
+        OUTBOUND_DURATION.labels(service, method.upper(), outbound.status).observe(
+            time.perf_counter() - started
+        )
+
+
+def observe_query(statement: str, seconds: float) -> None:
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement else ""
+    DB_QUERY_DURATION.labels(operation).observe(seconds)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_cache_eviction(cache: str) -> None:
+    CACHE_EVICTIONS.labels(cache).inc()
+
+
+def get_metrics_registry() -> CollectorRegistry:
+    if os.environ.get(MULTIPROCESS_DIR_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    # Remove os gauges "live" do processo que está encerrando
+    if os.environ.get(MULTIPROCESS_DIR_ENV):
+        multiprocess.mark_process_dead(pid if pid is not None else os.getpid())
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    return Response(
+        generate_latest(get_metrics_registry()), media_type=CONTENT_TYPE_LATEST
+    )
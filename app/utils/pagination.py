@@ -0,0 +1,121 @@
+import base64
+import binascii
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+
+
+class HistoryFilters(BaseModel):
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    city: Optional[str] = None
+
+
+class PageParams(HistoryFilters):
+    limit: int = DEFAULT_PAGE_LIMIT
+    after: Optional[Tuple[datetime, int]] = None
+
+
+def encode_cursor(timestamp: datetime, id: int) -> str:
+    raw = f"{timestamp.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(cursor + padding).decode()
+        timestamp, id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # As colunas DateTime são gravadas sem fuso horário
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def get_history_filters(
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    city: Optional[str] = Query(None),
+) -> HistoryFilters:
+    return HistoryFilters(start=_as_naive_utc(start), end=_as_naive_utc(end), city=city)
+
+
+def get_page_params(
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT),
+    after: Optional[str] = Query(None, description="Cursor da página anterior"),
+    filters: HistoryFilters = Depends(get_history_filters),
+) -> PageParams:
+    return PageParams(
+        **filters.model_dump(),
+        limit=limit,
+        after=decode_cursor(after) if after else None,
+    )
+
+
+def apply_history_filters(
+    query: Select,
+    timestamp_column: Any,
+    city_column: Any,
+    filters: HistoryFilters,
+) -> Select:
+    if filters.city is not None:
+        query = query.filter(city_column == filters.city)
+    if filters.start is not None:
+        query = query.filter(timestamp_column >= filters.start)
+    if filters.end is not None:
+        query = query.filter(timestamp_column < filters.end)
+    return query
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    timestamp_column: Any,
+    id_column: Any,
+    city_column: Any,
+    page: PageParams,
+) -> Tuple[List[Any], Optional[str]]:
+    """Executa ``query`` com paginação por chave (keyset) em ``(timestamp, id)``.
+
+    Os registros vêm do mais recente para o mais antigo. Em vez de ``OFFSET``
+    a próxima página começa logo depois do último ``(timestamp, id)`` retornado,
+    então o custo de cada página não cresce com o histórico do usuário.
+    """
+    query = apply_history_filters(query, timestamp_column, city_column, page)
+    if page.after is not None:
+        after_timestamp, after_id = page.after
+        query = query.filter(
+            or_(
+                timestamp_column < after_timestamp,
+                and_(timestamp_column == after_timestamp, id_column < after_id),
+            )
+        )
+
+    # Um registro a mais indica se existe próxima página
+    query = query.order_by(timestamp_column.desc(), id_column.desc()).limit(
+        page.limit + 1
+    )
+    result = await db.scalars(query)
+    items = list(result.all())
+
+    next_cursor = None
+    if len(items) > page.limit:
+        items = items[: page.limit]
+        last = items[-1]
+        next_cursor = encode_cursor(
+            getattr(last, timestamp_column.key), getattr(last, id_column.key)
+        )
+    return items, next_cursor
@@ -0,0 +1,34 @@
+from functools import lru_cache
+from typing import Any, Iterable, List, Type, TypeVar
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from app.utils.timing import timed
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _adapter(annotation: Any) -> TypeAdapter:
+    # Montar um TypeAdapter compila o validador; o cache faz isso uma vez só
+    return TypeAdapter(annotation)
+
+
+def to_response(model: Type[ModelT], row: Any) -> ModelT:
+    """Valida uma linha do ORM diretamente no schema de resposta."""
+    with timed("serialize"):
+        return _adapter(model).validate_python(row, from_attributes=True)
+
+
+def to_responses(model: Type[ModelT], rows: Iterable[Any]) -> List[ModelT]:
+    with timed("serialize"):
+        return _adapter(List[model]).validate_python(rows, from_attributes=True)  # type: ignore[valid-type]
+
+
+class TimedORJSONResponse(ORJSONResponse):
+    """ORJSONResponse que contabiliza a renderização na fase ``render``."""
+
+    def render(self, content: Any) -> bytes:
+        with timed("render"):
+            return super().render(content)
@@ -0,0 +1,55 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesce chamadas concorrentes idênticas em uma única execução.
+
+    Enquanto uma chamada para ``key`` está em andamento, novas chamadas com a
+    mesma chave aguardam o mesmo resultado (ou a mesma exceção) em vez de
+    disparar outra execução. O cancelamento de um chamador não afeta os
+    demais; a execução só é cancelada quando não resta nenhum chamador
+    aguardando.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self.executions = 0
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self._waiters[key] = 0
+            self.executions += 1
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.shared += 1
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and self._waiters.get(key) == 1:
+                task.cancel()
+            raise
+        finally:
+            if self._calls.get(key) is task:
+                self._waiters[key] -= 1
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+            self._waiters.pop(key, None)
+        if not task.cancelled():
+            # Evita o aviso "exception was never retrieved" quando todos os
+            # chamadores já desistiram antes do término.
+            task.exception()
@@ -0,0 +1,70 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.metrics import DB_POOL_IN_USE, observe_query
+
+# Fases da requisição atual: nome -> [segundos acumulados, chamadas]. As
+# tarefas criadas durante a requisição herdam o mesmo dicionário.
+_request_timings: ContextVar[Optional[Dict[str, List[float]]]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timings() -> Dict[str, List[float]]:
+    timings: Dict[str, List[float]] = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def record_timing(phase: str, seconds: float) -> None:
+    timings = _request_timings.get()
+    if timings is None:
+        return
+    entry = timings.setdefault(phase, [0.0, 0])
+    entry[0] += seconds
+    entry[1] += 1
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Soma o tempo do bloco à fase ``phase`` da requisição em andamento."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(phase, time.perf_counter() - started)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    record_timing("db", elapsed)
+    observe_query(statement, elapsed)
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_IN_USE.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record):
+    DB_POOL_IN_USE.dec()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Registra cada comando SQL na fase ``db`` e nas métricas do banco.
+
+    Os empréstimos e devoluções de conexões alimentam o gauge de ocupação do
+    pool.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.pool, "checkout", _on_checkout)
+    event.listen(engine.pool, "checkin", _on_checkin)
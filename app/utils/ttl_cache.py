@@ -0,0 +1,96 @@
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, NamedTuple, Optional, TypeVar
+
+from app.utils.metrics import record_cache_eviction, record_cache_lookup
+
+V = TypeVar("V")
+
+
+class _Entry(NamedTuple):
+    value: Any
+    expires_at: float
+    size: int
+
+
+class TTLCache(Generic[V]):
+    """Cache LRU em memória com expiração por entrada.
+
+    A capacidade é limitada tanto pelo número de entradas quanto pela soma dos
+    tamanhos informados em ``set``; ao ultrapassar qualquer um dos limites as
+    entradas menos usadas recentemente são descartadas. Com ``name`` os
+    acertos, falhas e descartes também vão para as métricas Prometheus.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: Optional[int] = None,
+        name: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.name = name
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: Hashable) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            entry = None
+        if self.name is not None:
+            record_cache_lookup(self.name, entry is not None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: Hashable, value: V, ttl: float, size: int = 0) -> None:
+        if key in self._entries:
+            self._remove(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._entries[key] = _Entry(value, time.monotonic() + ttl, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+            if self.name is not None:
+                record_cache_eviction(self.name)
+
+    def delete(self, key: Hashable) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
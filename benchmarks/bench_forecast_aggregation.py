@@ -0,0 +1,60 @@
+"""Compara o agregador diário com o caminho antigo baseado em pandas.
+
+Uso: ``python -m benchmarks.bench_forecast_aggregation [iterações]``
+
+O pandas não é mais dependência da aplicação; se não estiver instalado, só o
+agregador é medido.
+"""
+
+import sys
+import time
+
+from app.clients.open_weather.open_weather_schemas import WeatherForecastResponseSchema
+from app.utils.forecast_aggregator import aggregate_forecast
+from benchmarks.fake_servers import forecast_payload
+
+
+def bench(label, fn, iterations):
+    fn()
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<12} {elapsed / iterations * 1e6:10.1f} µs/chamada")
+
+
+def main(iterations: int = 2000):
+    # A mesma resposta de 5 dias (40 entradas) que o OpenWeather falso devolve
+    forecast = WeatherForecastResponseSchema.model_validate(
+        forecast_payload("São Paulo", -23.5505, -46.6333)
+    )
+    rows = [
+        {"date": entry.dt, "average_temperature": entry.main.temp}
+        for entry in forecast.list
+    ]
+
+    started = time.perf_counter()
+    try:
+        import pandas as pd
+    except ImportError:
+        pd = None
+    import_time = time.perf_counter() - started
+
+    bench("aggregator", lambda: aggregate_forecast(forecast, days=5), iterations)
+
+    if pd is None:
+        print("pandas não instalado; comparação ignorada")
+        return
+
+    def pandas_path():
+        df = pd.DataFrame(rows)
+        df["date_only"] = df["date"].dt.date
+        daily = df.groupby("date_only")["average_temperature"].mean().reset_index()
+        return daily.head(5)
+
+    bench("pandas", pandas_path, iterations)
+    print(f"import pandas: {import_time * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,363 @@
+"""Benchmark de carga de ponta a ponta, sem acesso à rede.
+
+Uso: ``python -m benchmarks.bench_load [--concurrency 16] [--requests 500]``
+
+Sobe os servidores falsos de ``benchmarks.fake_servers`` e a aplicação
+(uvicorn) em processos separados, apontando ``OPEN_WEATHER_URL`` e
+``GITHUB_API_URL`` para eles, e dispara cada família de endpoints com
+concorrência fixa. Para cada cenário mede req/s, latências p50/p95/p99 e
+quantos comandos SQL cada requisição executou (lidos do ``/metrics``). O
+resultado é gravado em JSON; ``--compare`` mostra a variação em relação a um
+resultado anterior.
+
+O SQLite padrão serializa as escritas e devolve "database is locked" sob
+concorrência alta; para números de capacidade use ``--database-url`` com o
+PostgreSQL.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+
+CITIES = ["Liberdade", "Curitiba", "Recife", "Manaus", "Natal", "Belém", "Goiânia"]
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+
+
+class Session:
+    """Usuário criado para o benchmark e o token usado nas requisições."""
+
+    def __init__(self, email: str, password: str, token: str, user_id: int):
+        self.email = email
+        self.password = password
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.user_id = user_id
+
+
+def build_scenarios(session: Session) -> Dict[str, Request]:
+    def city(index: int) -> str:
+        return CITIES[index % len(CITIES)]
+
+    return {
+        "auth": lambda client, index: client.post(
+            "/api/v1/auth/login",
+            data={"username": session.email, "password": session.password},
+        ),
+        "users": lambda client, index: client.get(
+            "/api/v1/users/me", headers=session.headers
+        ),
+        "current-weather": lambda client, index: client.post(
+            f"/api/v1/current-weather/{city(index)}", headers=session.headers
+        ),
+        "current-weather-list": lambda client, index: client.get(
+            f"/api/v1/current-weather/user/{session.user_id}", params={"limit": 50}
+        ),
+        "forecast": lambda client, index: client.post(
+            f"/api/v1/forecast-weather/{city(index)}", headers=session.headers
+        ),
+        "gist-comments": lambda client, index: client.post(
+            f"/api/v1/gist-comments/{city(index)}", headers=session.headers
+        ),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    # Nearest-rank: o menor valor que cobre a fração pedida das amostras
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(fraction * len(sorted_values) + 0.5 - 1e-9)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(
+    latencies: List[float], errors: int, elapsed: float, db_queries: float
+) -> dict:
+    ordered = sorted(latencies)
+    total = len(ordered)
+    return {
+        "requests": total,
+        "errors": errors,
+        "requests_per_second": round(total / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(ordered, 0.50) * 1000, 2),
+            "p95": round(percentile(ordered, 0.95) * 1000, 2),
+            "p99": round(percentile(ordered, 0.99) * 1000, 2),
+            "max": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+        },
+        "db_queries_per_request": round(db_queries / total, 2) if total else 0.0,
+    }
+
+
+async def db_query_count(client: httpx.AsyncClient) -> float:
+    response = await client.get("/metrics")
+    return sum(
+        float(line.rsplit(" ", 1)[1])
+        for line in response.text.splitlines()
+        if line.startswith("db_query_duration_seconds_count")
+    )
+
+
+async def drive(
+    client: httpx.AsyncClient, request: Request, total: int, concurrency: int
+):
+    """Executa ``total`` requisições mantendo ``concurrency`` em andamento."""
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while (index := next(counter)) < total:
+            started = time.perf_counter()
+            try:
+                response = await request(client, index)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, request: Request, args: argparse.Namespace
+) -> dict:
+    await drive(client, request, args.warmup, args.concurrency)
+    queries_before = await db_query_count(client)
+    latencies, errors, elapsed = await drive(
+        client, request, args.requests, args.concurrency
+    )
+    queries = await db_query_count(client) - queries_before
+    return summarize(latencies, errors, elapsed, queries)
+
+
+async def create_session(client: httpx.AsyncClient) -> Session:
+    email, password = "bench@dev.com", "bench-password"
+    await client.post(
+        "/api/v1/auth/signup",
+        json={"username": "bench", "password": password, "email": email, "name": "b"},
+    )
+    login = await client.post(
+        "/api/v1/auth/login", data={"username": email, "password": password}
+    )
+    login.raise_for_status()
+    token = login.json()["access_token"]
+    me = await client.get(
+        "/api/v1/users/me", headers={"Authorization": f"Bearer {token}"}
+    )
+    me.raise_for_status()
+    return Session(email, password, token, me.json()["id"])
+
+
+async def wait_until_ready(base_url: str, process: subprocess.Popen) -> None:
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        for _ in range(200):
+            if process.poll() is not None:
+                raise RuntimeError(f"processo encerrou com código {process.returncode}")
+            try:
+                await client.get("/metrics")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.05)
+    raise RuntimeError(f"{base_url} não respondeu a tempo")
+
+
+def app_environment(
+    args: argparse.Namespace, workdir: str, openweather_port: int, github_port: int
+) -> Dict[str, str]:
+    database_url = args.database_url or f"sqlite:///{workdir}/bench.db"
+    environment = {
+        # Valores exigidos pela aplicação; nenhum deles alcança serviços reais
+        "SECRET_KEY": "bench-secret",
+        "SECRET_KEY_OPEN_WEATHER": "bench",
+        "SECRET_KEY_GITHUB": "bench",
+        "GIST_ID": "bench",
+        "SMTP_SERVER": "127.0.0.1",
+        "SMTP_PORT": "2525",
+        "SMTP_USERNAME": "bench@dev.com",
+        "SMTP_PASSWORD": "bench",
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "TEST_DATABASE_URL": database_url,
+        "OPEN_WEATHER_URL": f"http://127.0.0.1:{openweather_port}/data/2.5/",
+        "GITHUB_API_URL": f"http://127.0.0.1:{github_port}/",
+        "PROMETHEUS_MULTIPROC_DIR": os.path.join(workdir, "metrics"),
+    }
+    os.makedirs(environment["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+    if not args.openweather_cache:
+        # Sem cache cada requisição passa pelo OpenWeather falso
+        environment["OPEN_WEATHER_CACHE_CURRENT_TTL"] = "0"
+        environment["OPEN_WEATHER_CACHE_FORECAST_TTL"] = "0"
+    if args.bcrypt_rounds is not None:
+        environment["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    # Sem --github-write-rate o limitador não segura as escritas e o cenário
+    # gist-comments mede só a aplicação
+    environment["GITHUB_WRITE_RATE_PER_MINUTE"] = str(args.github_write_rate or 1e9)
+    return environment
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict) -> None:
+    print(f"\nComparação com {baseline.get('commit') or 'baseline'}:")
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        rps = current["requests_per_second"] / previous["requests_per_second"] - 1
+        p95 = current["latency_ms"]["p95"] / previous["latency_ms"]["p95"] - 1
+        print(f"  {name:22s} req/s {rps:+7.1%}   p95 {p95:+7.1%}")
+
+
+def print_table(results: dict) -> None:
+    print(
+        f"{'cenário':22s} {'req/s':>9s} {'p50':>8s} {'p95':>8s} {'p99':>8s}"
+        f" {'erros':>6s} {'sql/req':>8s}"
+    )
+    for name, summary in results["scenarios"].items():
+        latency = summary["latency_ms"]
+        print(
+            f"{name:22s} {summary['requests_per_second']:9.1f}"
+            f" {latency['p50']:8.1f} {latency['p95']:8.1f} {latency['p99']:8.1f}"
+            f" {summary['errors']:6d} {summary['db_queries_per_request']:8.2f}"
+        )
+
+
+async def benchmark(args: argparse.Namespace, base_url: str) -> dict:
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        timeout=30,
+        limits=httpx.Limits(max_connections=args.concurrency + 2),
+    ) as client:
+        scenarios = build_scenarios(await create_session(client))
+        results = {}
+        for name in args.scenarios:
+            results[name] = await run_scenario(client, scenarios[name], args)
+            print(f"{name}: {results[name]['requests_per_second']} req/s")
+        return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        default=[
+            "auth",
+            "users",
+            "current-weather",
+            "current-weather-list",
+            "forecast",
+            "gist-comments",
+        ],
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--database-url", help="padrão: SQLite temporário")
+    parser.add_argument("--openweather-cache", action="store_true")
+    parser.add_argument("--bcrypt-rounds", type=int)
+    parser.add_argument(
+        "--github-write-rate", type=float, help="escritas/min no GitHub; padrão: livre"
+    )
+    parser.add_argument(
+        "--github-rate-limit",
+        type=int,
+        default=0,
+        help="escritas/min aceitas pelo GitHub falso",
+    )
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path)
+    args = parser.parse_args(argv)
+
+    openweather_port, github_port, app_port = free_port(), free_port(), free_port()
+    with tempfile.TemporaryDirectory(prefix="bench-load-") as workdir:
+        # fmt: off
+        fakes = subprocess.Popen([
+            sys.executable, "-m", "benchmarks.fake_servers",
+            "--openweather-port", str(openweather_port),
+            "--github-port", str(github_port),
+            "--latency-ms", str(args.latency_ms),
+            "--jitter-ms", str(args.jitter_ms),
+            "--error-rate", str(args.error_rate),
+            "--github-rate-limit", str(args.github_rate_limit),
+        ], cwd=ROOT)
+        server = subprocess.Popen([
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(app_port),
+            "--workers", str(args.workers), "--log-level", "warning",
+        ], cwd=ROOT, env=app_environment(args, workdir, openweather_port, github_port))
+        # fmt: on
+        base_url = f"http://127.0.0.1:{app_port}"
+        try:
+            asyncio.run(wait_until_ready(f"http://127.0.0.1:{github_port}", fakes))
+            asyncio.run(wait_until_ready(base_url, server))
+            scenarios = asyncio.run(benchmark(args, base_url))
+        finally:
+            for process in (server, fakes):
+                process.terminate()
+                process.wait(timeout=10)
+
+    results = {
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            key: value
+            for key, value in vars(args).items()
+            if key not in ("output", "compare", "database_url")
+        },
+        "scenarios": scenarios,
+    }
+    print()
+    print_table(results)
+
+    output = args.output or RESULTS_DIR / f"load-{results['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n")
+    print(f"\nResultado gravado em {output}")
+
+    if args.compare:
+        compare(results, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
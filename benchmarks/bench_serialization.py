@@ -0,0 +1,114 @@
+"""Compara a serialização antiga das listagens com o caminho atual.
+
+Uso: ``python -m benchmarks.bench_serialization [linhas]``
+
+Antigo: cada campo copiado à mão, datetimes formatados e reinterpretados com
+``strptime`` e JSON gerado pelo ``JSONResponse`` padrão. Atual: ``TypeAdapter``
+com ``from_attributes`` e ``ORJSONResponse``.
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+# Importado só pelo efeito colateral: registra todos os modelos do ORM, sem os
+# quais os relacionamentos de CurrentWeather não são resolvidos
+import app.api.v1.router  # noqa: F401
+from app.api.v1.current_weather.current_weather_schemas import (
+    GetAllWeatherCurrentResponse,
+    GetWeatherCurrentResponse,
+)
+from app.database.models.current_weather import CurrentWeather
+from app.utils.serialization import to_responses
+
+
+def build_rows(count: int):
+    observation = datetime(2024, 10, 7, 12, 0)
+    return [
+        CurrentWeather(
+            id=index,
+            city="Liberdade",
+            latitude=-23.55,
+            longitude=-46.63,
+            current_temperature=22.5,
+            feels_like=22.8,
+            temp_min=21.0,
+            temp_max=24.0,
+            pressure=1015,
+            humidity=70,
+            visibility=10000,
+            wind_speed=3.1,
+            wind_deg=120,
+            wind_gust=None,
+            cloudiness=75,
+            weather_description="nublado",
+            observation_datetime=observation + timedelta(minutes=index),
+            sunrise=observation,
+            sunset=observation,
+            user_id=1,
+        )
+        for index in range(count)
+    ]
+
+
+def legacy(rows):
+    weathers = [
+        GetWeatherCurrentResponse(
+            id=int(weather.id),
+            city=str(weather.city),
+            latitude=float(weather.latitude),
+            longitude=float(weather.longitude),
+            current_temperature=float(weather.current_temperature),
+            feels_like=float(weather.feels_like),
+            temp_min=float(weather.temp_min),
+            temp_max=float(weather.temp_max),
+            pressure=int(weather.pressure),
+            humidity=int(weather.humidity),
+            visibility=int(weather.visibility),
+            wind_speed=float(weather.wind_speed),
+            wind_deg=int(weather.wind_deg),
+            wind_gust=float(weather.wind_gust) if weather.wind_gust else None,
+            cloudiness=int(weather.cloudiness),
+            weather_description=str(weather.weather_description),
+            observation_datetime=datetime.strptime(
+                str(weather.observation_datetime), "%Y-%m-%d %H:%M:%S"
+            ),
+            sunrise=datetime.strptime(str(weather.sunrise), "%Y-%m-%d %H:%M:%S"),
+            sunset=datetime.strptime(str(weather.sunset), "%Y-%m-%d %H:%M:%S"),
+            user_id=int(weather.user_id),
+        )
+        for weather in rows
+    ]
+    response = GetAllWeatherCurrentResponse(weathers=weathers)
+    return JSONResponse(jsonable_encoder(response)).body
+
+
+def current(rows):
+    response = GetAllWeatherCurrentResponse(
+        weathers=to_responses(GetWeatherCurrentResponse, rows)
+    )
+    return ORJSONResponse(response.model_dump(mode="json")).body
+
+
+def bench(label, fn, rows, iterations=20):
+    fn(rows)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn(rows)
+    elapsed = (time.perf_counter() - started) / iterations
+    print(f"{label:<8} {elapsed * 1e3:8.2f} ms para {len(rows)} linhas")
+    return elapsed
+
+
+def main(count: int = 1000):
+    rows = build_rows(count)
+    before = bench("antigo", legacy, rows)
+    after = bench("atual", current, rows)
+    print(f"{before / after:.1f}x mais rápido")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,253 @@
+"""Servidores locais que imitam o OpenWeather e a API de Gists do GitHub.
+
+Uso: ``python -m benchmarks.fake_servers --openweather-port 9101 --github-port 9102``
+
+As respostas têm o formato das APIs reais. ``--latency-ms``/``--jitter-ms``
+acrescentam um atraso a cada resposta e ``--error-rate`` devolve 503 em uma
+fração das requisições, para medir o serviço com dependências lentas ou
+instáveis sem acessar a rede. ``--github-rate-limit`` limita as escritas no
+GitHub falso por minuto, com os headers ``X-RateLimit-*`` da API real.
+"""
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+# Uma observação fixa; só a cidade e as coordenadas mudam com a requisição
+OBSERVED_AT = 1728316719
+FORECAST_START = 1728324000
+
+
+def current_weather_payload(city: str, lat: float, lon: float) -> dict:
+    return {
+        "coord": {"lon": lon, "lat": lat},
+        "weather": [{"main": "Clouds", "description": "nublado"}],
+        "main": {
+            "temp": 22.5,
+            "feels_like": 22.8,
+            "temp_min": 21.0,
+            "temp_max": 24.0,
+            "pressure": 1015,
+            "humidity": 70,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 3.1, "deg": 120},
+        "clouds": {"all": 75},
+        "dt": OBSERVED_AT,
+        "sys": {"country": "BR", "sunrise": 1728290000, "sunset": 1728335000},
+        "timezone": -10800,
+        "id": 1,
+        "name": city,
+        "cod": 200,
+    }
+
+
+def forecast_payload(city: str, lat: float, lon: float) -> dict:
+    entries = []
+    for index in range(40):
+        timestamp = FORECAST_START + index * 10800
+        entries.append(
+            {
+                "dt": timestamp,
+                "main": {
+                    "temp": 20 + index % 8,
+                    "feels_like": 20,
+                    "temp_min": 18,
+                    "temp_max": 25,
+                    "pressure": 1000,
+                    "sea_level": 1000,
+                    "grnd_level": 990,
+                    "humidity": 60,
+                    "temp_kf": 0,
+                },
+                "weather": [
+                    {"id": 800, "main": "Clear", "description": "limpo", "icon": "01d"}
+                ],
+                "clouds": {"all": 0},
+                "wind": {"speed": 2.0, "deg": 90, "gust": 3.0},
+                "visibility": 10000,
+                "pop": 0,
+                "sys": {"pod": "d"},
+                "dt_txt": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(timestamp)),
+            }
+        )
+    return {
+        "cod": "200",
+        "message": 0,
+        "cnt": len(entries),
+        "list": entries,
+        "city": {
+            "id": 1,
+            "name": city,
+            "coord": {"lat": lat, "lon": lon},
+            "country": "BR",
+            "population": 1,
+            "timezone": -10800,
+            "sunrise": 1728290000,
+            "sunset": 1728335000,
+        },
+    }
+
+
+class FaultInjection:
+    """Atraso e erros aplicados a todas as rotas de um servidor falso."""
+
+    def __init__(self, latency_ms: float, jitter_ms: float, error_rate: float):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+
+    def wrap(self, endpoint):
+        async def wrapped(request):
+            delay = self.latency + random.uniform(-self.jitter, self.jitter)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if random.random() < self.error_rate:
+                return JSONResponse({"message": "injected failure"}, status_code=503)
+            return await endpoint(request)
+
+        return wrapped
+
+
+class WriteRateLimit:
+    """Janela fixa de um minuto para as escritas, como o limite do GitHub."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        # Em segundos inteiros, como o X-RateLimit-Reset do GitHub
+        self.window_start = int(time.time())
+        self.used = 0
+
+    def wrap(self, endpoint):
+        if not self.limit:
+            return endpoint
+
+        async def wrapped(request):
+            now = time.time()
+            if now - self.window_start >= 60:
+                self.window_start, self.used = int(now), 0
+            reset = str(int(self.window_start + 60))
+            if self.used >= self.limit:
+                return JSONResponse(
+                    {"message": "API rate limit exceeded"},
+                    status_code=403,
+                    headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset},
+                )
+            self.used += 1
+            response = await endpoint(request)
+            response.headers["X-RateLimit-Remaining"] = str(self.limit - self.used)
+            response.headers["X-RateLimit-Reset"] = reset
+            return response
+
+        return wrapped
+
+
+def _location(request) -> tuple:
+    params = request.query_params
+    city = params.get("q", "Liberdade")
+    return city, float(params.get("lat", -23.55)), float(params.get("lon", -46.63))
+
+
+def build_openweather_app(faults: FaultInjection) -> Starlette:
+    async def weather(request):
+        return JSONResponse(current_weather_payload(*_location(request)))
+
+    async def forecast(request):
+        return JSONResponse(forecast_payload(*_location(request)))
+
+    return Starlette(
+        routes=[
+            Route("/data/2.5/weather", faults.wrap(weather)),
+            Route("/data/2.5/forecast", faults.wrap(forecast)),
+        ]
+    )
+
+
+def build_github_app(faults: FaultInjection, rate_limit: int = 0) -> Starlette:
+    comment_ids = itertools.count(1)
+    writes = WriteRateLimit(rate_limit)
+
+    async def get_gist(request):
+        return JSONResponse({"id": request.path_params["gist_id"], "files": {}})
+
+    async def create_comment(request):
+        body = await request.json()
+        return JSONResponse(
+            {"id": next(comment_ids), "body": body["body"]}, status_code=201
+        )
+
+    async def edit_comment(request):
+        body = await request.json()
+        return JSONResponse(
+            {"id": int(request.path_params["comment_id"]), "body": body["body"]}
+        )
+
+    async def delete_comment(request):
+        return Response(status_code=204)
+
+    return Starlette(
+        routes=[
+            Route("/gists/{gist_id}", faults.wrap(get_gist)),
+            Route(
+                "/gists/{gist_id}/comments",
+                faults.wrap(writes.wrap(create_comment)),
+                methods=["POST"],
+            ),
+            Route(
+                "/gists/{gist_id}/comments/{comment_id}",
+                faults.wrap(writes.wrap(edit_comment)),
+                methods=["PATCH"],
+            ),
+            Route(
+                "/gists/{gist_id}/comments/{comment_id}",
+                faults.wrap(writes.wrap(delete_comment)),
+                methods=["DELETE"],
+            ),
+        ]
+    )
+
+
+async def serve(args: argparse.Namespace) -> None:
+    faults = FaultInjection(args.latency_ms, args.jitter_ms, args.error_rate)
+    servers = [
+        uvicorn.Server(
+            uvicorn.Config(
+                build_openweather_app(faults),
+                host=args.host,
+                port=args.openweather_port,
+                log_level="warning",
+            )
+        ),
+        uvicorn.Server(
+            uvicorn.Config(
+                build_github_app(faults, args.github_rate_limit),
+                host=args.host,
+                port=args.github_port,
+                log_level="warning",
+            )
+        ),
+    ]
+    await asyncio.gather(*(server.serve() for server in servers))
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--openweather-port", type=int, default=9101)
+    parser.add_argument("--github-port", type=int, default=9102)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--github-rate-limit", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(serve(parse_args()))
@@ -3,44 +3,53 @@ import os
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
+from app.core import revocation
 from app.database.base import Base
+from app.database.session import get_async_database_url
 from app.main import app
-from app.middleware.dependencies import get_db
+from app.middleware.dependencies import get_db, get_session_factory
 
 DATABASE_URL = os.getenv("TEST_DATABASE_URL")
 if DATABASE_URL is None:
     raise ValueError("TEST_DATABASE_URL não está configurado")
 
+# Engine síncrona apenas para criar o schema e limpar as tabelas entre os testes
 engine = create_engine(DATABASE_URL)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# O TestClient executa cada requisição em seu próprio event loop, então as
+# conexões assíncronas não podem ser reaproveitadas entre requisições.
+async_engine = create_async_engine(
+    get_async_database_url(DATABASE_URL), poolclass=NullPool
+)
+TestingSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 Base.metadata.create_all(bind=engine)
 
 
 @pytest.fixture(scope="function")
 def db_session():
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
-
-    yield session
+    yield TestingSessionLocal
 
-    session.close()
-    transaction.rollback()
-    connection.close()
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    # As revogações em memória não podem sobreviver à limpeza das tabelas
+    revocation._revocation_checker = None
 
 
 @pytest.fixture(scope="function")
 def use_test_client(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            db_session.close()
+    async def override_get_db():
+        async with db_session() as session:
+            yield session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: db_session
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
@@ -60,6 +60,32 @@ async def test_post_logout(use_test_client):
     assert response_json["message"] == "Successfully logged out"
 
 
+@pytest.mark.asyncio
+async def test_logout_revokes_token(use_test_client):
+    signup_payload = {
+        "username": "devMaster",
+        "password": "jujuba",
+        "email": "master@dev.com",
+        "name": "dev",
+    }
+    signup_response = use_test_client.post("/api/v1/auth/signup", json=signup_payload)
+    assert signup_response.status_code == 201
+
+    login_payload = {"username": "master@dev.com", "password": "jujuba"}
+    login_response = use_test_client.post("/api/v1/auth/login", data=login_payload)
+    access_token = login_response.json()["access_token"]
+
+    headers = {"Authorization": f"Bearer {access_token}"}
+    assert use_test_client.get("/api/v1/users/me", headers=headers).status_code == 200
+
+    logout_response = use_test_client.post("/api/v1/auth/logout", headers=headers)
+    assert logout_response.status_code == 200
+
+    get_me_response = use_test_client.get("/api/v1/users/me", headers=headers)
+    assert get_me_response.status_code == 401
+    assert get_me_response.json()["detail"] == "Token has been revoked"
+
+
 @pytest.mark.asyncio
 @patch("app.core.mailer.send_pin_email")
 async def test_post_forgot_password(mock_send_pin_email, use_test_client):
@@ -1,5 +1,12 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
 import pytest
 
+from app.database.models.current_weather import CurrentWeather
+
 
 @pytest.mark.asyncio
 async def test_post_weather_current_by_coordinates(use_test_client):
@@ -199,3 +206,77 @@ async def test_delete_weather_current(use_test_client):
     assert delete_weather_current_response.status_code == 200
 
     response_json = delete_weather_current_response.json()
+
+
+@pytest.mark.asyncio
+async def test_export_weather_current_by_user(use_test_client, db_session):
+    signup_payload = {
+        "username": "devMaster",
+        "password": "jujuba",
+        "email": "master@dev.com",
+        "name": "dev",
+    }
+    signup_response = use_test_client.post("/api/v1/auth/signup", json=signup_payload)
+    assert signup_response.status_code == 201
+
+    login_payload = {"username": "master@dev.com", "password": "jujuba"}
+    login_response = use_test_client.post("/api/v1/auth/login", data=login_payload)
+    access_token = login_response.json()["access_token"]
+
+    headers = {"Authorization": f"Bearer {access_token}"}
+    get_me_response = use_test_client.get("/api/v1/users/me", headers=headers)
+    user_id = get_me_response.json()["id"]
+
+    observation = datetime(2024, 10, 7, 12, 0)
+    async with db_session() as db:
+        db.add_all(
+            CurrentWeather(
+                city="Liberdade",
+                latitude=-23.55,
+                longitude=-46.63,
+                current_temperature=20 + index,
+                feels_like=20,
+                temp_min=18,
+                temp_max=24,
+                pressure=1015,
+                humidity=70,
+                wind_speed=3.1,
+                wind_deg=120,
+                cloudiness=75,
+                weather_description="nublado",
+                observation_datetime=observation + timedelta(hours=index),
+                sunrise=observation,
+                sunset=observation,
+                user_id=user_id,
+            )
+            for index in range(3)
+        )
+        await db.commit()
+
+    export_response = use_test_client.get(
+        f"/api/v1/current-weather/user/{user_id}/export", headers=headers
+    )
+    assert export_response.status_code == 200
+    assert export_response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in export_response.text.splitlines()]
+    assert [row["current_temperature"] for row in rows] == [20, 21, 22]
+
+    export_response = use_test_client.get(
+        f"/api/v1/current-weather/user/{user_id}/export",
+        params={"format": "csv", "start": "2024-10-07T13:00:00"},
+        headers=headers,
+    )
+    assert export_response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(export_response.text)))
+    assert [row["current_temperature"] for row in rows] == ["21.0", "22.0"]
+
+    # Sem token ou para outro usuário o histórico não é exportado
+    export_response = use_test_client.get(
+        f"/api/v1/current-weather/user/{user_id}/export"
+    )
+    assert export_response.status_code == 401
+
+    export_response = use_test_client.get(
+        f"/api/v1/current-weather/user/{user_id + 1}/export", headers=headers
+    )
+    assert export_response.status_code == 403
@@ -60,6 +60,34 @@ async def test_put_users_me(use_test_client):
     assert response_json["name"] == "devUpdated"
 
 
+@pytest.mark.asyncio
+async def test_put_users_me_with_explicit_nulls_keeps_profile(use_test_client):
+    signup_payload = {
+        "username": "devMaster",
+        "password": "jujuba",
+        "email": "master@dev.com",
+        "name": "dev",
+    }
+    signup_response = use_test_client.post("/api/v1/auth/signup", json=signup_payload)
+    assert signup_response.status_code == 201
+
+    login_payload = {"username": "master@dev.com", "password": "jujuba"}
+    login_response = use_test_client.post("/api/v1/auth/login", data=login_payload)
+    assert login_response.status_code == 200
+
+    access_token = login_response.json()["access_token"]
+
+    headers = {"Authorization": f"Bearer {access_token}"}
+    put_me_response = use_test_client.put(
+        "/api/v1/users/me", json={"name": None, "email": None}, headers=headers
+    )
+    assert put_me_response.status_code == 200
+
+    response_json = put_me_response.json()
+    assert response_json["email"] == "master@dev.com"
+    assert response_json["name"] == "dev"
+
+
 @pytest.mark.asyncio
 async def test_get_users(use_test_client):
     signup_payload = {
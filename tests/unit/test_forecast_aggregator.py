@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta, timezone
+
+from app.clients.open_weather.open_weather_schemas import WeatherForecastResponseSchema
+from app.utils.forecast_aggregator import aggregate_forecast
+
+
+def build_forecast(temperatures, start, utc_offset_seconds=0):
+    entries = []
+    for index, temperature in enumerate(temperatures):
+        moment = start + timedelta(hours=3 * index)
+        entries.append(
+            {
+                "dt": int(moment.timestamp()),
+                "main": {
+                    "temp": temperature,
+                    "feels_like": temperature,
+                    "temp_min": temperature - 1,
+                    "temp_max": temperature + 1,
+                    "pressure": 1015,
+                    "sea_level": 1015,
+                    "grnd_level": 930,
+                    "humidity": 70,
+                    "temp_kf": 0,
+                },
+                "weather": [
+                    {
+                        "id": 800,
+                        "main": "Clear",
+                        "description": "céu limpo",
+                        "icon": "01d",
+                    }
+                ],
+                "clouds": {"all": 0},
+                "wind": {"speed": 1.0, "deg": 90, "gust": 1.5},
+                "visibility": 10000,
+                "pop": 0,
+                "sys": {"pod": "d"},
+                "dt_txt": moment.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        )
+    return WeatherForecastResponseSchema.model_validate(
+        {
+            "cod": "200",
+            "message": 0,
+            "cnt": len(entries),
+            "list": entries,
+            "city": {
+                "id": 3448439,
+                "name": "São Paulo",
+                "coord": {"lat": -23.5505, "lon": -46.6333},
+                "country": "BR",
+                "population": 10021295,
+                "timezone": utc_offset_seconds,
+                "sunrise": 1728290000,
+                "sunset": 1728335000,
+            },
+        }
+    )
+
+
+def test_aggregates_mean_min_max_per_day():
+    start = datetime(2024, 10, 7, 0, 0, tzinfo=timezone.utc)
+    forecast = build_forecast([10, 12, 14, 16, 18, 20, 22, 24, 30, 32], start)
+
+    daily = aggregate_forecast(forecast, percentiles=(50,))
+
+    assert [day.date.isoformat() for day in daily] == ["2024-10-07", "2024-10-08"]
+    assert daily[0].mean == 17
+    assert daily[0].min == 9
+    assert daily[0].max == 25
+    assert daily[0].count == 8
+    assert daily[0].percentiles == {50: 17}
+    assert daily[1].mean == 31
+
+
+def test_groups_by_city_local_date_and_limits_days():
+    # 00:00 UTC ainda é o dia anterior em São Paulo (UTC-3)
+    start = datetime(2024, 10, 7, 0, 0, tzinfo=timezone.utc)
+    forecast = build_forecast([20] * 40, start, utc_offset_seconds=-10800)
+
+    daily = aggregate_forecast(forecast, days=5)
+
+    assert len(daily) == 5
+    assert daily[0].date.isoformat() == "2024-10-06"
+    assert daily[0].count == 1
+    assert daily[1].count == 8
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select
+
+from app.api.v1.forecasts_weather.forecast_weather_repository import (
+    ForecastWeatherRepository,
+)
+from app.api.v1.forecasts_weather.forecast_weather_schemas import (
+    CreateForecastWeatherRequest,
+)
+from app.database.models.forecast_weather import ForecastWeather
+from app.database.models.user import User
+
+START = datetime(2024, 10, 7, 18, 0)
+
+
+@pytest_asyncio.fixture(params=[True, False], ids=["returning", "orm-flush"])
+async def session(request, db_engine, db_session):
+    # Sem suporte a RETURNING em lote o repositório cai no flush do ORM
+    db_engine.dialect.insert_executemany_returning = request.param
+    db_engine.dialect.use_insertmanyvalues = request.param
+    db_session.add(User(id=1, username="dev", email="dev@dev.com"))
+    await db_session.commit()
+    return db_session
+
+
+def build_forecasts(count: int) -> list[CreateForecastWeatherRequest]:
+    # Datas fora de ordem para que a ordem do payload não coincida com a do índice
+    return [
+        CreateForecastWeatherRequest(
+            city="Liberdade",
+            latitude=-23.55,
+            longitude=-46.63,
+            date=START + timedelta(hours=3 * ((index * 7) % count)),
+            average_temperature=20 + index,
+            min_temperature=18,
+            max_temperature=24,
+            weather_description="nublado",
+            humidity=70,
+            wind_speed=3.1,
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_create_many_inserts_every_row_in_payload_order(session):
+    forecasts = build_forecasts(40)
+    statements = []
+    engine = session.get_bind()
+    event.listen(
+        engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+
+    created = await ForecastWeatherRepository().create_many(session, 1, forecasts)
+
+    # Com RETURNING em lote o payload inteiro vai em um único INSERT
+    if engine.dialect.insert_executemany_returning:
+        assert len(statements) == 1
+    else:
+        assert len(statements) == 40
+    assert await session.scalar(select(func.count(ForecastWeather.id))) == 40
+    assert [row.date for row in created] == [row.date for row in forecasts]
+    assert [row.average_temperature for row in created] == [
+        row.average_temperature for row in forecasts
+    ]
+    stored = dict(
+        (await session.execute(select(ForecastWeather.id, ForecastWeather.date))).all()
+    )
+    assert [stored[row.id] for row in created] == [row.date for row in forecasts]
+    assert all(row.user_id == 1 for row in created)
+
+
+@pytest.mark.asyncio
+async def test_create_many_with_empty_payload(session):
+    assert await ForecastWeatherRepository().create_many(session, 1, []) == []
+    assert await session.scalar(select(func.count(ForecastWeather.id))) == 0
@@ -0,0 +1,192 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app.api.v1.gist_comments.gist_comment_outbox_repository import (
+    GistCommentOutboxRepository,
+)
+from app.api.v1.gist_comments.gist_comment_outbox_worker import GistCommentOutboxWorker
+from app.api.v1.gist_comments.gist_comment_repository import GistCommentRepository
+from app.api.v1.gist_comments.gist_comment_schemas import CreateGistCommentRequest
+from app.clients.github.rate_limiter import GitHubWriteThrottled
+from app.database.models.gist_comment import GistComment
+from app.database.models.gist_comment_outbox import OutboxStatus, utc_from_timestamp
+
+REPORT = CreateGistCommentRequest(
+    city="Liberdade",
+    latitude=-23.55,
+    longitude=-46.63,
+    current_temperature=22.5,
+    weather_description="nublado",
+    forecast_day_1_date="2024-10-08",
+    forecast_day_1_temperature=21.0,
+    forecast_day_2_date="2024-10-09",
+    forecast_day_2_temperature=22.0,
+    forecast_day_3_date="2024-10-10",
+    forecast_day_3_temperature=23.0,
+    forecast_day_4_date="2024-10-11",
+    forecast_day_4_temperature=24.0,
+    forecast_day_5_date="2024-10-12",
+    forecast_day_5_temperature=25.0,
+)
+
+
+class ThrottledGitHubClient:
+    def __init__(self, retry_at: float):
+        self.retry_at = retry_at
+
+    async def create_gist_comment(self, comment: str):
+        raise GitHubWriteThrottled(self.retry_at)
+
+
+class FakeGitHubClient:
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.published = []
+
+    async def create_gist_comment(self, comment: str):
+        await asyncio.sleep(0)
+        if self.failures:
+            self.failures -= 1
+            raise ValueError("Error creating comment: 503 Service Unavailable")
+        self.published.append(comment)
+        return {
+            "message": "Comment added successfully",
+            "comment_id": 1000 + len(self.published),
+        }
+
+
+async def enqueue(db_session_factory, job_id: str, body: str = "relatório"):
+    async with db_session_factory() as db:
+        return await GistCommentRepository().create_pending(db, 1, job_id, REPORT, body)
+
+
+async def load(db_session_factory, job_id: str):
+    async with db_session_factory() as db:
+        return await GistCommentRepository().get_job(db, job_id)
+
+
+def make_worker(github_client, **kwargs) -> GistCommentOutboxWorker:
+    return GistCommentOutboxWorker(
+        GistCommentOutboxRepository(), github_client, retry_backoff=0, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_pending_comment_is_published(db_session_factory):
+    job = await enqueue(db_session_factory, "job-1", "comentário")
+    assert job.status == OutboxStatus.PENDING
+    assert job.gist_comment.comment_id is None
+
+    github_client = FakeGitHubClient()
+    assert await make_worker(github_client).run_once(db_session_factory) == 1
+
+    job = await load(db_session_factory, "job-1")
+    assert job.status == OutboxStatus.DONE
+    assert job.attempts == 1
+    assert job.gist_comment.comment_id == 1001
+    assert github_client.published == ["comentário"]
+    assert await make_worker(github_client).run_once(db_session_factory) == 0
+
+
+@pytest.mark.asyncio
+async def test_claimed_rows_are_not_claimed_twice(db_session_factory):
+    for index in range(3):
+        await enqueue(db_session_factory, f"job-{index}")
+
+    repository = GistCommentOutboxRepository()
+    async with db_session_factory() as db:
+        first = await repository.claim(db, 2, timedelta(seconds=60))
+    async with db_session_factory() as db:
+        second = await repository.claim(db, 10, timedelta(seconds=60))
+
+    assert len(first) == 2
+    assert [job.id for job in second] == sorted(
+        {"job-0", "job-1", "job-2"} - {job.id for job in first}
+    )
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_claimed_again(db_session_factory):
+    await enqueue(db_session_factory, "job-1")
+
+    repository = GistCommentOutboxRepository()
+    async with db_session_factory() as db:
+        # Worker que reservou a linha e caiu antes de publicar
+        assert len(await repository.claim(db, 1, timedelta(seconds=-1))) == 1
+    async with db_session_factory() as db:
+        [job] = await repository.claim(db, 1, timedelta(seconds=60))
+
+    assert job.attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_publish_is_retried(db_session_factory):
+    await enqueue(db_session_factory, "job-1")
+    worker = make_worker(FakeGitHubClient(failures=1))
+
+    await worker.run_once(db_session_factory)
+    job = await load(db_session_factory, "job-1")
+    assert job.status == OutboxStatus.PENDING
+    assert "503" in job.last_error
+
+    await worker.run_once(db_session_factory)
+    job = await load(db_session_factory, "job-1")
+    assert job.status == OutboxStatus.DONE
+    assert job.attempts == 2
+    assert job.last_error is None
+
+
+@pytest.mark.asyncio
+async def test_throttled_publish_is_released_until_retry_time(db_session_factory):
+    await enqueue(db_session_factory, "job-1")
+    retry_at = time.time() + 30
+    worker = make_worker(ThrottledGitHubClient(retry_at), max_attempts=1)
+
+    assert await worker.run_once(db_session_factory) == 1
+
+    # Volta para a fila sem gastar tentativa e só pode ser pega no retry_at
+    job = await load(db_session_factory, "job-1")
+    assert job.status == OutboxStatus.PENDING
+    assert job.attempts == 0
+    assert abs((job.available_at - utc_from_timestamp(retry_at)).total_seconds()) < 1
+    assert await worker.run_once(db_session_factory) == 0
+
+
+@pytest.mark.asyncio
+async def test_job_fails_after_max_attempts(db_session_factory):
+    await enqueue(db_session_factory, "job-1")
+    worker = make_worker(FakeGitHubClient(failures=10), max_attempts=2)
+
+    for _ in range(3):
+        await worker.run_once(db_session_factory)
+
+    job = await load(db_session_factory, "job-1")
+    assert job.status == OutboxStatus.FAILED
+    assert job.attempts == 2
+    assert job.gist_comment.comment_id is None
+
+
+@pytest.mark.asyncio
+async def test_notify_wakes_the_worker(db_session_factory):
+    github_client = FakeGitHubClient()
+    worker = make_worker(github_client, poll_interval=60)
+    await worker.start(db_session_factory)
+    try:
+        await asyncio.sleep(0.05)
+        await enqueue(db_session_factory, "job-1")
+        worker.notify()
+        for _ in range(100):
+            if github_client.published:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await worker.stop()
+
+    assert github_client.published == ["relatório"]
+    async with db_session_factory() as db:
+        comment = await db.scalar(select(GistComment))
+    assert comment.comment_id == 1001
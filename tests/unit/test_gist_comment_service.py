@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.gist_comments.gist_comment_service import CommentService
+from app.clients.open_weather.open_weather_schemas import GetCurrentWeatherResponse
+from app.middleware.dependencies import AuthUser
+
+CURRENT_WEATHER = GetCurrentWeatherResponse.model_validate(
+    {
+        "coord": {"lon": -46.6333, "lat": -23.5505},
+        "weather": [{"main": "Clouds", "description": "nublado"}],
+        "main": {
+            "temp": 22.5,
+            "feels_like": 22.8,
+            "temp_min": 21.0,
+            "temp_max": 24.0,
+            "pressure": 1015,
+            "humidity": 70,
+        },
+        "visibility": 10000,
+        "wind": {"speed": 3.1, "deg": 120},
+        "clouds": {"all": 75},
+        "dt": 1728316719,
+        "sys": {"country": "BR", "sunrise": 1728290000, "sunset": 1728335000},
+        "timezone": -10800,
+        "id": 3459712,
+        "name": "Liberdade",
+        "cod": 200,
+    }
+)
+FORECAST_WEATHER = object()
+AUTHUSER = AuthUser(id=1, email="master@dev.com", token="token")
+
+
+class FakeCurrentWeatherRepository:
+    def __init__(self):
+        self.created = []
+
+    async def create(self, db, user_id, current_weather):
+        self.created.append(current_weather.name)
+        return current_weather
+
+
+def make_service(repository: FakeCurrentWeatherRepository) -> CommentService:
+    return CommentService(
+        gist_comment_repository=None,
+        current_weather_repository=repository,
+        forecast_weather_repository=None,
+        open_weather_client=None,
+        github_client=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_weather_requests_run_concurrently():
+    forecast_started = asyncio.Event()
+
+    async def current_weather():
+        # Só termina se a previsão já estiver rodando ao mesmo tempo
+        await forecast_started.wait()
+        return CURRENT_WEATHER
+
+    async def forecast_weather():
+        forecast_started.set()
+        await asyncio.sleep(0)
+        return FORECAST_WEATHER
+
+    repository = FakeCurrentWeatherRepository()
+    async with asyncio.timeout(1):
+        current, forecast = await make_service(repository)._fetch_and_persist_weather(
+            AUTHUSER, None, current_weather, forecast_weather
+        )
+
+    assert current.name == "Liberdade"
+    assert forecast is FORECAST_WEATHER
+    assert repository.created == ["Liberdade"]
+
+
+@pytest.mark.asyncio
+async def test_failed_request_cancels_the_other():
+    forecast_cancelled = asyncio.Event()
+
+    async def current_weather():
+        await asyncio.sleep(0)
+        return None
+
+    async def forecast_weather():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            forecast_cancelled.set()
+            raise
+
+    repository = FakeCurrentWeatherRepository()
+    with pytest.raises(HTTPException) as error:
+        async with asyncio.timeout(1):
+            await make_service(repository)._fetch_and_persist_weather(
+                AUTHUSER, None, current_weather, forecast_weather
+            )
+
+    assert error.value.status_code == 404
+    assert forecast_cancelled.is_set()
+    assert repository.created == []
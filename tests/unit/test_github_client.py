@@ -0,0 +1,74 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient, MockTransport, Response
+
+from app.clients import http_client as http_client_module
+from app.clients.github.github_client import GitHubClient
+
+
+class FakeGistServer:
+    """Stand-in local dos endpoints de comentários de gist do GitHub."""
+
+    def __init__(self):
+        self.comments: dict = {}
+        self.requests: list = []
+        self.next_id = 1
+
+    def __call__(self, request):
+        self.requests.append((request.method, request.url.path))
+        parts = request.url.path.strip("/").split("/")
+        if parts[-1] == "comments" and request.method == "POST":
+            comment_id = self.next_id
+            self.next_id += 1
+            self.comments[comment_id] = json.loads(request.content)["body"]
+            return Response(201, json={"id": comment_id})
+        comment_id = int(parts[-1])
+        if comment_id not in self.comments:
+            return Response(404, json={"message": "Not Found"})
+        if request.method == "PATCH":
+            self.comments[comment_id] = json.loads(request.content)["body"]
+            return Response(200, json={"id": comment_id})
+        if request.method == "DELETE":
+            del self.comments[comment_id]
+            return Response(204)
+        return Response(405, json={"message": "Method Not Allowed"})
+
+
+@pytest.fixture
+def gist_server():
+    server = FakeGistServer()
+    transport_client = AsyncClient(transport=MockTransport(server))
+    http_client_module._circuit_breakers.clear()
+    with patch.object(
+        http_client_module, "get_shared_client", return_value=transport_client
+    ):
+        yield server
+
+
+@pytest.mark.asyncio
+async def test_comment_lifecycle_hits_comment_endpoints_only(gist_server):
+    client = GitHubClient()
+
+    created = await client.create_gist_comment("primeiro")
+    comment_id = created["comment_id"]
+    await client.edit_gist_comment(comment_id, "editado")
+    assert gist_server.comments[comment_id] == "editado"
+    await client.delete_gist_comment(comment_id)
+
+    assert gist_server.comments == {}
+    assert [method for method, _ in gist_server.requests] == [
+        "POST",
+        "PATCH",
+        "DELETE",
+    ]
+    assert all("/comments" in path for _, path in gist_server.requests)
+
+
+@pytest.mark.asyncio
+async def test_missing_comment_raises_value_error(gist_server):
+    client = GitHubClient()
+
+    with pytest.raises(ValueError):
+        await client.delete_gist_comment(999)
@@ -0,0 +1,183 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient, MockTransport, Response
+
+from app.clients import http_client as http_client_module
+from app.clients.github.github_client import GitHubClient
+from app.clients.github.rate_limiter import GitHubRateLimiter, GitHubWriteThrottled
+
+
+def limited_gist_server(responses):
+    """Devolve as respostas da lista em ordem e depois sempre 201."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if responses:
+            return responses.pop(0)
+        return Response(
+            201,
+            json={"id": len(requests)},
+            headers={"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": "0"},
+        )
+
+    return handler, requests
+
+
+@pytest.fixture
+def serve():
+    http_client_module._circuit_breakers.clear()
+    patches = []
+
+    def start(handler):
+        transport_client = AsyncClient(transport=MockTransport(handler))
+        patcher = patch.object(
+            http_client_module, "get_shared_client", return_value=transport_client
+        )
+        patcher.start()
+        patches.append(patcher)
+
+    yield start
+    for patcher in patches:
+        patcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_bursts():
+    limiter = GitHubRateLimiter(rate=20, burst=2)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(limiter.acquire() for _ in range(6)))
+
+    # 2 tokens da rajada e mais 4 a 20/s
+    assert time.perf_counter() - started >= 0.18
+    assert limiter.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_waits_for_reset():
+    limiter = GitHubRateLimiter(rate=100, burst=10, max_wait=1)
+    limiter.observe(
+        Response(
+            201,
+            headers={
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(int(time.time()) + 2),
+            },
+        )
+    )
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(limiter.acquire(time.time() + 5), 0.05)
+    assert limiter._delay(time.time()) > 0.5
+
+
+@pytest.mark.asyncio
+async def test_wait_beyond_max_wait_fails_fast():
+    limiter = GitHubRateLimiter(rate=100, burst=10, max_wait=1)
+    limiter.observe(
+        Response(
+            201,
+            headers={
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(int(time.time()) + 60),
+            },
+        )
+    )
+
+    started = time.perf_counter()
+    with pytest.raises(GitHubWriteThrottled) as error:
+        await limiter.acquire()
+
+    assert time.perf_counter() - started < 0.1
+    assert error.value.status_code == 503
+    assert 55 <= int(error.value.headers["Retry-After"]) <= 61
+    assert limiter.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_queued_writes_give_up_at_max_wait():
+    limiter = GitHubRateLimiter(rate=1, burst=1, max_wait=0.3)
+    await limiter.acquire()
+
+    # A primeira da fila espera ~1s pelo token e segura o lock; a segunda
+    # desiste no prazo em vez de esperar atrás dela
+    first = asyncio.create_task(limiter.acquire(time.time() + 5))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    with pytest.raises(GitHubWriteThrottled):
+        await limiter.acquire()
+
+    assert time.perf_counter() - started < 0.5
+    await first
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_write_is_retried(serve):
+    handler, requests = limited_gist_server(
+        [Response(429, json={"message": "slow down"}, headers={"Retry-After": "0"})]
+    )
+    serve(handler)
+    limiter = GitHubRateLimiter(rate=100, burst=10)
+
+    created = await GitHubClient(rate_limiter=limiter).create_gist_comment("oi")
+
+    assert created["comment_id"] == 2
+    assert len(requests) == 2
+    assert limiter.remaining == 4999
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries(serve):
+    reset = str(int(time.time()))
+    handler, requests = limited_gist_server(
+        [
+            Response(
+                403,
+                json={"message": "API rate limit exceeded"},
+                headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset},
+            )
+        ]
+        * 3
+    )
+    serve(handler)
+    limiter = GitHubRateLimiter(rate=100, burst=10, max_retries=1)
+
+    with pytest.raises(ValueError, match="403"):
+        await GitHubClient(rate_limiter=limiter).create_gist_comment("oi")
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_forbidden_without_rate_limit_is_not_retried(serve):
+    handler, requests = limited_gist_server(
+        [Response(403, json={"message": "Resource not accessible"})]
+    )
+    serve(handler)
+    limiter = GitHubRateLimiter(rate=100, burst=10)
+
+    with pytest.raises(ValueError, match="403"):
+        await GitHubClient(rate_limiter=limiter).edit_gist_comment(1, "oi")
+    assert len(requests) == 1
+    assert limiter.blocked_until == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_writes():
+    limiter = GitHubRateLimiter(rate=1, burst=1, max_queue_size=1)
+    await limiter.acquire()
+    waiting = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as error:
+        await limiter.acquire()
+    assert error.value.status_code == 503
+    assert "Retry-After" in error.value.headers
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
@@ -0,0 +1,143 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient, ConnectError, MockTransport, Response
+from prometheus_client import REGISTRY
+
+from app.clients import http_client as http_client_module
+from app.clients.circuit_breaker import CircuitBreaker, CircuitState
+from app.clients.http_client import HttpClient, HTTPClientException
+
+
+@pytest.fixture(autouse=True)
+def reset_breakers():
+    http_client_module._circuit_breakers.clear()
+    yield
+    http_client_module._circuit_breakers.clear()
+
+
+def make_client() -> HttpClient:
+    client = HttpClient()
+    client.retry_backoff_base = 0
+    client.retry_backoff_max = 0
+    return client
+
+
+@pytest.mark.asyncio
+async def test_get_is_retried_on_retryable_status():
+    statuses = iter([503, 502, 200])
+
+    def handler(request):
+        return Response(next(statuses), json={})
+
+    labels = {"host": "weather.local"}
+    retries = REGISTRY.get_sample_value("http_client_retries_total", labels) or 0.0
+    transport_client = AsyncClient(transport=MockTransport(handler))
+    with patch.object(
+        http_client_module, "get_shared_client", return_value=transport_client
+    ):
+        response = await make_client().make_request(
+            "http://weather.local/weather", "GET"
+        )
+
+    assert response.status_code == 200
+    assert REGISTRY.get_sample_value("http_client_retries_total", labels) == retries + 2
+
+
+@pytest.mark.asyncio
+async def test_post_is_not_retried():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return Response(503, json={})
+
+    transport_client = AsyncClient(transport=MockTransport(handler))
+    with patch.object(
+        http_client_module, "get_shared_client", return_value=transport_client
+    ):
+        with pytest.raises(HTTPClientException) as exc:
+            await make_client().make_request("http://weather.local/weather", "POST")
+
+    assert exc.value.status_code == 503
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_fails_fast():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        raise ConnectError("connection refused")
+
+    http_client_module._circuit_breakers["weather.local"] = CircuitBreaker(
+        "weather.local", failure_threshold=2, recovery_time=60
+    )
+    transport_client = AsyncClient(transport=MockTransport(handler))
+    with patch.object(
+        http_client_module, "get_shared_client", return_value=transport_client
+    ):
+        client = make_client()
+        with pytest.raises(HTTPClientException):
+            await client.make_request("http://weather.local/weather", "GET")
+        with pytest.raises(HTTPClientException) as exc:
+            await client.make_request("http://weather.local/weather", "GET")
+
+    assert exc.value.code == "CIRCUIT_OPEN"
+    assert calls == 2
+
+
+def test_breaker_half_open_probe_closes_on_success():
+    breaker = CircuitBreaker("weather.local", failure_threshold=1, recovery_time=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    assert breaker.allow_request()
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_request_outside_lifespan_closes_its_client():
+    transport_client = AsyncClient(transport=MockTransport(lambda _: Response(200)))
+    with patch.object(
+        http_client_module, "_build_client", return_value=transport_client
+    ):
+        await make_client().make_request("http://weather.local/weather", "GET")
+
+    assert http_client_module.get_shared_client() is None
+    assert transport_client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_lifespan_client_is_reused_and_bound_to_its_loop():
+    transport_client = AsyncClient(transport=MockTransport(lambda _: Response(200)))
+    with patch.object(
+        http_client_module, "_build_client", return_value=transport_client
+    ):
+        shared_client = await http_client_module.open_shared_client()
+    try:
+        await make_client().make_request("http://weather.local/weather", "GET")
+        assert not transport_client.is_closed
+        assert await http_client_module.open_shared_client() is shared_client
+
+        # Outro loop não pode usar nem substituir o pool aberto neste
+        async def from_other_loop():
+            return http_client_module.get_shared_client()
+
+        assert await asyncio.to_thread(asyncio.run, from_other_loop()) is None
+        with pytest.raises(RuntimeError):
+            await asyncio.to_thread(
+                asyncio.run, http_client_module.open_shared_client()
+            )
+    finally:
+        await http_client_module.close_shared_client()
+
+    assert transport_client.is_closed
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.utils.loop_monitor import LoopLagMonitor
+
+
+def blocked_total() -> float:
+    return REGISTRY.get_sample_value("event_loop_blocked_total") or 0.0
+
+
+def blocking_handler():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_is_reported_with_route_and_stack(caplog):
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.1)
+    before = blocked_total()
+    await monitor.start()
+
+    async def request():
+        monitor.track(
+            {"type": "http", "method": "POST", "path": "/api/v1/gist-comments/x"}
+        )
+        try:
+            await asyncio.sleep(0.05)
+            blocking_handler()
+            await asyncio.sleep(0.05)
+        finally:
+            monitor.untrack()
+
+    with caplog.at_level(logging.WARNING, logger="app.utils.loop_monitor"):
+        await asyncio.create_task(request())
+    await monitor.stop()
+
+    [record] = caplog.records
+    message = record.getMessage()
+    assert "POST /api/v1/gist-comments/x" in message
+    assert "blocking_handler" in message
+    assert blocked_total() == before + 1
+
+
+@pytest.mark.asyncio
+async def test_lag_is_observed_without_reports_when_loop_is_healthy(caplog):
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.1)
+    samples = REGISTRY.get_sample_value("event_loop_lag_seconds_count") or 0.0
+    await monitor.start()
+
+    with caplog.at_level(logging.WARNING, logger="app.utils.loop_monitor"):
+        await asyncio.sleep(0.2)
+    await monitor.stop()
+
+    assert caplog.records == []
+    assert REGISTRY.get_sample_value("event_loop_lag_seconds_count") > samples
+
+
+@pytest.mark.asyncio
+async def test_stop_does_not_block_the_loop_on_a_busy_watchdog(monkeypatch):
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.1)
+    busy = threading.Event()
+
+    def slow_watch():
+        # Watchdog ocupado registrando um bloqueio quando o shutdown começa
+        busy.set()
+        time.sleep(1)
+
+    monkeypatch.setattr(monitor, "_watch", slow_watch)
+    await monitor.start()
+    await asyncio.to_thread(busy.wait)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker = asyncio.create_task(tick())
+    started = time.monotonic()
+    await monitor.stop()
+    elapsed = time.monotonic() - started
+    ticker.cancel()
+
+    assert elapsed < 0.5
+    assert ticks > 0
@@ -0,0 +1,165 @@
+import smtplib
+import socket
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.mailer import MailQueue, build_pin_email
+
+
+class FakeConnectionQueue(MailQueue):
+    """Substitui a conexão SMTP por dublês e registra quantas foram abertas."""
+
+    def __init__(self, connections, **kwargs):
+        super().__init__(host="localhost", port=0, retry_backoff=0, **kwargs)
+        self._connections = iter(connections)
+        self.connects = 0
+
+    def _connect(self):
+        self.connects += 1
+        return next(self._connections)
+
+
+def test_burst_reuses_a_single_connection():
+    connection = MagicMock()
+    mail_queue = FakeConnectionQueue([connection], batch_size=10)
+
+    for index in range(25):
+        mail_queue.enqueue(build_pin_email(f"user{index}@dev.com", "123456"))
+    mail_queue.join()
+    mail_queue.stop()
+
+    assert mail_queue.sent == 25
+    assert mail_queue.connects == 1
+    assert connection.send_message.call_count == 25
+    connection.quit.assert_called_once()
+
+
+def test_reconnects_when_the_server_drops_the_connection():
+    dropped = MagicMock()
+    dropped.send_message.side_effect = smtplib.SMTPServerDisconnected()
+    healthy = MagicMock()
+    mail_queue = FakeConnectionQueue([dropped, healthy])
+
+    mail_queue.enqueue(build_pin_email("master@dev.com", "123456"))
+    mail_queue.join()
+    mail_queue.stop()
+
+    assert mail_queue.sent == 1
+    assert mail_queue.connects == 2
+    healthy.send_message.assert_called_once()
+
+
+def test_refused_recipient_is_not_retried():
+    connection = MagicMock()
+    connection.send_message.side_effect = smtplib.SMTPRecipientsRefused({})
+    mail_queue = FakeConnectionQueue([connection])
+
+    mail_queue.enqueue(build_pin_email("invalido", "123456"))
+    mail_queue.join()
+    mail_queue.stop()
+
+    assert mail_queue.failed == 1
+    assert connection.send_message.call_count == 1
+
+
+def test_permanent_rejection_is_dropped_and_sender_keeps_running():
+    connection = MagicMock()
+    connection.send_message.side_effect = [
+        smtplib.SMTPSenderRefused(550, b"sender rejected", "caiena@dev.com"),
+        None,
+    ]
+    mail_queue = FakeConnectionQueue([connection])
+
+    mail_queue.enqueue(build_pin_email("master@dev.com", "123456"))
+    mail_queue.join()
+    mail_queue.enqueue(build_pin_email("other@dev.com", "123456"))
+    mail_queue.join()
+    mail_queue.stop()
+
+    assert (mail_queue.failed, mail_queue.sent) == (1, 1)
+    assert mail_queue.connects == 1
+    assert connection.send_message.call_count == 2
+
+
+def test_temporary_rejection_is_retried():
+    busy = MagicMock()
+    busy.send_message.side_effect = smtplib.SMTPDataError(451, b"try again later")
+    healthy = MagicMock()
+    mail_queue = FakeConnectionQueue([busy, healthy])
+
+    mail_queue.enqueue(build_pin_email("master@dev.com", "123456"))
+    mail_queue.join()
+    mail_queue.stop()
+
+    assert mail_queue.sent == 1
+    healthy.send_message.assert_called_once()
+
+
+def test_plain_connection_upgrades_to_tls_before_login():
+    mail_queue = MailQueue(
+        host="smtp.dev.com", port=587, username="u", password="p", use_ssl=False
+    )
+    with patch.object(smtplib, "SMTP") as smtp:
+        connection = mail_queue._connect()
+
+    calls = [name for name, _, _ in connection.mock_calls]
+    assert calls.index("starttls") < calls.index("login")
+    assert calls[: calls.index("starttls")] == ["ehlo"]
+    smtp.assert_called_once_with("smtp.dev.com", 587)
+
+
+def test_server_without_starttls_is_not_retried():
+    mail_queue = MailQueue(
+        host="smtp.dev.com",
+        port=587,
+        username="u",
+        password="p",
+        use_ssl=False,
+        retry_backoff=0,
+    )
+    with patch.object(smtplib, "SMTP") as smtp:
+        smtp.return_value.starttls.side_effect = smtplib.SMTPNotSupportedError(
+            "STARTTLS extension not supported by server."
+        )
+        mail_queue.enqueue(build_pin_email("master@dev.com", "123456"))
+        mail_queue.join()
+        mail_queue.stop()
+
+    assert (mail_queue.failed, mail_queue.sent) == (1, 0)
+    smtp.assert_called_once_with("smtp.dev.com", 587)
+    smtp.return_value.login.assert_not_called()
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.envelopes = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.envelopes.append(envelope)
+        return "250 OK"
+
+
+def test_delivers_to_a_local_smtp_server():
+    controller_module = pytest.importorskip("aiosmtpd.controller")
+    handler = RecordingHandler()
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    controller = controller_module.Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    try:
+        mail_queue = MailQueue(host="127.0.0.1", port=port, use_ssl=False)
+        for index in range(3):
+            mail_queue.enqueue(build_pin_email(f"user{index}@dev.com", "654321"))
+        mail_queue.join()
+        mail_queue.stop()
+    finally:
+        controller.stop()
+
+    assert mail_queue.sent == 3
+    assert [envelope.rcpt_tos for envelope in handler.envelopes] == [
+        ["user0@dev.com"],
+        ["user1@dev.com"],
+        ["user2@dev.com"],
+    ]
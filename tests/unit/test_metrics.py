@@ -0,0 +1,154 @@
+import os
+import subprocess
+import sys
+import textwrap
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from httpx import AsyncClient, MockTransport, Response
+from prometheus_client import REGISTRY
+
+from app.clients import http_client as http_client_module
+from app.clients.circuit_breaker import CircuitBreaker
+from app.clients.http_client import HttpClient, HTTPClientException
+from app.middleware.metrics import MetricsMiddleware
+from app.utils.metrics import metrics_endpoint
+from app.utils.ttl_cache import TTLCache
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.add_route("/metrics", metrics_endpoint)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    yield TestClient(app)
+
+
+def test_requests_are_labelled_by_route_template(client):
+    labels = {"method": "GET", "route": "/items/{item_id}", "status": "200"}
+    before = sample("http_requests_total", **labels)
+
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/nao-existe")
+
+    assert sample("http_requests_total", **labels) == before + 2
+    assert sample("http_requests_total", method="GET", route="unmatched", status="404")
+
+    body = client.get("/metrics").text
+    assert (
+        'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/items/{item_id}"}'
+        in body
+    )
+
+
+@pytest.mark.asyncio
+async def test_outbound_calls_are_labelled_by_service_and_status():
+    statuses = iter([200, 404])
+
+    def handler(request):
+        return Response(next(statuses), json={})
+
+    labels = {"service": "github", "method": "GET"}
+    ok_before = sample(
+        "outbound_request_duration_seconds_count", status="200", **labels
+    )
+    missing_before = sample(
+        "outbound_request_duration_seconds_count", status="404", **labels
+    )
+
+    transport_client = AsyncClient(transport=MockTransport(handler))
+    with patch.object(
+        http_client_module, "get_shared_client", return_value=transport_client
+    ):
+        client = HttpClient()
+        await client.make_request(
+            "http://github.local/gists", "GET", timing_phase="github"
+        )
+        with pytest.raises(HTTPClientException):
+            await client.make_request(
+                "http://github.local/gists", "GET", timing_phase="github"
+            )
+
+    assert (
+        sample("outbound_request_duration_seconds_count", status="200", **labels)
+        == ok_before + 1
+    )
+    assert (
+        sample("outbound_request_duration_seconds_count", status="404", **labels)
+        == missing_before + 1
+    )
+    assert sample("outbound_requests_in_flight", service="github") == 0
+
+
+def test_circuit_breaker_state_and_rejections_are_exported():
+    host = "breaker.local"
+    opened = sample("circuit_breaker_opened_total", host=host)
+    rejected = sample("circuit_breaker_rejected_total", host=host)
+    breaker = CircuitBreaker(host, failure_threshold=1, recovery_time=60)
+    assert sample("circuit_breaker_state", host=host) == 0
+
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+    assert sample("circuit_breaker_state", host=host) == 2
+    assert sample("circuit_breaker_opened_total", host=host) == opened + 1
+    assert sample("circuit_breaker_rejected_total", host=host) == rejected + 1
+
+    breaker.recovery_time = 0
+    assert breaker.allow_request()
+    assert sample("circuit_breaker_state", host=host) == 1
+    breaker.record_success()
+    assert sample("circuit_breaker_state", host=host) == 0
+
+
+def test_named_caches_report_hits_and_misses():
+    cache = TTLCache(max_entries=10, name="teste")
+    hits = sample("cache_requests_total", cache="teste", result="hit")
+    misses = sample("cache_requests_total", cache="teste", result="miss")
+
+    cache.get("a")
+    cache.set("a", 1, ttl=60)
+    cache.get("a")
+
+    assert sample("cache_requests_total", cache="teste", result="hit") == hits + 1
+    assert sample("cache_requests_total", cache="teste", result="miss") == misses + 1
+
+
+def test_multiprocess_mode_aggregates_all_workers(tmp_path):
+    worker = textwrap.dedent(
+        """
+        from app.utils.metrics import CACHE_REQUESTS
+        CACHE_REQUESTS.labels("teste", "hit").inc(3)
+        """
+    )
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", worker], env=env, check=True)
+
+    reader = textwrap.dedent(
+        """
+        from prometheus_client import generate_latest
+        from app.utils.metrics import get_metrics_registry
+        print(generate_latest(get_metrics_registry()).decode())
+        """
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", reader],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert 'cache_requests_total{cache="teste",result="hit"} 6.0' in output
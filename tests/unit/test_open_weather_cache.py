@@ -0,0 +1,90 @@
+import pytest
+from httpx import Response
+
+from app.clients.open_weather.open_weather_client import OpenWeatherClient
+from app.clients.open_weather.open_weather_schemas import CoordinatesRequest
+from app.utils.ttl_cache import TTLCache
+
+CURRENT_WEATHER_PAYLOAD = {
+    "coord": {"lon": -46.6333, "lat": -23.5505},
+    "weather": [{"main": "Clouds", "description": "nublado"}],
+    "main": {
+        "temp": 22.5,
+        "feels_like": 22.8,
+        "temp_min": 21.0,
+        "temp_max": 24.0,
+        "pressure": 1015,
+        "humidity": 70,
+    },
+    "visibility": 10000,
+    "wind": {"speed": 3.1, "deg": 120},
+    "clouds": {"all": 75},
+    "dt": 1728316719,
+    "sys": {"country": "BR", "sunrise": 1728290000, "sunset": 1728335000},
+    "timezone": -10800,
+    "id": 3459712,
+    "name": "Liberdade",
+    "cod": 200,
+}
+
+
+class FakeHttpClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def make_request(self, url: str, method: str, **kwargs):
+        self.calls += 1
+        return Response(200, json=CURRENT_WEATHER_PAYLOAD)
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache: TTLCache = TTLCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == 1
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_ttl_cache_respects_byte_budget_and_expiry():
+    cache: TTLCache = TTLCache(max_entries=10, max_bytes=100)
+    cache.set("a", 1, ttl=60, size=60)
+    cache.set("b", 2, ttl=60, size=60)
+    assert cache.get("a") is None
+    assert cache.size_bytes == 60
+
+    cache.set("expired", 3, ttl=0)
+    assert cache.get("expired") is None
+
+
+@pytest.mark.asyncio
+async def test_current_weather_by_city_is_cached_by_normalized_name():
+    http_client = FakeHttpClient()
+    client = OpenWeatherClient(http_client, cache=TTLCache(max_entries=10))  # type: ignore
+
+    first = await client.get_current_weather_by_city("Liberdade")
+    second = await client.get_current_weather_by_city("  liberdade ")
+
+    assert first.name == second.name == "Liberdade"
+    assert http_client.calls == 1
+    assert client.cache.hits == 1
+    assert client.cache.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_current_weather_by_coordinates_is_cached_by_rounded_coordinates():
+    http_client = FakeHttpClient()
+    client = OpenWeatherClient(http_client, cache=TTLCache(max_entries=10))  # type: ignore
+
+    await client.get_current_weather_by_coordinates(
+        CoordinatesRequest(latitude=-23.5505, longitude=-46.6333)
+    )
+    await client.get_current_weather_by_coordinates(
+        CoordinatesRequest(latitude=-23.5512, longitude=-46.6329)
+    )
+
+    assert http_client.calls == 1
@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+
+from app.api.v1.current_weather.current_weather_repository import (
+    CurrentWeatherRepository,
+)
+from app.api.v1.gist_comments.gist_comment_repository import GistCommentRepository
+from app.api.v1.gist_comments.gist_comment_schemas import CreateGistCommentRequest
+from app.database.models.current_weather import CurrentWeather
+from app.database.models.user import User
+from app.utils.pagination import PageParams, decode_cursor, encode_cursor
+
+START = datetime(2024, 10, 1, 12, 0)
+
+
+@pytest_asyncio.fixture
+async def session(db_session):
+    db_session.add(User(id=1, username="dev", email="dev@dev.com"))
+    for index in range(7):
+        db_session.add(
+            CurrentWeather(
+                city="Curitiba" if index % 2 else "Liberdade",
+                latitude=-23.55,
+                longitude=-46.63,
+                current_temperature=20,
+                feels_like=20,
+                temp_min=18,
+                temp_max=22,
+                pressure=1015,
+                humidity=70,
+                wind_speed=1,
+                wind_deg=90,
+                cloudiness=0,
+                weather_description="limpo",
+                # Dois registros com o mesmo horário para exercitar o desempate pelo id
+                observation_datetime=START + timedelta(hours=min(index, 5)),
+                sunrise=START,
+                sunset=START,
+                user_id=1,
+            )
+        )
+    await db_session.commit()
+    return db_session
+
+
+@pytest.mark.asyncio
+async def test_pages_follow_cursor_without_gaps_or_duplicates(session):
+    repository = CurrentWeatherRepository()
+    seen = []
+    page = PageParams(limit=3)
+    while True:
+        items, next_cursor = await repository.get_all_weathers_by_user_id(
+            session, 1, page
+        )
+        seen.extend(items)
+        if next_cursor is None:
+            break
+        page = PageParams(limit=3, after=decode_cursor(next_cursor))
+
+    keys = [(item.observation_datetime, item.id) for item in seen]
+    assert len(keys) == 7
+    assert keys == sorted(keys, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_filters_by_city_and_date_range(session):
+    items, next_cursor = await CurrentWeatherRepository().get_all_weathers_by_user_id(
+        session,
+        1,
+        PageParams(
+            city="Curitiba",
+            start=START + timedelta(hours=1),
+            end=START + timedelta(hours=5),
+        ),
+    )
+
+    assert next_cursor is None
+    assert [item.observation_datetime.hour for item in items] == [15, 13]
+
+
+@pytest.mark.asyncio
+async def test_gist_comment_date_is_set_per_row(session):
+    repository = GistCommentRepository()
+    report = CreateGistCommentRequest(
+        city="Liberdade",
+        latitude=-23.55,
+        longitude=-46.63,
+        current_temperature=22.5,
+        weather_description="nublado",
+        **{
+            f"forecast_day_{day}_{field}": value
+            for day in range(1, 6)
+            for field, value in (("date", "2024-10-08"), ("temperature", 21.0))
+        },
+    )
+    first = await repository.create(session, 1, 1, report)
+    await asyncio.sleep(0.01)
+    second = await repository.create(session, 1, 2, report)
+
+    assert first.comment_date < second.comment_date
+    items, _ = await repository.get_all_comments_by_user_id(
+        session, 1, PageParams(start=second.comment_date)
+    )
+    assert [item.id for item in items] == [second.id]
+
+
+def test_cursor_round_trip_and_invalid_cursor():
+    assert decode_cursor(encode_cursor(START, 42)) == (START, 42)
+
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("não-é-um-cursor")
+    assert exc.value.status_code == 400
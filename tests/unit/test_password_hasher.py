@@ -0,0 +1,46 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.security import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_run_off_the_event_loop():
+    hasher = PasswordHasher(rounds=10, max_workers=2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.005)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    hashed = await hasher.hash("jujuba")
+    valid, new_hash = await hasher.verify_and_update("jujuba", hashed)
+    elapsed = time.perf_counter() - started
+    task.cancel()
+    hasher.close()
+
+    assert valid and new_hash is None
+    # O loop continuou girando enquanto o bcrypt rodava no pool
+    assert ticks >= int(elapsed / 0.005) // 2
+
+
+@pytest.mark.asyncio
+async def test_password_is_rehashed_when_cost_changes():
+    old_hasher = PasswordHasher(rounds=4, max_workers=1)
+    new_hasher = PasswordHasher(rounds=5, max_workers=1)
+    hashed = await old_hasher.hash("jujuba")
+
+    valid, new_hash = await new_hasher.verify_and_update("jujuba", hashed)
+    assert valid
+    assert new_hash is not None and new_hash.startswith("$2b$05$")
+    assert await new_hasher.verify_and_update("jujuba", new_hash) == (True, None)
+
+    assert await new_hasher.verify_and_update("errada", hashed) == (False, None)
+    old_hasher.close()
+    new_hasher.close()
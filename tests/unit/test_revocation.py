@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from app.core.revocation import RevocationChecker, purge_expired_tokens, to_datetime
+from app.database.models.blacklist import TokenBlacklist
+from app.utils.bloom_filter import BloomFilter
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for index in range(1000):
+        bloom.add(f"token-{index}")
+
+    assert all(f"token-{index}" in bloom for index in range(1000))
+    false_positives = sum(f"other-{index}" in bloom for index in range(10000))
+    assert false_positives < 300
+
+
+@pytest.mark.asyncio
+async def test_only_bloom_positives_hit_the_database(db_session_factory):
+    checker = RevocationChecker(capacity=100, error_rate=0.01, sync_interval=60)
+    checker.revoke("revoked", time.time() + 60)
+
+    assert await checker.is_revoked("revoked", db_session_factory)
+    assert not await checker.is_revoked("valid", db_session_factory)
+    assert checker.db_lookups == 0
+
+
+@pytest.mark.asyncio
+async def test_revocations_from_other_workers_are_found(db_session_factory):
+    checker = RevocationChecker(capacity=100, error_rate=0.01, sync_interval=60)
+    async with db_session_factory() as db:
+        db.add(
+            TokenBlacklist(jti="outro-worker", expires_at=to_datetime(time.time() + 60))
+        )
+        await db.commit()
+
+    # Simula um positivo do filtro para um token revogado em outro processo
+    checker._bloom.add("outro-worker")
+    assert await checker.is_revoked("outro-worker", db_session_factory)
+    assert checker.db_lookups == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_revocations_are_purged(db_session_factory):
+    checker = RevocationChecker(capacity=100, error_rate=0.01, sync_interval=60)
+    checker.revoke("expira", time.time() + 0.05)
+    assert len(checker) == 1
+
+    time.sleep(0.1)
+    await checker.sync(db_session_factory)
+
+    assert len(checker) == 0
+    assert "expira" not in checker._bloom
+
+
+@pytest.mark.asyncio
+async def test_purge_deletes_expired_tokens_in_batches(db_session_factory):
+    now = time.time()
+    async with db_session_factory() as db:
+        db.add_all(
+            TokenBlacklist(jti=f"expirado-{index}", expires_at=to_datetime(now - 1))
+            for index in range(5)
+        )
+        db.add(TokenBlacklist(jti="valido", expires_at=to_datetime(now + 60)))
+        await db.commit()
+
+    assert await purge_expired_tokens(db_session_factory, batch_size=2) == 5
+
+    checker = RevocationChecker(capacity=100, error_rate=0.01, sync_interval=60)
+    await checker.sync(db_session_factory)
+    assert len(checker) == 1
+    assert await checker.is_revoked("valido", db_session_factory)
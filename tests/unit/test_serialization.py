@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from app.api.v1.forecasts_weather.forecast_weather_schemas import (
+    GetWeatherForecastResponse,
+)
+from app.database.models.forecast_weather import ForecastWeather
+from app.utils.serialization import to_response, to_responses
+
+
+def build_forecast(id: int) -> ForecastWeather:
+    return ForecastWeather(
+        id=id,
+        city="Liberdade",
+        latitude=-23.55,
+        longitude=-46.63,
+        date=datetime(2024, 10, 7, 18, 0, 0, 500),
+        average_temperature=20,
+        min_temperature=18,
+        max_temperature=25,
+        weather_description="limpo",
+        humidity=60.5,
+        wind_speed=0.0,
+        user_id=1,
+    )
+
+
+def test_validates_orm_rows_from_attributes():
+    responses = to_responses(GetWeatherForecastResponse, [build_forecast(1)])
+
+    assert responses == [
+        GetWeatherForecastResponse(
+            id=1,
+            city="Liberdade",
+            latitude=-23.55,
+            longitude=-46.63,
+            date=datetime(2024, 10, 7, 18, 0, 0, 500),
+            average_temperature=20.0,
+            min_temperature=18.0,
+            max_temperature=25.0,
+            weather_description="limpo",
+            humidity=60.5,
+            wind_speed=0.0,
+            user_id=1,
+        )
+    ]
+    assert to_response(GetWeatherForecastResponse, build_forecast(2)).id == 2
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.utils.serialization import TimedORJSONResponse
+from app.utils.timing import instrument_engine, timed
+
+
+def parse_server_timing(header: str) -> dict:
+    metrics = {}
+    for metric in header.split(", "):
+        name, duration = metric.split(";dur=")
+        metrics[name] = float(duration)
+    return metrics
+
+
+@pytest.fixture
+def client():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(engine.sync_engine)
+    app = FastAPI(default_response_class=TimedORJSONResponse)
+    app.add_middleware(ServerTimingMiddleware)
+
+    @app.get("/phases")
+    async def phases():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            await connection.execute(text("SELECT 2"))
+
+        async def call_api():
+            with timed("github"):
+                await asyncio.sleep(0.02)
+
+        # Tarefas filhas acumulam na mesma requisição
+        await asyncio.gather(call_api(), call_api())
+        return {"ok": True}
+
+    yield TestClient(app)
+
+
+def test_server_timing_header_breaks_down_phases(client):
+    response = client.get("/phases")
+
+    metrics = parse_server_timing(response.headers["Server-Timing"])
+    assert set(metrics) == {"db", "github", "render", "total"}
+    assert metrics["github"] >= 40
+    assert metrics["total"] >= 20
+
+
+def test_access_log_line_has_the_same_phases(client, caplog):
+    with caplog.at_level(logging.INFO, logger="app.access"):
+        client.get("/phases")
+
+    [record] = [r for r in caplog.records if r.name == "app.access"]
+    line = orjson.loads(record.getMessage())
+    assert line["path"] == "/phases"
+    assert line["status"] == 200
+    assert line["phases"]["db"]["count"] == 2
+    assert line["phases"]["github"]["count"] == 2
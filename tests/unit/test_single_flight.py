@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "Liberdade"
+
+    results = await asyncio.gather(
+        *[single_flight.do("liberdade", fetch) for _ in range(10)]
+    )
+
+    assert results == ["Liberdade"] * 10
+    assert calls == 1
+    assert single_flight.shared == 9
+    assert len(single_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_errors_are_propagated_to_every_waiter():
+    single_flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream error")
+
+    results = await asyncio.gather(
+        *[single_flight.do("liberdade", fetch) for _ in range(3)],
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert single_flight.executions == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_does_not_cancel_the_others():
+    single_flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def fetch():
+        started.set()
+        await asyncio.sleep(0.02)
+        return 42
+
+    first = asyncio.create_task(single_flight.do("key", fetch))
+    second = asyncio.create_task(single_flight.do("key", fetch))
+    await started.wait()
+    first.cancel()
+
+    assert await second == 42
+    with pytest.raises(asyncio.CancelledError):
+        await first
@@ -0,0 +1,61 @@
+from typing import Optional
+
+import pytest
+import pytest_asyncio
+from pydantic import BaseModel
+
+from app.api.v1.users.user_repository import UserRepository
+from app.api.v1.users.user_schemas import PutUserRequest
+from app.database.models.user import User
+from app.database.statements import changed_values, delete_returning, update_returning
+
+
+class PutUser(BaseModel):
+    id: Optional[int] = None
+    name: Optional[str] = None
+    email: Optional[str] = None
+    is_active: Optional[bool] = None
+
+
+@pytest_asyncio.fixture
+async def session(db_session):
+    db_session.add(User(id=1, name="dev", email="dev@dev.com", is_active=True))
+    await db_session.commit()
+    return db_session
+
+
+def test_changed_values_keeps_only_explicit_fields():
+    data = PutUser.model_validate({"id": 2, "is_active": False, "email": None})
+
+    # O id nunca é atualizado; email aceita nulo, então o None explícito é mantido
+    assert changed_values(User, data) == {"is_active": False, "email": None}
+
+
+@pytest.mark.asyncio
+async def test_explicit_null_keeps_required_user_fields(session):
+    data = PutUserRequest.model_validate({"name": None, "email": None})
+
+    user = await UserRepository().update_user(session, 1, data)
+
+    assert (user.name, user.email) == ("dev", "dev@dev.com")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("returning", [True, False])
+async def test_update_and_delete_returning(session, monkeypatch, returning):
+    dialect = session.get_bind().dialect
+    monkeypatch.setattr(dialect, "update_returning", returning)
+    monkeypatch.setattr(dialect, "delete_returning", returning)
+
+    user = await update_returning(
+        session, User, User.id == 1, {"is_active": False, "name": "novo"}
+    )
+    assert user.is_active is False
+    assert user.name == "novo"
+    assert user.email == "dev@dev.com"
+
+    assert await update_returning(session, User, User.id == 99, {"name": "x"}) is None
+
+    deleted = await delete_returning(session, User, User.id == 1)
+    assert deleted.id == 1
+    assert await delete_returning(session, User, User.id == 1) is None
@@ -0,0 +1,56 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.security import (
+    create_access_token,
+    decode_access_token,
+    get_token_cache,
+    invalidate_access_token,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_token_cache():
+    security._token_cache = None
+    yield
+    security._token_cache = None
+
+
+def test_repeated_decodes_skip_signature_verification():
+    token = create_access_token({"id": 1, "email": "master@dev.com"})
+
+    with patch.object(security.jwt, "decode", wraps=security.jwt.decode) as decode:
+        first = decode_access_token(token)
+        second = decode_access_token(token)
+
+    assert first == second
+    assert first["id"] == 1
+    assert decode.call_count == 1
+    assert get_token_cache().stats()["hits"] == 1
+    assert get_token_cache().stats()["misses"] == 1
+
+
+def test_invalid_and_expired_tokens_are_not_cached():
+    expired = create_access_token({"id": 1}, expires_delta=timedelta(seconds=-1))
+
+    for token in (expired, "nao-e-um-jwt"):
+        with pytest.raises(HTTPException) as error:
+            decode_access_token(token)
+        assert error.value.status_code == 401
+    assert len(get_token_cache()) == 0
+
+
+def test_invalidated_token_is_verified_again():
+    token = create_access_token({"id": 1, "email": "master@dev.com"})
+    decode_access_token(token)
+
+    invalidate_access_token(token)
+
+    assert len(get_token_cache()) == 0
+    with patch.object(security.jwt, "decode", wraps=security.jwt.decode) as decode:
+        decode_access_token(token)
+    assert decode.call_count == 1